@@ -0,0 +1,172 @@
+import os
+import math
+import asyncio
+from typing import Dict, List, Optional
+
+from audio_probe import audio_probe
+from boundary_planner import boundary_planner
+from stage_limits import stage
+
+
+class AudioNormalizer:
+    # Whisper 업로드 제한(25MB)보다 약간 작게 잡은 청크 최대 크기
+    max_chunk_bytes = 24 * 1024 * 1024
+    # 청크 길이 범위 (초). 너무 길면 청크 하나의 응답 시간이 길어져 병렬 처리 이점이 줄어듦
+    min_chunk_seconds = 30
+    max_chunk_seconds = 1800
+    # 경계 분석용 PCM을 한 번에 읽는 크기 (8kHz 모노 기준 약 4초)
+    pcm_read_size = 64 * 1024
+
+    def __init__(self, sample_rate: int = 16000, bitrate_kbps: int = 24):
+        """
+        음성 인식용 오디오 정규화 (모노, 16kHz, 저비트레이트 Opus)
+
+        Whisper는 16kHz 모노로 처리하므로 그 이상의 음질은 인식 결과에 도움이 되지 않는다.
+        정규화 후 실제 초당 바이트 수를 알려주므로 청크 길이를 24MB에 맞춰 최대한 길게 잡을 수 있다.
+
+        Args:
+            sample_rate: 출력 샘플레이트 (Hz)
+            bitrate_kbps: 출력 비트레이트 (kbps)
+        """
+        self.sample_rate = sample_rate
+        self.bitrate_kbps = bitrate_kbps
+        self.extension = ".ogg"
+
+    @property
+    def codec_args(self) -> List[str]:
+        """ffmpeg 출력 인코딩 옵션 (분할 단계에서도 같은 설정으로 인코딩할 때 사용)"""
+        return [
+            "-vn",
+            "-ac", "1",
+            "-ar", str(self.sample_rate),
+            "-c:a", "libopus",
+            "-b:a", f"{self.bitrate_kbps}k",
+            "-vbr", "constrained",
+            "-application", "voip",
+        ]
+
+    @property
+    def estimated_bytes_per_second(self) -> float:
+        """인코딩 설정으로 추정한 초당 바이트 수 (컨테이너 오버헤드 10% 포함)"""
+        return self.bitrate_kbps * 1000 / 8 * 1.1
+
+    async def normalize(
+        self,
+        input_path: str,
+        output_path: str,
+        audio_filter: Optional[str] = None,
+        chunk_seconds: Optional[float] = None
+    ) -> Optional[Dict]:
+        """
+        음성 인식용 형식으로 변환
+
+        chunk_seconds가 있으면 같은 디코딩에서 에너지 분석용 PCM도 함께 출력해, 변환하는 동안
+        무음 구간 기준 청크 경계를 정한다 (경계를 찾으려고 파일을 다시 디코딩하지 않음).
+
+        Args:
+            input_path: 입력 파일 경로
+            output_path: 출력 파일 경로
+            audio_filter: 변환과 함께 적용할 ffmpeg 오디오 필터 (무음 구간 제거 등)
+            chunk_seconds: 청크 최대 길이 (초). 변환 전이므로 보통 plan_chunk_duration(estimated_bytes_per_second)
+
+        Returns:
+            {"path", "duration", "bytes_per_second", "cut_points"} 또는 변환할 수 없으면 None (ffmpeg 없음 등).
+            cut_points는 변환된 파일 기준 자를 위치 목록 (초). chunk_seconds가 없거나 실제 비트레이트로는
+            청크가 제한을 넘을 수 있으면 None
+        """
+        if not audio_probe.ffmpeg_path:
+            return None
+
+        filter_args = ["-af", audio_filter] if audio_filter else []
+        tracker = boundary_planner.tracker(chunk_seconds) if chunk_seconds else None
+        cmd = [
+            audio_probe.ffmpeg_path,
+            "-hide_banner",
+            "-nostdin",
+            "-loglevel", "error",
+            "-i", input_path,
+            *filter_args,
+            *self.codec_args,
+            "-y",
+            output_path,
+        ]
+        if tracker:
+            # 같은 필터를 거친 저샘플레이트 PCM을 두 번째 출력으로 받아 경계 분석
+            cmd += [*filter_args, *boundary_planner.pcm_output_args, "pipe:1"]
+
+        process = None
+        try:
+            async with stage("transcode"):
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE if tracker else asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                if tracker:
+                    stderr_task = asyncio.create_task(process.stderr.read())
+                    try:
+                        while True:
+                            data = await process.stdout.read(self.pcm_read_size)
+                            if not data:
+                                break
+                            tracker.feed_pcm(data)
+                        await process.wait()
+                        stderr = await stderr_task
+                    finally:
+                        if not stderr_task.done():
+                            stderr_task.cancel()
+                else:
+                    _, stderr = await process.communicate()
+
+            if process.returncode != 0 or not os.path.exists(output_path):
+                print(f"오디오 정규화 실패: {stderr.decode(errors='ignore')[-500:]}")
+                self._remove(output_path)
+                return None
+        except Exception as e:
+            print(f"오디오 정규화 실패: {e}")
+            self._remove(output_path)
+            return None
+        finally:
+            # 취소된 경우 ffmpeg 프로세스 정리
+            if process and process.returncode is None:
+                process.kill()
+                await process.wait()
+
+        size = os.path.getsize(output_path)
+        duration = await audio_probe.get_duration(output_path)
+        bytes_per_second = size / duration if duration else self.estimated_bytes_per_second
+
+        cut_points = tracker.finish() if tracker else None
+        if cut_points is not None and self.plan_chunk_duration(bytes_per_second) < chunk_seconds:
+            # 실제 비트레이트가 예상보다 높아 이 경계로는 청크가 제한을 넘을 수 있음 (호출자가 고정 간격으로 분할)
+            print("실제 비트레이트가 예상보다 높아 분석한 청크 경계를 사용하지 않습니다.")
+            cut_points = None
+
+        print(
+            f"오디오 정규화 완료: {os.path.getsize(input_path) / 1024 / 1024:.2f}MB → {size / 1024 / 1024:.2f}MB "
+            f"({bytes_per_second / 1024:.1f}KB/s)"
+        )
+        return {
+            "path": output_path,
+            "duration": duration,
+            "bytes_per_second": bytes_per_second,
+            "cut_points": cut_points,
+        }
+
+    def plan_chunk_duration(self, bytes_per_second: float) -> int:
+        """초당 바이트 수로 청크 하나가 max_chunk_bytes를 넘지 않는 최대 길이(초) 계산 (10% 안전 마진)"""
+        if not bytes_per_second:
+            return self.min_chunk_seconds
+        seconds = math.floor(self.max_chunk_bytes * 0.9 / bytes_per_second)
+        return max(self.min_chunk_seconds, min(seconds, self.max_chunk_seconds))
+
+    def _remove(self, path: str):
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
+
+
+# 공용 정규화기
+audio_normalizer = AudioNormalizer()
@@ -0,0 +1,189 @@
+import os
+import re
+import json
+import asyncio
+import subprocess
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class AudioProbe:
+    def __init__(self, max_cache_entries: int = 256):
+        """
+        컨테이너 헤더만 읽어 오디오 정보를 가져오는 프로브 (ffprobe 기반)
+
+        Args:
+            max_cache_entries: 캐시에 보관할 최대 파일 수
+        """
+        self.max_cache_entries = max_cache_entries
+        self._cache: "OrderedDict[Tuple[str, int, int], Dict]" = OrderedDict()
+        self.ffprobe_path = self._find_executable("ffprobe")
+        self.ffmpeg_path = self._find_executable("ffmpeg")
+
+    def _find_executable(self, name: str) -> Optional[str]:
+        """ffprobe/ffmpeg 실행 파일 찾기"""
+        possible_paths = [
+            name,  # PATH에 있는 경우
+            f"C:\\ffmpeg\\bin\\{name}.exe",
+            f"C:\\Program Files\\ffmpeg\\bin\\{name}.exe",
+            f"C:\\Program Files (x86)\\ffmpeg\\bin\\{name}.exe",
+        ]
+
+        for path in possible_paths:
+            try:
+                subprocess.run([path, "-version"], capture_output=True, check=True)
+                return path
+            except:
+                continue
+
+        print(f"Warning: {name} not found. Audio probing may not work.")
+        return None
+
+    async def probe(self, file_path: str) -> Dict:
+        """
+        오디오 파일의 포맷/스트림 정보 반환 (파일 전체를 디코딩하지 않음)
+
+        Returns:
+            duration(초), bit_rate(bps), format_name, codec_name, channels, sample_rate를 담은 딕셔너리.
+            알 수 없는 값은 None
+        """
+        stat = os.stat(file_path)
+        cache_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+        if cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
+            return self._cache[cache_key]
+
+        info = None
+        if self.ffprobe_path:
+            info = await self._probe_with_ffprobe(file_path)
+        if info is None and self.ffmpeg_path:
+            info = await self._probe_with_ffmpeg(file_path)
+        if info is None:
+            info = self._empty_info()
+
+        # 비트레이트를 알 수 없으면 파일 크기와 길이로 추정
+        if not info["bit_rate"] and info["duration"]:
+            info["bit_rate"] = int(stat.st_size * 8 / info["duration"])
+
+        self._cache[cache_key] = info
+        if len(self._cache) > self.max_cache_entries:
+            self._cache.popitem(last=False)
+
+        return info
+
+    async def get_duration(self, file_path: str) -> Optional[float]:
+        """오디오 파일의 길이를 초 단위로 반환 (알 수 없으면 None)"""
+        info = await self.probe(file_path)
+        return info["duration"]
+
+    async def _probe_with_ffprobe(self, file_path: str) -> Optional[Dict]:
+        """ffprobe로 헤더 정보 읽기"""
+        try:
+            cmd = [
+                self.ffprobe_path,
+                "-v", "error",
+                "-show_format",
+                "-show_streams",
+                "-select_streams", "a:0",
+                "-of", "json",
+                file_path
+            ]
+
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+
+            stdout, stderr = await process.communicate()
+
+            if process.returncode != 0:
+                print(f"ffprobe error: {stderr.decode()}")
+                return None
+
+            data = json.loads(stdout.decode() or "{}")
+            fmt = data.get("format", {})
+            streams = data.get("streams", [])
+            stream = streams[0] if streams else {}
+
+            info = self._empty_info()
+            info["duration"] = self._to_float(fmt.get("duration")) or self._to_float(stream.get("duration"))
+            info["bit_rate"] = self._to_int(fmt.get("bit_rate")) or self._to_int(stream.get("bit_rate"))
+            info["format_name"] = fmt.get("format_name")
+            info["codec_name"] = stream.get("codec_name")
+            info["channels"] = self._to_int(stream.get("channels"))
+            info["sample_rate"] = self._to_int(stream.get("sample_rate"))
+            return info
+
+        except Exception as e:
+            print(f"Error probing file with ffprobe: {str(e)}")
+            return None
+
+    async def _probe_with_ffmpeg(self, file_path: str) -> Optional[Dict]:
+        """ffprobe가 없을 때 ffmpeg -i 의 헤더 출력으로 정보 읽기 (출력 파일 없이 실행하므로 디코딩하지 않음)"""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                self.ffmpeg_path, "-hide_banner", "-i", file_path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+
+            stdout, stderr = await process.communicate()
+            stderr_text = stderr.decode(errors="ignore")
+
+            info = self._empty_info()
+
+            duration_match = re.search(r'Duration: (\d+):(\d{2}):(\d{2}(?:\.\d+)?)', stderr_text)
+            if duration_match:
+                hours = int(duration_match.group(1))
+                minutes = int(duration_match.group(2))
+                seconds = float(duration_match.group(3))
+                info["duration"] = hours * 3600 + minutes * 60 + seconds
+
+            bitrate_match = re.search(r'bitrate: (\d+) kb/s', stderr_text)
+            if bitrate_match:
+                info["bit_rate"] = int(bitrate_match.group(1)) * 1000
+
+            stream_match = re.search(r'Stream #\S+.*?: Audio: (\w+).*?, (\d+) Hz, ([^,]+)', stderr_text)
+            if stream_match:
+                info["codec_name"] = stream_match.group(1)
+                info["sample_rate"] = int(stream_match.group(2))
+                layout = stream_match.group(3).strip()
+                info["channels"] = {"mono": 1, "stereo": 2}.get(layout)
+
+            input_match = re.search(r"Input #0, ([^ ]+), from", stderr_text)
+            if input_match:
+                info["format_name"] = input_match.group(1).rstrip(",")
+
+            return info if info["duration"] else None
+
+        except Exception as e:
+            print(f"Error probing file with ffmpeg: {str(e)}")
+            return None
+
+    def _empty_info(self) -> Dict:
+        return {
+            "duration": None,
+            "bit_rate": None,
+            "format_name": None,
+            "codec_name": None,
+            "channels": None,
+            "sample_rate": None,
+        }
+
+    def _to_float(self, value) -> Optional[float]:
+        try:
+            return float(value) if value not in (None, "N/A") else None
+        except (TypeError, ValueError):
+            return None
+
+    def _to_int(self, value) -> Optional[int]:
+        try:
+            return int(value) if value not in (None, "N/A") else None
+        except (TypeError, ValueError):
+            return None
+
+
+# services_chunked와 audio_splitter가 함께 사용하는 공용 프로브 (캐시 공유)
+audio_probe = AudioProbe()
@@ -1,20 +1,51 @@
 import os
+import math
 import asyncio
-from typing import List, Optional
+import itertools
+from typing import AsyncIterator, List, Optional, Tuple
 from pathlib import Path
-from pydub import AudioSegment
-from pydub.utils import make_chunks
+
+from audio_normalizer import audio_normalizer
+from audio_probe import audio_probe
+from boundary_planner import chunk_time_range
+from chunk_pipeline import ChunkSegmentCallback, call_maybe_async, transcribe_chunk_stream
+from silence_stripper import get_silence_stripper, to_original_range
+from stage_limits import stage
+from transcript_cache import get_transcript_cache, hash_file
 
 
 class AudioSplitter:
-    def __init__(self, max_file_size_mb: float = 24.0):
+    def __init__(
+        self,
+        max_file_size_mb: float = 24.0,
+        max_concurrent_chunks: Optional[int] = None,
+        chunk_queue_size: int = 2,
+        encode_workers: Optional[int] = None
+    ):
         """
         오디오 파일 분할기
         
         Args:
             max_file_size_mb: 최대 파일 크기 (MB). OpenAI Whisper 제한은 25MB이므로 안전하게 24MB로 설정
+            max_concurrent_chunks: 동시에 음성 인식할 최대 청크 수 (None이면 MAX_CONCURRENT_CHUNKS, 기본 4)
+            chunk_queue_size: 분할 후 음성 인식을 기다릴 수 있는 최대 청크 수
+            encode_workers: 동시에 실행할 청크 분할 ffmpeg 수 (None이면 SPLIT_ENCODE_WORKERS 또는 CPU 수)
         """
         self.max_file_size_bytes = int(max_file_size_mb * 1024 * 1024)
+        # 스트리밍 분할 시 한 번에 읽는 PCM 크기 (16kHz 모노 기준 약 2초)
+        self.stream_buffer_size = 64 * 1024
+        if max_concurrent_chunks is None:
+            max_concurrent_chunks = int(os.getenv("MAX_CONCURRENT_CHUNKS", "4"))
+        self.max_concurrent_chunks = max(1, max_concurrent_chunks)
+        self.chunk_queue_size = max(1, chunk_queue_size)
+        self.transcript_cache = get_transcript_cache()
+        self.silence_stripper = get_silence_stripper()
+        
+        if encode_workers is None:
+            encode_workers = int(os.getenv("SPLIT_ENCODE_WORKERS", "0")) or os.cpu_count() or 1
+        self.encode_workers = max(1, encode_workers)
+        # 동시에 실행 중인 청크 분할 ffmpeg 수 제한 (이 분할기를 쓰는 모든 작업이 공유)
+        self._encode_slots = asyncio.Semaphore(self.encode_workers)
     
     def get_file_size(self, file_path: str) -> int:
         """파일 크기를 바이트 단위로 반환"""
@@ -35,6 +66,30 @@ class AudioSplitter:
         Returns:
             분할된 파일들의 경로 리스트
         """
+        chunk_files = [chunk_path async for chunk_path in self.iter_audio_chunks(input_file_path, output_dir)]
+        print(f"오디오 분할 완료: {len(chunk_files)}개 청크 생성")
+        return chunk_files
+    
+    async def iter_audio_chunks(
+        self,
+        input_file_path: str,
+        output_dir: Optional[str] = None,
+        ranges: Optional[List[Tuple[float, Optional[float]]]] = None
+    ) -> AsyncIterator[str]:
+        """
+        오디오 파일을 청크로 분할하며 청크 파일이 저장될 때마다 경로를 반환
+        
+        Args:
+            input_file_path: 입력 오디오 파일 경로
+            output_dir: 출력 디렉토리 (None이면 입력 파일과 같은 디렉토리)
+            ranges: 주어지면 청크를 반환하기 전에 그 청크의 원본 기준 [시작, 끝] (초)을 순서대로 추가
+                (무음을 제거한 경우에도 구간 대응표로 원본 시간으로 변환)
+            
+        Yields:
+            저장이 끝난 청크 파일 경로
+        """
+        normalized_path = None
+        keep_normalized = False
         try:
             input_path = Path(input_file_path)
             
@@ -47,54 +102,312 @@ class AudioSplitter:
             print(f"오디오 파일 분할 시작: {input_file_path}")
             print(f"파일 크기: {self.get_file_size(input_file_path) / 1024 / 1024:.2f}MB")
             
-            # 오디오 파일 로드
-            audio = await asyncio.to_thread(AudioSegment.from_file, input_file_path)
+            base_name = input_path.stem
             
-            # 파일 크기 기반으로 청크 길이 계산
-            total_duration_ms = len(audio)
-            file_size_bytes = self.get_file_size(input_file_path)
+            # 음성 인식용으로 정규화 (모노/16kHz/저비트레이트, 설정 시 긴 무음 구간 제거)하면서
+            # 같은 디코딩으로 목표 길이 근처의 무음 구간에서 자르도록 경계 계획
+            normalized_path = str(output_dir / f"{base_name}_normalized{audio_normalizer.extension}")
+            planned_seconds = audio_normalizer.plan_chunk_duration(audio_normalizer.estimated_bytes_per_second)
+            normalized = None
+            if self.silence_stripper.enabled:
+                normalized = await self.silence_stripper.strip(input_file_path, normalized_path, planned_seconds)
+            if not normalized:
+                normalized = await audio_normalizer.normalize(input_file_path, normalized_path, chunk_seconds=planned_seconds)
             
-            # 비례 계산으로 청크 길이 결정
-            chunk_duration_ms = int((total_duration_ms * self.max_file_size_bytes) / file_size_bytes * 0.9)  # 90% 안전 마진
+            timeline = normalized.get("timeline") if normalized else None
+            duration = normalized["duration"] if normalized else None
             
-            # 최소 30초, 최대 20분으로 제한
-            chunk_duration_ms = max(30000, min(chunk_duration_ms, 1200000))
+            if normalized and self.get_file_size(normalized["path"]) <= self.max_file_size_bytes:
+                # 정규화만으로 제한 내에 들어오면 분할하지 않음
+                print("정규화 후 파일 크기가 제한 내에 있어 분할하지 않습니다.")
+                keep_normalized = True
+                if ranges is not None:
+                    ranges.append(to_original_range(timeline, 0.0, duration))
+                yield normalized["path"]
+                return
             
-            print(f"청크 길이: {chunk_duration_ms / 1000:.1f}초")
+            if normalized:
+                # 정규화된 파일의 실제 초당 바이트 수로 청크 길이 결정 (경계를 쓸 수 없을 때의 고정 간격)
+                source_path = normalized["path"]
+                bytes_per_second = normalized["bytes_per_second"]
+                cut_points = normalized["cut_points"]
+            else:
+                # 청크는 정규화와 같은 설정으로 인코딩되므로 설정값으로 추정, 고정 간격으로 분할
+                source_path = input_file_path
+                bytes_per_second = audio_normalizer.estimated_bytes_per_second
+                cut_points = None
+            chunk_duration_ms = audio_normalizer.plan_chunk_duration(bytes_per_second) * 1000
             
-            # 청크로 분할
-            chunks = make_chunks(audio, chunk_duration_ms)
+            print(f"청크 길이: {chunk_duration_ms / 1000:.1f}초")
             
-            chunk_files = []
-            base_name = input_path.stem
+            if normalized and cut_points is None and duration:
+                # 경계를 분석하지 못했으면 정규화된 파일 길이로 고정 간격 경계 생성
+                chunk_seconds = chunk_duration_ms / 1000
+                cut_points = [round(i * chunk_seconds, 3) for i in range(1, math.ceil(duration / chunk_seconds))]
+            total_chunks = f"{len(cut_points) + 1}" if cut_points is not None else "?"
             
-            for i, chunk in enumerate(chunks):
-                chunk_filename = f"{base_name}_chunk_{i:03d}.mp3"
-                chunk_path = output_dir / chunk_filename
-                
-                # 청크를 파일로 저장
-                await asyncio.to_thread(chunk.export, str(chunk_path), format="mp3")
-                
-                chunk_size_mb = self.get_file_size(str(chunk_path)) / 1024 / 1024
-                print(f"청크 {i+1}/{len(chunks)} 생성: {chunk_filename} ({chunk_size_mb:.2f}MB)")
-                
-                chunk_files.append(str(chunk_path))
-            
-            print(f"오디오 분할 완료: {len(chunk_files)}개 청크 생성")
-            return chunk_files
+            if normalized and cut_points is not None:
+                # 정규화된 파일은 이미 음성 인식용 형식이므로 재인코딩 없이 구간별로 잘라냄 (스트림 복사)
+                chunks = self._cut_chunks(source_path, output_dir, base_name, cut_points)
+            else:
+                # 정규화하지 못한 원본은 디코딩한 PCM을 스트리밍으로 청크별 인코더에 넘김 (고정 간격)
+                chunks = self._stream_chunks(source_path, output_dir, base_name, cut_points, chunk_duration_ms / 1000)
+            try:
+                chunk_index = 0
+                async for chunk_path in chunks:
+                    if ranges is not None:
+                        start, end = chunk_time_range(chunk_index, cut_points, chunk_duration_ms / 1000, duration)
+                        ranges.append(to_original_range(timeline, start, end))
+                    chunk_index += 1
+                    chunk_size_mb = self.get_file_size(chunk_path) / 1024 / 1024
+                    print(f"청크 {chunk_index}/{total_chunks} 생성: {Path(chunk_path).name} ({chunk_size_mb:.2f}MB)")
+                    
+                    yield chunk_path
+            finally:
+                # 중간에 멈춘 경우 ffmpeg 프로세스를 바로 정리
+                await chunks.aclose()
             
         except Exception as e:
             print(f"오디오 분할 실패: {e}")
             raise
+        
+        finally:
+            # 정규화 중간 파일 정리 (분할하지 않고 그대로 반환한 경우는 호출자가 정리)
+            if normalized_path and not keep_normalized and os.path.exists(normalized_path):
+                os.remove(normalized_path)
     
-    async def transcribe_chunks(self, chunk_files: List[str], openai_client, language: str = "ko") -> str:
+    async def _cut_chunks(
+        self,
+        source_path: str,
+        output_dir: Path,
+        base_name: str,
+        cut_points: List[float]
+    ) -> AsyncIterator[str]:
+        """
+        정규화된 파일에서 경계 목록의 각 구간을 스트림 복사로 잘라내고, 청크 순서대로 경로를 반환
+        
+        구간별로 ffmpeg를 encode_workers개까지 동시에 실행하며, 디스크 사용량을 제한하기 위해
+        반환되지 않은 청크는 (동시 실행 수 + 대기 큐 크기)개까지만 미리 만든다.
+        """
+        if not audio_probe.ffmpeg_path:
+            raise Exception("ffmpeg를 찾을 수 없어 오디오를 분할할 수 없습니다.")
+        
+        ranges = list(zip([0.0] + cut_points, cut_points + [None]))
+        chunk_paths = [
+            str(output_dir / f"{base_name}_chunk_{i:03d}{audio_normalizer.extension}")
+            for i in range(len(ranges))
+        ]
+        window = self.encode_workers + self.chunk_queue_size
+        
+        async def cut(index: int) -> str:
+            start, end = ranges[index]
+            size = await self._cut_time_range(source_path, start, end, chunk_paths[index])
+            # 완료되는 순서대로 진행 상황 출력
+            print(f"청크 {index + 1}/{len(ranges)} 잘라내기 완료 ({size / 1024 / 1024:.2f}MB)")
+            return chunk_paths[index]
+        
+        pending = {}
+        next_submit = 0
+        try:
+            for index in range(len(ranges)):
+                while next_submit < len(ranges) and next_submit - index < window:
+                    pending[next_submit] = asyncio.create_task(cut(next_submit))
+                    next_submit += 1
+                
+                chunk_path = await pending.pop(index)
+                yield chunk_path
+        
+        finally:
+            # 중간에 실패/취소된 경우 남은 작업을 취소하고 (ffmpeg 종료) 파일 삭제
+            for task in pending.values():
+                task.cancel()
+            await asyncio.gather(*pending.values(), return_exceptions=True)
+            for index in pending:
+                if os.path.exists(chunk_paths[index]):
+                    os.remove(chunk_paths[index])
+    
+    async def _cut_time_range(self, source_path: str, start: float, end: Optional[float], chunk_path: str) -> int:
+        """
+        정규화된 파일의 [start, end) 구간(초)을 재인코딩 없이 청크 파일로 복사
+        
+        encode_workers개까지 동시에 실행된다. 디코딩/인코딩을 하지 않으므로 transcode 슬롯은 사용하지 않는다.
+        
+        Returns:
+            저장된 청크 크기 (바이트)
+        """
+        cmd = [audio_probe.ffmpeg_path, "-hide_banner", "-nostdin", "-loglevel", "error", "-ss", f"{start:.3f}", "-i", source_path]
+        if end is not None:
+            cmd += ["-t", f"{end - start:.3f}"]
+        cmd += ["-map", "0:a:0", "-c:a", "copy", "-y", chunk_path]
+        
+        async with self._encode_slots:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                _, stderr = await process.communicate()
+            finally:
+                # 취소된 경우 ffmpeg 정리
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+        
+        if process.returncode != 0:
+            raise Exception(f"청크 잘라내기 실패 ({os.path.basename(chunk_path)}): {stderr.decode(errors='ignore')[-500:]}")
+        return os.path.getsize(chunk_path)
+    
+    async def _stream_chunks(
+        self,
+        source_path: str,
+        output_dir: Path,
+        base_name: str,
+        cut_points: Optional[List[float]],
+        chunk_seconds: float
+    ) -> AsyncIterator[str]:
+        """
+        디코더(ffmpeg)의 PCM 출력을 조금씩 읽어 청크별 인코더(ffmpeg)에 바로 넘기고, 청크가 끝날 때마다 경로를 반환
+        
+        정규화하지 못한 원본처럼 스트림 복사로 자를 수 없는 입력에 사용한다.
+        메모리에는 읽기 버퍼 하나만 유지하므로 입력 길이와 관계없이 사용량이 일정하다.
+        
+        Args:
+            source_path: 입력 오디오 파일 경로
+            output_dir: 청크 저장 디렉토리
+            base_name: 청크 파일 이름 앞부분
+            cut_points: 자를 위치 목록 (초). None이면 chunk_seconds 간격
+            chunk_seconds: 고정 간격으로 자를 때의 청크 길이 (초)
+        """
+        if not audio_probe.ffmpeg_path:
+            raise Exception("ffmpeg를 찾을 수 없어 오디오를 분할할 수 없습니다.")
+        
+        sample_rate = audio_normalizer.sample_rate
+        if cut_points is not None:
+            boundaries = iter(cut_points)
+        else:
+            boundaries = itertools.count(chunk_seconds, chunk_seconds)
+        
+        def next_boundary() -> Optional[int]:
+            # 샘플 단위로 맞춘 바이트 위치 (s16le 모노: 샘플당 2바이트)
+            seconds = next(boundaries, None)
+            return None if seconds is None else int(seconds * sample_rate) * 2
+        
+        decoder = None
+        encoder = None
+        chunk_path = None
+        index = 0
+        position = 0
+        try:
+            decoder = await asyncio.create_subprocess_exec(
+                audio_probe.ffmpeg_path,
+                "-hide_banner", "-nostdin", "-loglevel", "error",
+                "-i", source_path,
+                "-vn", "-ac", "1", "-ar", str(sample_rate),
+                "-f", "s16le", "-acodec", "pcm_s16le",
+                "pipe:1",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            boundary = next_boundary()
+            data = b""
+            eof = False
+            
+            while not eof:
+                # 청크 하나를 만드는 동안만 transcode 슬롯 사용
+                # (청크를 넘겨주고 기다리는 동안은 읽지 않으므로 디코더도 파이프가 차면 멈춤)
+                finished = None
+                async with stage("transcode"):
+                    while finished is None:
+                        if not data:
+                            data = await decoder.stdout.read(self.stream_buffer_size)
+                            if not data:
+                                eof = True
+                                break
+                        
+                        if encoder is None:
+                            # 이미 지난 경계는 건너뜀 (빈 청크 방지)
+                            while boundary is not None and boundary <= position:
+                                boundary = next_boundary()
+                            chunk_path = str(output_dir / f"{base_name}_chunk_{index:03d}{audio_normalizer.extension}")
+                            encoder = await self._start_encoder(chunk_path)
+                        
+                        take = len(data) if boundary is None else min(len(data), boundary - position)
+                        encoder.stdin.write(data[:take])
+                        await encoder.stdin.drain()
+                        position += take
+                        data = data[take:]
+                        
+                        if boundary is not None and position >= boundary:
+                            await self._finish_encoder(encoder, chunk_path)
+                            encoder = None
+                            index += 1
+                            finished = chunk_path
+                    
+                    if eof:
+                        await decoder.wait()
+                        if decoder.returncode != 0:
+                            raise Exception(f"오디오 디코딩 실패 (ffmpeg 종료 코드 {decoder.returncode})")
+                        
+                        if encoder is not None:
+                            await self._finish_encoder(encoder, chunk_path)
+                            encoder = None
+                            index += 1
+                            finished = chunk_path
+                
+                if finished:
+                    yield finished
+            
+            if index == 0:
+                raise Exception("분할할 오디오 데이터가 없습니다.")
+        
+        finally:
+            # 중간에 실패/취소된 경우 ffmpeg 프로세스와 쓰다 만 청크 정리
+            for process in (encoder, decoder):
+                if process and process.returncode is None:
+                    process.kill()
+                    await process.wait()
+            if encoder is not None and chunk_path and os.path.exists(chunk_path):
+                os.remove(chunk_path)
+    
+    async def _start_encoder(self, chunk_path: str):
+        """PCM을 표준 입력으로 받아 정규화와 같은 설정으로 청크를 저장하는 ffmpeg 프로세스"""
+        return await asyncio.create_subprocess_exec(
+            audio_probe.ffmpeg_path,
+            "-hide_banner", "-nostdin", "-loglevel", "error",
+            "-f", "s16le", "-ar", str(audio_normalizer.sample_rate), "-ac", "1",
+            "-i", "pipe:0",
+            *audio_normalizer.codec_args,
+            "-y", chunk_path,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+    
+    async def _finish_encoder(self, encoder, chunk_path: str):
+        """인코더 입력을 닫고 청크 저장이 끝나기를 기다림"""
+        encoder.stdin.close()
+        stderr = await encoder.stderr.read()
+        await encoder.wait()
+        if encoder.returncode != 0:
+            raise Exception(f"청크 인코딩 실패 ({Path(chunk_path).name}): {stderr.decode(errors='ignore')[-500:]}")
+    
+    async def transcribe_chunks(
+        self,
+        chunk_files: List[str],
+        openai_client,
+        language: str = "ko",
+        on_segment: Optional[ChunkSegmentCallback] = None
+    ) -> str:
         """
         분할된 오디오 청크들을 순차적으로 음성 인식하여 텍스트로 변환
         
         Args:
             chunk_files: 분할된 오디오 파일 경로 리스트
-            openai_client: OpenAI 클라이언트
+            openai_client: 비동기 OpenAI 클라이언트 (openai_clients.get_openai_client)
             language: 언어 코드
+            on_segment: 청크 하나의 변환이 끝날 때마다 (청크 인덱스, 텍스트, None, None)으로 호출
             
         Returns:
             모든 청크의 텍스트를 합친 전체 텍스트
@@ -106,14 +419,15 @@ class AudioSplitter:
                 print(f"음성 인식 진행 중: {i+1}/{len(chunk_files)} - {Path(chunk_file).name}")
                 
                 with open(chunk_file, "rb") as audio_file:
-                    transcript_response = await asyncio.to_thread(
-                        openai_client.audio.transcriptions.create,
-                        model="whisper-1",
-                        file=audio_file,
-                        language=language
-                    )
+                    async with stage("transcribe"):
+                        transcript_response = await openai_client.audio.transcriptions.create(
+                            model="whisper-1",
+                            file=audio_file,
+                            language=language
+                        )
                 
                 chunk_text = transcript_response.text.strip()
+                await call_maybe_async(on_segment, i, chunk_text, None, None)
                 if chunk_text:
                     all_transcripts.append(chunk_text)
                     print(f"청크 {i+1} 완료: {len(chunk_text)} 글자")
@@ -138,37 +452,124 @@ class AudioSplitter:
             except Exception as e:
                 print(f"청크 파일 삭제 실패 {chunk_file}: {e}")
     
-    async def process_large_audio_file(self, file_path: str, openai_client, language: str = "ko") -> str:
+    async def process_large_audio_file(
+        self,
+        file_path: str,
+        openai_client,
+        language: str = "ko",
+        content_hash: Optional[str] = None,
+        on_segment: Optional[ChunkSegmentCallback] = None
+    ) -> str:
         """
         큰 오디오 파일을 처리하는 메인 함수
         
         Args:
             file_path: 오디오 파일 경로
-            openai_client: OpenAI 클라이언트
+            openai_client: 비동기 OpenAI 클라이언트 (openai_clients.get_openai_client)
             language: 언어 코드
+            content_hash: 파일 내용 해시 (없으면 계산). 같은 오디오는 캐시된 텍스트를 사용
+            on_segment: 분할 처리 시 청크 하나의 변환이 끝날 때마다 (청크 인덱스, 텍스트, 원본 기준 시작, 끝)으로 호출 (완료 순서)
             
         Returns:
             전체 텍스트
         """
+        if not content_hash:
+            content_hash = await hash_file(file_path)
+        
+        # 무음 제거 여부에 따라 결과가 달라지므로 캐시 키에 포함
+        vad = self.silence_stripper.enabled
+        cached_transcript = self.transcript_cache.get(content_hash, "whisper-1", language, vad)
+        if cached_transcript is not None:
+            print("이전에 변환한 텍스트를 사용합니다.")
+            return cached_transcript
+        
         if not self.needs_splitting(file_path):
             # 파일이 작으면 바로 처리
             print("파일 크기가 제한 내에 있어 바로 처리합니다.")
             with open(file_path, "rb") as audio_file:
-                transcript_response = await asyncio.to_thread(
-                    openai_client.audio.transcriptions.create,
-                    model="whisper-1",
-                    file=audio_file,
-                    language=language
-                )
-            return transcript_response.text
-        
-        # 파일이 크면 분할 처리
-        print("파일이 커서 분할 처리합니다.")
-        chunk_files = await self.split_audio_file(file_path)
+                async with stage("transcribe"):
+                    transcript_response = await openai_client.audio.transcriptions.create(
+                        model="whisper-1",
+                        file=audio_file,
+                        language=language
+                    )
+            transcript = transcript_response.text
+        else:
+            # 파일이 크면 분할과 음성 인식을 파이프라인으로 처리
+            print("파일이 커서 분할 처리합니다.")
+            ranges: List[Tuple[float, Optional[float]]] = []
+            transcript = await self.transcribe_stream(
+                self.iter_audio_chunks(file_path, ranges=ranges), openai_client, language,
+                on_segment=on_segment, ranges=ranges
+            )
+        
+        self.transcript_cache.put(content_hash, transcript, "whisper-1", language, vad)
+        return transcript
+    
+    async def transcribe_stream(
+        self,
+        chunk_source: AsyncIterator[str],
+        openai_client,
+        language: str = "ko",
+        on_segment: Optional[ChunkSegmentCallback] = None,
+        ranges: Optional[List[Tuple[float, Optional[float]]]] = None
+    ) -> str:
+        """
+        청크가 만들어지는 즉시 음성 인식을 시작하고, 처리된 청크 파일은 바로 삭제
+        
+        Args:
+            chunk_source: 청크 파일 경로를 생성하는 비동기 이터레이터
+            openai_client: 비동기 OpenAI 클라이언트 (openai_clients.get_openai_client)
+            language: 언어 코드
+            on_segment: 청크 하나의 변환이 끝날 때마다 (청크 인덱스, 텍스트, 시작, 끝)으로 호출 (완료 순서)
+            ranges: chunk_source가 채우는 청크별 원본 기준 [시작, 끝] 목록 (iter_audio_chunks의 ranges)
+            
+        Returns:
+            모든 청크의 텍스트를 원래 순서대로 합친 전체 텍스트
+        """
+        produced_files: List[str] = []
+        
+        async def transcribe(chunk_file: str) -> str:
+            print(f"음성 인식 진행 중: {Path(chunk_file).name}")
+            with open(chunk_file, "rb") as audio_file:
+                async with stage("transcribe"):
+                    transcript_response = await openai_client.audio.transcriptions.create(
+                        model="whisper-1",
+                        file=audio_file,
+                        language=language
+                    )
+            return transcript_response.text.strip()
+        
+        async def tracked_source() -> AsyncIterator[str]:
+            try:
+                async for chunk_file in chunk_source:
+                    produced_files.append(chunk_file)
+                    yield chunk_file
+            finally:
+                await chunk_source.aclose()
+        
+        async def on_chunk_event(index: int, status: str, text: Optional[str]):
+            if status == "completed":
+                print(f"청크 {index+1} 완료: {len(text)} 글자")
+                start, end = ranges[index] if ranges and index < len(ranges) else (None, None)
+                await call_maybe_async(on_segment, index, text, start, end)
         
         try:
-            transcript = await self.transcribe_chunks(chunk_files, openai_client, language)
-            return transcript
+            transcripts = await transcribe_chunk_stream(
+                tracked_source(),
+                transcribe,
+                max_concurrency=self.max_concurrent_chunks,
+                queue_size=self.chunk_queue_size,
+                on_chunk_event=on_chunk_event,
+                cleanup=lambda chunk_file: self.cleanup_chunks([chunk_file])
+            )
+        except Exception as e:
+            print(f"청크 음성 인식 실패: {e}")
+            raise
         finally:
-            # 청크 파일들 정리
-            self.cleanup_chunks(chunk_files)
+            # 실패로 큐에 남은 청크 파일들 정리
+            self.cleanup_chunks(produced_files)
+        
+        full_transcript = " ".join(text for text in transcripts if text)
+        print(f"전체 음성 인식 완료: {len(full_transcript)} 글자")
+        return full_transcript
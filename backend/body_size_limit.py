@@ -0,0 +1,52 @@
+from typing import Iterable
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+
+class BodySizeLimitMiddleware:
+    def __init__(self, app, paths: Iterable[str], max_body_size: int, detail: str = "Request body too large"):
+        """
+        요청 본문 크기 제한 (ASGI 미들웨어)
+
+        multipart 폼은 엔드포인트가 실행되기 전에 전체가 임시 파일로 스풀되므로, 엔드포인트 안에서는
+        크기를 확인해도 이미 모두 받은 뒤다. 여기서 Content-Length로 먼저 거부하고,
+        길이를 알 수 없는(chunked) 요청은 받는 동안 누적 크기가 넘으면 바로 중단한다.
+
+        Args:
+            app: 감쌀 ASGI 앱
+            paths: 제한할 요청 경로
+            max_body_size: 허용할 최대 본문 크기 (바이트, 폼 경계 등 multipart 오버헤드 포함)
+            detail: 413 응답 메시지
+        """
+        self.app = app
+        self.paths = set(paths)
+        self.max_body_size = max_body_size
+        self.detail = detail
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body_size:
+            # 본문을 읽지 않고 바로 거부
+            response = JSONResponse({"detail": self.detail}, status_code=413, headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # 폼 파싱 중에 발생하며 FastAPI가 그대로 413 응답으로 변환
+                    raise HTTPException(status_code=413, detail=self.detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
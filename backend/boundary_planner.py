@@ -0,0 +1,231 @@
+import asyncio
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from audio_probe import audio_probe
+from stage_limits import stage
+
+
+class BoundaryPlanner:
+    def __init__(self, analysis_rate: int = 8000, frame_ms: int = 20, smooth_ms: int = 300, search_seconds: float = 30.0):
+        """
+        무음 구간 기준 청크 경계 계획
+
+        목표 청크 길이 직전의 검색 구간에서 에너지가 가장 낮은 지점을 잘라 단어 중간에서 끊기지 않게 한다.
+        경계를 정하려고 오디오를 따로 디코딩하지 않도록, 정규화 중에 함께 출력한 저샘플레이트 PCM을
+        tracker()로 받는 대로 분석해 검색 구간 하나만큼 앞서 경계를 정한다 (audio_normalizer.normalize).
+
+        Args:
+            analysis_rate: 에너지 분석용 샘플레이트 (Hz)
+            frame_ms: 에너지 프레임 길이 (ms)
+            smooth_ms: 에너지 이동 평균 길이 (ms). 짧은 자음 사이가 아닌 실제 쉼을 찾기 위함
+            search_seconds: 목표 길이 직전에서 경계를 찾는 최대 구간 (초)
+        """
+        self.analysis_rate = analysis_rate
+        self.frame_ms = frame_ms
+        self.smooth_ms = smooth_ms
+        self.search_seconds = search_seconds
+
+    @property
+    def frame_seconds(self) -> float:
+        return self.frame_ms / 1000
+
+    @property
+    def pcm_output_args(self) -> List[str]:
+        """에너지 분석용 PCM 출력 옵션 (ffmpeg 출력 하나로 추가해 tracker에 넘김)"""
+        return ["-vn", "-ac", "1", "-ar", str(self.analysis_rate), "-f", "s16le", "-acodec", "pcm_s16le"]
+
+    def tracker(self, chunk_seconds: float) -> "CutTracker":
+        """PCM을 받는 대로 경계를 정하는 추적기 (각 청크는 chunk_seconds를 넘지 않음)"""
+        return CutTracker(self, chunk_seconds)
+
+    async def scan_energy(self, file_path: str) -> Optional[np.ndarray]:
+        """
+        ffmpeg로 디코딩한 PCM을 조금씩 읽어 프레임별 평균 에너지 배열 생성 (프레임 길이는 frame_ms)
+
+        전체 에너지가 먼저 필요한 무음 구간 검출용. 경계 계획은 정규화와 같은 디코딩에서 tracker()로 처리한다.
+        """
+        if not audio_probe.ffmpeg_path:
+            return None
+
+        frame_len = self.analysis_rate * self.frame_ms // 1000
+        frame_bytes = frame_len * 2  # s16le
+        read_size = frame_bytes * 500  # 10초 분량씩 읽기
+
+        cmd = [
+            audio_probe.ffmpeg_path,
+            "-hide_banner",
+            "-nostdin",
+            "-loglevel", "error",
+            "-i", file_path,
+            *self.pcm_output_args,
+            "pipe:1",
+        ]
+
+        energies: List[np.ndarray] = []
+        process = None
+        try:
+            async with stage("transcode"):
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+
+                pending = b""
+                while True:
+                    data = await process.stdout.read(read_size)
+                    if not data:
+                        break
+                    pending += data
+
+                    usable = len(pending) - len(pending) % frame_bytes
+                    if usable:
+                        energies.append(self._frame_energy(pending[:usable], frame_len))
+                        pending = pending[usable:]
+
+                await process.wait()
+
+            if process.returncode != 0:
+                print(f"에너지 분석 실패: ffmpeg 종료 코드 {process.returncode}")
+                return None
+        except Exception as e:
+            print(f"에너지 분석 실패: {e}")
+            return None
+        finally:
+            if process and process.returncode is None:
+                process.kill()
+                await process.wait()
+
+        if not energies:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(energies)
+
+    def choose_cuts(self, energy: np.ndarray, chunk_seconds: float) -> List[float]:
+        """프레임 에너지 배열 전체에서 경계 위치 선택"""
+        tracker = self.tracker(chunk_seconds)
+        tracker.feed_energy(energy)
+        return tracker.finish()
+
+    def _frame_energy(self, pcm: bytes, frame_len: int) -> np.ndarray:
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        return np.mean(np.square(samples.reshape(-1, frame_len)), axis=1)
+
+
+class CutTracker:
+    def __init__(self, planner: BoundaryPlanner, chunk_seconds: float):
+        """
+        받는 대로 경계를 정하는 추적기
+
+        현재 청크의 목표 길이 지점 뒤로 이동 평균 길이만큼 에너지가 들어오면 바로 그 청크의 경계를 정하고,
+        다음 검색 구간보다 앞의 에너지는 버린다. 전체 배열로 고른 경계와 같은 결과를 내며,
+        메모리에는 검색 구간과 읽기 버퍼 정도만 남는다.
+
+        Args:
+            planner: 프레임/검색 구간 설정
+            chunk_seconds: 청크 최대 길이 (초)
+        """
+        self.planner = planner
+        frames_per_second = 1 / planner.frame_seconds
+        self.chunk_frames = int(chunk_seconds * frames_per_second)
+        self.search_frames = max(1, min(int(planner.search_seconds * frames_per_second), self.chunk_frames // 2))
+        self.frame_len = planner.analysis_rate * planner.frame_ms // 1000
+
+        # 이동 평균으로 짧은 순간의 에너지 변화를 무시하고 지속적인 쉼을 찾음
+        smooth_frames = max(1, int(planner.smooth_ms / planner.frame_ms))
+        self.kernel = np.ones(smooth_frames, dtype=np.float32) / smooth_frames
+        # 프레임 하나의 이동 평균에 쓰이는 앞/뒤 프레임 수 (np.convolve mode="same" 기준)
+        self.reach_before = smooth_frames // 2
+        self.reach_after = (smooth_frames - 1) // 2
+
+        self.cuts: List[float] = []
+        self._pcm = b""  # 프레임 하나가 되지 못한 PCM
+        self._energy = np.zeros(0, dtype=np.float32)  # _offset번째 프레임부터의 에너지
+        self._offset = 0
+        self._total = 0
+        self._start = 0  # 현재 청크의 시작 프레임
+
+    def feed_pcm(self, pcm: bytes) -> List[float]:
+        """s16le 모노 PCM(planner.analysis_rate) 추가 후 새로 정해진 경계(초) 반환"""
+        self._pcm += pcm
+        frame_bytes = self.frame_len * 2
+        usable = len(self._pcm) - len(self._pcm) % frame_bytes
+        if not usable:
+            return []
+        energy = self.planner._frame_energy(self._pcm[:usable], self.frame_len)
+        self._pcm = self._pcm[usable:]
+        return self.feed_energy(energy)
+
+    def feed_energy(self, energy: np.ndarray) -> List[float]:
+        """프레임 에너지 추가 후 새로 정해진 경계(초) 반환"""
+        if self.chunk_frames <= 0:
+            return []
+        self._energy = np.concatenate((self._energy, energy.astype(np.float32, copy=False)))
+        self._total += len(energy)
+        return self._decide(final=False)
+
+    def finish(self) -> List[float]:
+        """입력이 끝난 뒤 남은 경계를 정하고 전체 경계 목록(초) 반환 (시작 0과 끝은 제외)"""
+        if self.chunk_frames > 0:
+            self._decide(final=True)
+        return self.cuts
+
+    def _decide(self, final: bool) -> List[float]:
+        decided: List[float] = []
+        while self._total - self._start > self.chunk_frames:
+            hi = self._start + self.chunk_frames
+            lo = hi - self.search_frames
+            # 검색 구간 끝의 이동 평균에 필요한 에너지가 아직 없으면 다음 입력을 기다림
+            if not final and self._total < hi + self.reach_after:
+                break
+
+            # 검색 구간과 이동 평균에 필요한 앞뒤 프레임만 잘라서 계산
+            begin = max(self._offset, lo - self.reach_before)
+            stop = min(self._total, hi + self.reach_after)
+            smoothed = np.convolve(self._energy[begin - self._offset:stop - self._offset], self.kernel, mode="same")
+            window = smoothed[lo - begin:hi - begin]
+
+            # 최저 에너지 지점이 여러 곳이면 뒤쪽(청크가 더 긴 쪽)을 선택
+            last = len(window) - 1 - int(np.argmin(window[::-1]))
+            # 최저 에너지가 이어지는 구간의 가운데에서 자름
+            louder = np.nonzero(window[:last + 1] > window[last])[0]
+            run_start = int(louder[-1]) + 1 if len(louder) else 0
+            cut = lo + (run_start + last) // 2
+            decided.append(round(cut * self.planner.frame_seconds, 3))
+            self._start = cut
+
+            # 다음 검색 구간 앞의 에너지는 더 이상 필요 없음
+            keep_from = max(self._offset, min(self._total, cut + self.chunk_frames - self.search_frames - self.reach_before))
+            self._energy = self._energy[keep_from - self._offset:]
+            self._offset = keep_from
+
+        self.cuts.extend(decided)
+        return decided
+
+
+def chunk_time_range(
+    index: int,
+    cut_points: Optional[List[float]],
+    chunk_seconds: float,
+    duration: Optional[float] = None
+) -> Tuple[float, Optional[float]]:
+    """
+    index번째 청크의 [시작, 끝] (초, 분할한 파일 기준)
+
+    cut_points가 None이면 chunk_seconds 간격으로 자른 것으로 본다. 마지막 청크의 끝은 duration
+    (알 수 없으면 고정 간격의 끝, 경계 목록을 쓴 경우 None)
+    """
+    if cut_points is not None:
+        start = cut_points[index - 1] if 0 < index <= len(cut_points) else 0.0
+        end = cut_points[index] if index < len(cut_points) else duration
+    else:
+        start = index * chunk_seconds
+        end = (index + 1) * chunk_seconds
+        if duration:
+            end = min(end, duration)
+    return start, end
+
+
+# 공용 경계 계획기
+boundary_planner = BoundaryPlanner()
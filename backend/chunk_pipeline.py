@@ -0,0 +1,109 @@
+import asyncio
+import inspect
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+
+
+# 청크 이벤트 콜백: (청크 인덱스, 상태, 변환된 텍스트)
+# 상태는 "queued", "processing", "completed", "failed" 중 하나
+# 코루틴 함수여도 되며, 이 경우 끝날 때까지 기다린 뒤 다음 단계로 진행한다 (작업 저장소 쓰기 등)
+ChunkEventCallback = Callable[[int, str, Optional[str]], Union[None, Awaitable[None]]]
+
+# 청크 텍스트 콜백: (청크 인덱스, 변환된 텍스트, 원본 기준 시작 시간, 끝 시간), 코루틴 함수 가능
+# 시간(초)은 알 수 없으면 None
+ChunkSegmentCallback = Callable[[int, str, Optional[float], Optional[float]], Union[None, Awaitable[None]]]
+
+
+async def call_maybe_async(callback: Optional[Callable], *args):
+    """콜백 호출 (코루틴을 반환하면 기다림)"""
+    if callback is None:
+        return
+    result = callback(*args)
+    if inspect.isawaitable(result):
+        await result
+
+
+async def transcribe_chunk_stream(
+    chunk_source: AsyncIterator[str],
+    transcribe: Callable[[str], Awaitable[str]],
+    max_concurrency: int = 4,
+    queue_size: int = 2,
+    on_chunk_event: Optional[ChunkEventCallback] = None,
+    cleanup: Optional[Callable[[str], None]] = None
+) -> List[str]:
+    """
+    분할과 음성 인식을 파이프라인으로 처리
+
+    chunk_source가 청크 파일을 하나 만들 때마다 큐에 넣고, 소비자들이 즉시 음성 인식을 시작한다.
+    큐 크기가 제한되어 있으므로 chunk_source가 다음 청크를 요청받을 때까지 분할을 멈춘다면
+    디스크에 남는 청크 수는 queue_size + max_concurrency + 2 이하로 유지된다
+    (넘겨주기를 기다리는 청크와 만들어지는 중인 청크 각 1개, 예: VideoProcessingService._iter_audio_chunks).
+
+    Args:
+        chunk_source: 청크 파일 경로를 순서대로 생성하는 비동기 이터레이터
+        transcribe: 청크 파일 경로를 받아 텍스트를 반환하는 코루틴 함수
+        max_concurrency: 동시에 처리할 최대 청크 수
+        queue_size: 대기 큐의 최대 크기
+        on_chunk_event: 청크 상태가 바뀔 때 호출되는 콜백
+        cleanup: 청크 처리가 끝난 뒤 파일을 정리하는 함수
+
+    Returns:
+        원래 청크 순서대로 정렬된 텍스트 리스트
+    """
+    max_concurrency = max(1, max_concurrency)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+    results: Dict[int, str] = {}
+
+    async def notify(index: int, status: str, text: Optional[str] = None):
+        await call_maybe_async(on_chunk_event, index, status, text)
+
+    async def produce():
+        index = 0
+        try:
+            async for chunk_path in chunk_source:
+                await notify(index, "queued")
+                await queue.put((index, chunk_path))
+                index += 1
+        finally:
+            # 취소된 경우에도 분할 작업(ffmpeg 등)을 즉시 정리
+            aclose = getattr(chunk_source, "aclose", None)
+            if aclose:
+                await aclose()
+
+        # 소비자 종료 신호
+        for _ in range(max_concurrency):
+            await queue.put(None)
+
+    async def consume():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+
+            index, chunk_path = item
+            await notify(index, "processing")
+            try:
+                text = await transcribe(chunk_path)
+            except Exception:
+                await notify(index, "failed")
+                raise
+            finally:
+                if cleanup:
+                    cleanup(chunk_path)
+
+            results[index] = text
+            await notify(index, "completed", text)
+
+    jobs = [asyncio.create_task(produce())]
+    jobs += [asyncio.create_task(consume()) for _ in range(max_concurrency)]
+
+    try:
+        await asyncio.gather(*jobs)
+    except BaseException:
+        # 하나라도 실패하면 생산자와 나머지 소비자 모두 취소
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*jobs, return_exceptions=True)
+        raise
+
+    return [results[i] for i in sorted(results)]
+
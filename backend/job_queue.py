@@ -0,0 +1,197 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+
+class JobQueue:
+    def __init__(
+        self,
+        db_path: str,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 3,
+        priority_aging_seconds: float = 30.0
+    ):
+        """
+        SQLite 기반 작업 큐 (API 프로세스가 넣고 worker.py 프로세스들이 꺼내 처리)
+
+        Args:
+            db_path: SQLite 파일 경로 (API와 워커가 같은 파일을 사용해야 함)
+            lease_seconds: 워커가 하트비트 없이 작업을 붙잡고 있을 수 있는 시간.
+                지나면 워커가 죽은 것으로 보고 다른 워커가 다시 가져간다
+            max_attempts: 워커 비정상 종료로 재시도할 최대 횟수
+            priority_aging_seconds: 기다린 시간이 이만큼 지날 때마다 우선순위를 1씩 올려 낮은 우선순위 작업이
+                계속 밀리지 않게 함 (0이면 우선순위만 사용)
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.priority_aging_seconds = priority_aging_seconds
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, "
+            "job_type TEXT NOT NULL, "
+            "payload TEXT NOT NULL, "
+            "priority INTEGER NOT NULL DEFAULT 0, "
+            "status TEXT NOT NULL, "  # pending, running, completed, failed
+            "attempts INTEGER NOT NULL DEFAULT 0, "
+            "worker_id TEXT, "
+            "lease_expires_at REAL, "
+            "error TEXT, "
+            "created_at REAL NOT NULL, "
+            "updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, priority DESC, created_at)")
+
+    def enqueue(self, job_type: str, payload: Dict, priority: int = 0) -> str:
+        """작업 추가 (priority가 클수록 먼저 처리)"""
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, job_type, payload, priority, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 'pending', ?, ?)",
+                (job_id, job_type, json.dumps(payload, ensure_ascii=False), priority, now, now)
+            )
+        return job_id
+
+    def claim(self, worker_id: str, job_types: List[str]) -> Optional[Dict]:
+        """
+        처리할 작업 하나를 가져옴
+
+        대기 중이거나 임대가 만료된 작업 중 priority + 기다린 시간 / priority_aging_seconds가 가장 큰 것
+        """
+        now = time.time()
+        placeholders = ", ".join("?" for _ in job_types)
+        if self.priority_aging_seconds > 0:
+            order_by = "priority + (? - created_at) / ? DESC, created_at"
+            order_params = (now, self.priority_aging_seconds)
+        else:
+            order_by = "priority DESC, created_at"
+            order_params = ()
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 재시도 횟수를 넘긴 채 버려진 작업은 실패 처리
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'worker lost', updated_at = ? "
+                    "WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?",
+                    (now, now, self.max_attempts)
+                )
+
+                row = self._conn.execute(
+                    "SELECT job_id, job_type, payload, priority, attempts FROM jobs "
+                    f"WHERE job_type IN ({placeholders}) "
+                    "AND (status = 'pending' OR (status = 'running' AND lease_expires_at < ?)) "
+                    f"ORDER BY {order_by} LIMIT 1",
+                    (*job_types, now, *order_params)
+                ).fetchone()
+
+                if not row:
+                    self._conn.execute("COMMIT")
+                    return None
+
+                job_id, job_type, payload, priority, attempts = row
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'running', worker_id = ?, attempts = attempts + 1, "
+                    "lease_expires_at = ?, updated_at = ? WHERE job_id = ?",
+                    (worker_id, now + self.lease_seconds, now, job_id)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return {
+            "job_id": job_id,
+            "job_type": job_type,
+            "payload": json.loads(payload),
+            "priority": priority,
+            "attempts": attempts + 1,
+        }
+
+    def heartbeat(self, job_ids: List[str], worker_id: str):
+        """처리 중인 작업들의 임대 연장"""
+        if not job_ids:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                [(now + self.lease_seconds, now, job_id, worker_id) for job_id in job_ids]
+            )
+
+    def complete(self, job_id: str, worker_id: str) -> bool:
+        """작업 완료 처리 (임대를 잃어 다른 워커가 가져간 작업이면 아무것도 바꾸지 않고 False)"""
+        return self._finish(job_id, worker_id, "completed", None)
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """작업 실패 처리 (임대를 잃어 다른 워커가 가져간 작업이면 아무것도 바꾸지 않고 False)"""
+        return self._finish(job_id, worker_id, "failed", error)
+
+    def release(self, job_id: str, worker_id: str) -> bool:
+        """처리하지 못한 작업을 대기 상태로 되돌림 (종료 시 드레인 시간 초과 등, 임대를 가진 경우만)"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'pending', worker_id = NULL, lease_expires_at = NULL, "
+                "attempts = MAX(attempts - 1, 0), updated_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                (time.time(), job_id, worker_id)
+            )
+        return cursor.rowcount > 0
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, job_type, status, priority, attempts, error FROM jobs WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+        if not row:
+            return None
+        return dict(zip(("job_id", "job_type", "status", "priority", "attempts", "error"), row))
+
+    def purge_finished(self, older_than_seconds: float) -> int:
+        """오래된 완료/실패 작업 삭제"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN ('completed', 'failed') AND updated_at < ?",
+                (time.time() - older_than_seconds,)
+            )
+        return cursor.rowcount
+
+    def _finish(self, job_id: str, worker_id: str, status: str, error: Optional[str]) -> bool:
+        # 임대가 만료되어 다른 워커가 다시 가져간 작업의 결과를 덮어쓰지 않음
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_expires_at = NULL, updated_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                (status, error, time.time(), job_id, worker_id)
+            )
+        return cursor.rowcount > 0
+
+
+_default_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """공용 작업 큐 반환 (JOB_DB_PATH, 기본값은 작업 저장소와 같은 uploads/tasks.db / JOB_PRIORITY_AGING_SECONDS)"""
+    global _default_queue
+    if _default_queue is None:
+        db_path = os.getenv("JOB_DB_PATH", os.getenv("TASK_DB_PATH", "uploads/tasks.db"))
+        aging_seconds = float(os.getenv("JOB_PRIORITY_AGING_SECONDS", "30"))
+        _default_queue = JobQueue(db_path, priority_aging_seconds=aging_seconds)
+    return _default_queue
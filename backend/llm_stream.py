@@ -0,0 +1,59 @@
+import time
+import inspect
+from typing import Awaitable, Callable, Optional, Union
+
+# 생성되는 동안 작업 상태에 이어 붙이는 결과 필드 (진행 상황 스트림이 새로 붙은 부분만 전달)
+STREAMED_FIELDS = ("outline", "detailed_explanation")
+
+# 새로 생성된 텍스트 조각 콜백 (코루틴 함수면 끝날 때까지 기다린 뒤 다음 조각을 받음)
+TextDeltaCallback = Callable[[str], Union[None, Awaitable[None]]]
+
+
+async def stream_chat_completion(
+    client,
+    on_delta: Optional[TextDeltaCallback] = None,
+    flush_interval: float = 0.3,
+    **request
+) -> str:
+    """
+    채팅 완성을 스트리밍으로 받으며 생성되는 텍스트를 on_delta로 전달
+
+    토큰마다 콜백을 호출하면 작업 상태 저장이 너무 잦아지므로 flush_interval(초)마다 모아서 전달한다.
+
+    Args:
+        client: 비동기 OpenAI 클라이언트
+        on_delta: 새로 생성된 텍스트 조각을 받는 콜백
+        flush_interval: 콜백 호출 최소 간격 (초)
+        **request: chat.completions.create 인자 (model, messages 등)
+
+    Returns:
+        생성된 전체 텍스트
+    """
+    parts, pending = [], []
+    last_flush = time.monotonic()
+
+    stream = await client.chat.completions.create(stream=True, **request)
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+
+        parts.append(delta)
+        pending.append(delta)
+        if on_delta and time.monotonic() - last_flush >= flush_interval:
+            await _deliver(on_delta, "".join(pending))
+            pending.clear()
+            last_flush = time.monotonic()
+
+    if on_delta and pending:
+        await _deliver(on_delta, "".join(pending))
+    return "".join(parts)
+
+
+async def _deliver(on_delta: TextDeltaCallback, text: str):
+    result = on_delta(text)
+    if inspect.isawaitable(result):
+        await result
+
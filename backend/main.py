@@ -1,15 +1,26 @@
 import os
 import uuid
 import asyncio
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Form
+import re
+import hashlib
+from typing import Callable, Dict, Optional
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from pathlib import Path
 import aiofiles
-from models import VideoUploadResponse, ProcessingStatus, VideoSummaryResult, YouTubeProcessRequest
+from models import (
+    VideoUploadResponse, ProcessingStatus, VideoSummaryResult, YouTubeProcessRequest,
+    UploadSessionCreateRequest, UploadSessionStatus, PartialTranscript
+)
 from services_chunked import VideoProcessingService
 from youtube_processing_service_simple import YouTubeProcessingService
+from upload_sessions import UploadSessionManager, UploadSessionError
+from job_queue import get_job_queue
+from body_size_limit import BodySizeLimitMiddleware
+from task_events import task_event_hub
+from task_store import SEGMENT_COUNT_FIELD, TEXT_FIELDS, VERSION_FIELD, WARNINGS_FIELD
 import time
 
 # 환경 변수 로드
@@ -31,13 +42,50 @@ app.add_middleware(
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
-# 비디오 처리 서비스 초기화
+# 비디오 처리 서비스 초기화 (상태 조회/정리용, 실제 처리는 worker.py 프로세스에서 수행)
 video_service = VideoProcessingService()
 youtube_service = YouTubeProcessingService()
 
+# 처리 작업 큐
+job_queue = get_job_queue()
+
+# 작업 우선순위 (클수록 먼저 처리) - 짧게 끝나는 작은 파일을 먼저 처리
+SMALL_FILE_SIZE = 25 * 1024 * 1024
+PRIORITY_SMALL_UPLOAD = 10
+PRIORITY_LARGE_UPLOAD = 0
+PRIORITY_YOUTUBE = 5
+
+# 텍스트 변환이 끝나 더 이상 청크 텍스트가 추가되지 않는 상태 (부분 텍스트 조회 종료 판단)
+TRANSCRIPT_FINISHED_STATUSES = ("generating_outline", "generating_summary", "completed", "failed")
+
+# 조건부 조회 캐시 정책 (상태는 매번 재검증, 완료된 결과는 바뀌지 않으므로 브라우저 캐시 허용)
+STATUS_CACHE_CONTROL = "no-cache"
+RESULT_CACHE_CONTROL = "private, max-age=3600"
+
 # 지원하는 비디오 형식
 ALLOWED_EXTENSIONS = {".mp4", ".mp3", ".wav", ".m4a", ".webm"}
 
+# 업로드 스트리밍 설정 (한 번에 메모리에 올리는 크기 / 최대 업로드 크기)
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE_MB", "2048")) * 1024 * 1024
+
+# multipart 폼 경계/다른 폼 필드용 여유분
+UPLOAD_FORM_OVERHEAD = 1024 * 1024
+
+# 이어받기 가능한 업로드 세션
+UPLOAD_SESSION_TTL_SECONDS = float(os.getenv("UPLOAD_SESSION_TTL_SECONDS", "86400"))
+upload_sessions = UploadSessionManager(
+    UPLOAD_DIR, MAX_UPLOAD_SIZE, UPLOAD_CHUNK_SIZE, ttl_seconds=UPLOAD_SESSION_TTL_SECONDS
+)
+
+# 폼 파싱(임시 파일 스풀) 전에 업로드 크기 제한 (Content-Length로 즉시 거부, 모르면 받는 도중 중단)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    paths=["/api/upload"],
+    max_body_size=MAX_UPLOAD_SIZE + UPLOAD_FORM_OVERHEAD,
+    detail=f"File too large. Maximum size is {MAX_UPLOAD_SIZE // (1024 * 1024)}MB"
+)
+
 
 @app.get("/")
 async def root():
@@ -46,7 +94,6 @@ async def root():
 
 @app.post("/api/upload", response_model=VideoUploadResponse)
 async def upload_video(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     summary_ratio: float = Form(0.5)
 ):
@@ -64,29 +111,33 @@ async def upload_video(
     if summary_ratio not in [0.3, 0.5, 0.7]:
         summary_ratio = 0.5
     
+    # 크기를 미리 알 수 있으면 저장 전에 거부
+    if file.size is not None and file.size > MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size is {MAX_UPLOAD_SIZE // (1024 * 1024)}MB"
+        )
+    
     # 고유 ID 생성
     task_id = str(uuid.uuid4())
     file_path = UPLOAD_DIR / f"{task_id}{file_extension}"
     
     try:
-        # 파일 저장
-        async with aiofiles.open(file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        # 파일을 청크 단위로 스트리밍 저장 (해시도 함께 계산)
+        content_hash = await _save_upload_stream(file, file_path)
         
-        # 백그라운드에서 비디오 처리 시작
-        background_tasks.add_task(
-            video_service.process_video,
-            str(file_path),
-            task_id,
-            summary_ratio
-        )
+        # 작업 큐에 비디오 처리 등록
+        await _enqueue_video_job(file_path, task_id, summary_ratio, content_hash)
         
         return VideoUploadResponse(
             task_id=task_id,
             message="Video upload successful. Processing started."
         )
         
+    except HTTPException:
+        if file_path.exists():
+            file_path.unlink()
+        raise
     except Exception as e:
         # 에러 발생 시 파일 삭제
         if file_path.exists():
@@ -94,32 +145,139 @@ async def upload_video(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/upload/sessions", response_model=UploadSessionStatus)
+async def create_upload_session(request: UploadSessionCreateRequest):
+    """이어받기 가능한 업로드 세션 생성"""
+    
+    file_extension = Path(request.filename).suffix.lower()
+    if file_extension not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File format not supported. Allowed formats: {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+    
+    # 요약 비율 검증
+    if request.summary_ratio not in [0.3, 0.5, 0.7]:
+        request.summary_ratio = 0.5
+    
+    try:
+        session = await upload_sessions.create_session(request.filename, request.total_size, request.summary_ratio)
+    except UploadSessionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    return _to_upload_session_status(session)
+
+
+@app.get("/api/upload/sessions/{upload_id}", response_model=UploadSessionStatus)
+async def get_upload_session(upload_id: str):
+    """업로드 세션 상태 조회 (연결이 끊긴 뒤 이어서 보낼 오프셋 확인)"""
+    
+    try:
+        session = await upload_sessions.get_session(upload_id)
+    except UploadSessionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    return _to_upload_session_status(session)
+
+
+@app.put("/api/upload/sessions/{upload_id}", response_model=UploadSessionStatus)
+async def upload_session_range(
+    upload_id: str,
+    request: Request,
+    content_range: str = Header(...)
+):
+    """바이트 범위 업로드 (Content-Range: bytes start-end/total, 순서 무관)"""
+    
+    match = re.fullmatch(r"bytes (\d+)-(\d+)/(\d+|\*)", content_range.strip())
+    if not match:
+        raise HTTPException(status_code=400, detail="Invalid Content-Range header")
+    
+    start, end = int(match.group(1)), int(match.group(2))
+    total = None if match.group(3) == "*" else int(match.group(3))
+    
+    try:
+        session = await upload_sessions.write_range(upload_id, start, end, request.stream(), total)
+    except UploadSessionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    return _to_upload_session_status(session)
+
+
+@app.post("/api/upload/sessions/{upload_id}/complete", response_model=VideoUploadResponse)
+async def complete_upload_session(upload_id: str):
+    """업로드 완료 후 비디오 처리 시작"""
+    
+    try:
+        session = await upload_sessions.get_session(upload_id)
+        task_id = str(uuid.uuid4())
+        file_path = UPLOAD_DIR / f"{task_id}{session['extension']}"
+        content_hash = await upload_sessions.complete_session(upload_id, file_path)
+    except UploadSessionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    await upload_sessions.delete_session(upload_id)
+    
+    # 작업 큐에 비디오 처리 등록
+    await _enqueue_video_job(file_path, task_id, session["summary_ratio"], content_hash)
+    
+    return VideoUploadResponse(
+        task_id=task_id,
+        message="Video upload successful. Processing started."
+    )
+
+
+@app.delete("/api/upload/sessions/{upload_id}")
+async def cancel_upload_session(upload_id: str):
+    """업로드 세션 취소 (임시 파일 삭제)"""
+    
+    await upload_sessions.delete_session(upload_id)
+    
+    return {"message": "Upload session deleted"}
+
+
 @app.get("/api/status/{task_id}", response_model=ProcessingStatus)
-async def get_processing_status(task_id: str):
-    """처리 상태 조회"""
+async def get_processing_status(task_id: str, response: Response, if_none_match: Optional[str] = Header(None)):
+    """처리 상태 조회 (상태/진행률/버전만 반환, 결과는 /api/result에서 조회)"""
     
-    task_status = video_service.get_task_status(task_id)
+    task_status = await _get_task(video_service, task_id)
     
     if not task_status:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    return ProcessingStatus(
-        task_id=task_id,
-        status=task_status.get("status", "unknown"),
-        progress=task_status.get("progress", 0),
-        message=task_status.get("message", _get_status_message(task_status.get("status"))),
-        transcript=task_status.get("transcript") if task_status.get("status") == "completed" else None,
-        outline=task_status.get("outline") if task_status.get("status") == "completed" else None,
-        detailed_explanation=task_status.get("detailed_explanation") if task_status.get("status") == "completed" else None,
-        error=task_status.get("error") if task_status.get("status") == "failed" else None
+    return _status_response(
+        task_id, task_status, _get_status_message, f"/api/result/{task_id}", response, if_none_match
+    )
+
+
+@app.get("/api/transcript/{task_id}", response_model=PartialTranscript)
+async def get_partial_transcript(task_id: str, cursor: int = 0):
+    """변환이 끝난 청크 텍스트 조회 (cursor 이후에 추가된 것만 반환)"""
+    
+    task_status = await _get_task(video_service, task_id)
+    
+    if not task_status:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    return await _partial_transcript_response(video_service, task_id, task_status, cursor)
+
+
+@app.get("/api/events/{task_id}")
+async def stream_processing_events(task_id: str):
+    """처리 진행 상황 스트림 (Server-Sent Events, 상태 폴링 대신 사용)"""
+    
+    if not await _get_task(video_service, task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    return _event_stream_response(
+        task_event_hub.stream(video_service.tasks, task_id, _get_status_message)
     )
 
 
 @app.get("/api/result/{task_id}", response_model=VideoSummaryResult)
-async def get_result(task_id: str):
-    """처리 결과 조회"""
+async def get_result(task_id: str, response: Response, if_none_match: Optional[str] = Header(None)):
+    """처리 결과 조회 (완료 후에는 바뀌지 않으므로 캐시 가능)"""
     
-    task_status = video_service.get_task_status(task_id)
+    task_status = await _get_task(video_service, task_id, TEXT_FIELDS)
     
     if not task_status:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -130,11 +288,18 @@ async def get_result(task_id: str):
             detail=f"Task is not completed. Current status: {task_status.get('status')}"
         )
     
+    etag = _etag(task_status)
+    if _is_not_modified(if_none_match, etag):
+        return _not_modified_response(etag, RESULT_CACHE_CONTROL)
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = RESULT_CACHE_CONTROL
     return VideoSummaryResult(
         task_id=task_id,
         file_name=Path(task_status["file_path"]).name,
         transcript=task_status["transcript"],
         outline=task_status["outline"],
+        detailed_explanation=task_status.get("detailed_explanation"),
         processing_time=0.0  # TODO: 실제 처리 시간 계산
     )
 
@@ -143,22 +308,19 @@ async def get_result(task_id: str):
 async def cleanup_task(task_id: str):
     """작업 정리 (파일 삭제 포함)"""
     
-    task_status = video_service.get_task_status(task_id)
+    task_status = await _get_task(video_service, task_id)
     
     if not task_status:
         # 이미 삭제된 작업인 경우 성공으로 처리
         return {"message": "Task already cleaned up or does not exist"}
     
-    video_service.cleanup_task(task_id)
+    await asyncio.to_thread(video_service.cleanup_task, task_id)
     
     return {"message": "Task cleaned up successfully"}
 
 
 @app.post("/api/youtube", response_model=VideoUploadResponse)
-async def process_youtube_url(
-    background_tasks: BackgroundTasks,
-    request: YouTubeProcessRequest
-):
+async def process_youtube_url(request: YouTubeProcessRequest):
     """YouTube URL 처리 시작"""
     
     # 요약 비율 검증
@@ -169,13 +331,24 @@ async def process_youtube_url(
     task_id = str(uuid.uuid4())
     
     try:
-        # 백그라운드에서 YouTube 처리 시작
-        background_tasks.add_task(
-            youtube_service.process_youtube_url,
-            request.youtube_url,
+        # 작업 큐에 YouTube 처리 등록
+        await asyncio.to_thread(
+            youtube_service.mark_queued,
             task_id,
-            request.summary_ratio,
-            request.download_video
+            youtube_url=request.youtube_url,
+            summary_ratio=request.summary_ratio,
+            download_video=request.download_video
+        )
+        await asyncio.to_thread(
+            job_queue.enqueue,
+            "process_youtube_url",
+            {
+                "youtube_url": request.youtube_url,
+                "task_id": task_id,
+                "summary_ratio": request.summary_ratio,
+                "download_video": request.download_video
+            },
+            priority=PRIORITY_YOUTUBE
         )
         
         return VideoUploadResponse(
@@ -188,24 +361,76 @@ async def process_youtube_url(
 
 
 @app.get("/api/youtube/status/{task_id}", response_model=ProcessingStatus)
-async def get_youtube_processing_status(task_id: str):
-    """YouTube 처리 상태 조회"""
+async def get_youtube_processing_status(task_id: str, response: Response, if_none_match: Optional[str] = Header(None)):
+    """YouTube 처리 상태 조회 (상태/진행률/버전만 반환, 결과는 /api/youtube/result에서 조회)"""
     
-    task_status = youtube_service.get_task_status(task_id)
+    task_status = await _get_task(youtube_service, task_id)
     
     if not task_status:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    return ProcessingStatus(
+    return _status_response(
+        task_id, task_status, _get_youtube_status_message, f"/api/youtube/result/{task_id}", response, if_none_match
+    )
+
+
+@app.get("/api/youtube/result/{task_id}", response_model=VideoSummaryResult)
+async def get_youtube_result(task_id: str, response: Response, if_none_match: Optional[str] = Header(None)):
+    """YouTube 처리 결과 조회 (완료 후에는 바뀌지 않으므로 캐시 가능)"""
+    
+    task_status = await _get_task(youtube_service, task_id, TEXT_FIELDS)
+    
+    if not task_status:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    if task_status.get("status") != "completed":
+        raise HTTPException(
+            status_code=400,
+            detail=f"Task is not completed. Current status: {task_status.get('status')}"
+        )
+    
+    etag = _etag(task_status)
+    if _is_not_modified(if_none_match, etag):
+        return _not_modified_response(etag, RESULT_CACHE_CONTROL)
+    
+    metadata = task_status.get("metadata") or {}
+    file_path = task_status.get("file_path")
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = RESULT_CACHE_CONTROL
+    return VideoSummaryResult(
         task_id=task_id,
-        status=task_status.get("status", "unknown"),
-        progress=task_status.get("progress", 0),
-        message=task_status.get("message", _get_youtube_status_message(task_status.get("status"))),
-        transcript=task_status.get("transcript") if task_status.get("status") == "completed" else None,
-        outline=task_status.get("outline") if task_status.get("status") == "completed" else None,
-        detailed_explanation=task_status.get("detailed_explanation") if task_status.get("status") == "completed" else None,
-        error=task_status.get("error") if task_status.get("status") == "failed" else None,
-        metadata=task_status.get("metadata")
+        file_name=metadata.get("title") or (Path(file_path).name if file_path else task_id),
+        transcript=task_status["transcript"],
+        outline=task_status["outline"],
+        detailed_explanation=task_status.get("detailed_explanation"),
+        processing_time=0.0,
+        metadata=metadata or None,
+        downloaded_file_path=task_status.get("downloaded_file_path")
+    )
+
+
+@app.get("/api/youtube/transcript/{task_id}", response_model=PartialTranscript)
+async def get_youtube_partial_transcript(task_id: str, cursor: int = 0):
+    """YouTube 음성 인식 중 변환이 끝난 청크 텍스트 조회 (cursor 이후에 추가된 것만 반환)"""
+    
+    task_status = await _get_task(youtube_service, task_id)
+    
+    if not task_status:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    return await _partial_transcript_response(youtube_service, task_id, task_status, cursor)
+
+
+@app.get("/api/youtube/events/{task_id}")
+async def stream_youtube_processing_events(task_id: str):
+    """YouTube 처리 진행 상황 스트림 (Server-Sent Events, 상태 폴링 대신 사용)"""
+    
+    if not await _get_task(youtube_service, task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    return _event_stream_response(
+        task_event_hub.stream(youtube_service.tasks, task_id, _get_youtube_status_message)
     )
 
 
@@ -213,19 +438,157 @@ async def get_youtube_processing_status(task_id: str):
 async def cleanup_youtube_task(task_id: str):
     """YouTube 작업 정리"""
     
-    task_status = youtube_service.get_task_status(task_id)
+    task_status = await _get_task(youtube_service, task_id)
     
     if not task_status:
         return {"message": "Task already cleaned up or does not exist"}
     
-    youtube_service.cleanup_task(task_id)
+    await asyncio.to_thread(youtube_service.cleanup_task, task_id)
     
     return {"message": "Task cleaned up successfully"}
 
 
+async def _save_upload_stream(file: UploadFile, file_path: Path) -> str:
+    """
+    업로드 파일을 청크 단위로 디스크에 저장하고 SHA-256 해시 반환 (최대 크기 초과 시 중단)
+    
+    요청 본문 크기는 BodySizeLimitMiddleware가 폼 파싱 전에 제한하고, 여기서는 파일 필드 자체의 크기를 확인한다.
+    """
+    hasher = hashlib.sha256()
+    total_size = 0
+    
+    async with aiofiles.open(file_path, 'wb') as f:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            
+            total_size += len(chunk)
+            if total_size > MAX_UPLOAD_SIZE:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large. Maximum size is {MAX_UPLOAD_SIZE // (1024 * 1024)}MB"
+                )
+            
+            hasher.update(chunk)
+            await f.write(chunk)
+    
+    return hasher.hexdigest()
+
+
+async def _get_task(service, task_id: str, fields=()) -> Dict:
+    """작업 상태 조회 (저장소 접근은 스레드에서 실행해 이벤트 루프를 막지 않음, 텍스트 필드는 fields만)"""
+    return await asyncio.to_thread(service.get_task_status, task_id, tuple(fields))
+
+
+async def _enqueue_video_job(file_path: Path, task_id: str, summary_ratio: float, content_hash: str):
+    """업로드된 파일의 처리 작업을 큐에 등록"""
+    file_size = file_path.stat().st_size
+    priority = PRIORITY_SMALL_UPLOAD if file_size <= SMALL_FILE_SIZE else PRIORITY_LARGE_UPLOAD
+    
+    await asyncio.to_thread(video_service.mark_queued, task_id, file_path=str(file_path), summary_ratio=summary_ratio)
+    await asyncio.to_thread(
+        job_queue.enqueue,
+        "process_video",
+        {
+            "file_path": str(file_path),
+            "task_id": task_id,
+            "summary_ratio": summary_ratio,
+            "content_hash": content_hash
+        },
+        priority=priority
+    )
+
+
+def _to_upload_session_status(session: dict) -> UploadSessionStatus:
+    """세션 정보를 응답 모델로 변환"""
+    return UploadSessionStatus(
+        upload_id=session["upload_id"],
+        filename=session["filename"],
+        total_size=session["total_size"],
+        offset=upload_sessions.committed_offset(session),
+        received_ranges=session["received_ranges"],
+        completed=session["completed"]
+    )
+
+
+def _status_response(
+    task_id: str,
+    task_status: Dict,
+    status_message: Callable[[str], str],
+    result_url: str,
+    response: Response,
+    if_none_match: Optional[str]
+):
+    """상태 응답 생성 (버전이 같으면 본문 없이 304)"""
+    etag = _etag(task_status)
+    if _is_not_modified(if_none_match, etag):
+        return _not_modified_response(etag, STATUS_CACHE_CONTROL)
+    
+    status = task_status.get("status", "unknown")
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = STATUS_CACHE_CONTROL
+    return ProcessingStatus(
+        task_id=task_id,
+        status=status,
+        progress=task_status.get("progress", 0),
+        message=task_status.get("message") or status_message(status),
+        version=task_status.get(VERSION_FIELD, 0),
+        error=task_status.get("error") if status == "failed" else None,
+        metadata=task_status.get("metadata") or None,
+        result_url=result_url if status == "completed" else None,
+        transcript_cursor=task_status.get(SEGMENT_COUNT_FIELD),
+        warnings=task_status.get(WARNINGS_FIELD) or None
+    )
+
+
+async def _partial_transcript_response(service, task_id: str, task_status: Dict, cursor: int) -> PartialTranscript:
+    """부분 텍스트 응답 생성 (cursor 이후의 청크 텍스트만 저장소에서 읽음)"""
+    cursor = max(0, cursor)
+    segments = await service.tasks.asegments_after(task_id, cursor)
+    return PartialTranscript(
+        task_id=task_id,
+        segments=segments,
+        cursor=cursor + len(segments),
+        chunks_total=task_status.get("chunks_total"),
+        # 텍스트 길이로 판단하면 무음/빈 텍스트에서 끝나지 않으므로 작업 단계로 판단
+        complete=task_status.get("status") in TRANSCRIPT_FINISHED_STATUSES
+    )
+
+
+def _etag(task_status: Dict) -> str:
+    """작업 상태 버전 기반 ETag"""
+    return f'"{task_status.get(VERSION_FIELD, 0)}"'
+
+
+def _is_not_modified(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 현재 ETag와 일치하는지 확인 (여러 값, W/ 접두사, * 허용)"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or any(value.removeprefix("W/") == etag for value in candidates)
+
+
+def _not_modified_response(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def _event_stream_response(events) -> StreamingResponse:
+    """SSE 응답 (프록시 버퍼링/캐시를 끄고 이벤트를 바로 전달)"""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
 def _get_status_message(status: str) -> str:
     """상태에 따른 메시지 반환"""
     messages = {
+        "queued": "대기 중...",
         "processing": "비디오 처리 중...",
         "splitting_file": "파일 분할 중...",
         "extracting_transcript": "음성을 텍스트로 변환 중...",
@@ -240,6 +603,7 @@ def _get_status_message(status: str) -> str:
 def _get_youtube_status_message(status: str) -> str:
     """YouTube 처리 상태에 따른 메시지 반환"""
     messages = {
+        "queued": "대기 중...",
         "processing": "YouTube 영상 처리 중...",
         "extracting_metadata": "영상 정보 추출 중...",
         "extracting_subtitles": "자막 추출 시도 중...",
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 
 class VideoUploadResponse(BaseModel):
@@ -13,17 +13,47 @@ class YouTubeProcessRequest(BaseModel):
     download_video: bool = Field(default=False, description="True: download video, False: audio only")
 
 
+class UploadSessionCreateRequest(BaseModel):
+    filename: str
+    total_size: int = Field(gt=0, description="Total file size in bytes")
+    summary_ratio: float = 0.5
+
+
+class UploadSessionStatus(BaseModel):
+    upload_id: str
+    filename: str
+    total_size: int
+    offset: int  # 처음부터 끊김 없이 받은 바이트 수 (이어서 보낼 위치)
+    received_ranges: List[List[int]]  # 받은 [start, end) 범위 목록
+    completed: bool
+
+
 class ProcessingStatus(BaseModel):
     task_id: str
     status: str  # "processing", "extracting_transcript", "splitting_file", "generating_outline", "completed", "failed"
     progress: int  # 0-100
     message: str
-    transcript: Optional[str] = None
-    outline: Optional[str] = None
-    detailed_explanation: Optional[str] = None
+    version: int = 0  # 상태가 바뀔 때마다 증가 (ETag)
     error: Optional[str] = None
     metadata: Optional[Dict] = None  # YouTube metadata
-    downloaded_file_path: Optional[str] = None  # Downloaded file path
+    result_url: Optional[str] = None  # 완료 시 결과(텍스트/아웃라인/해설) 조회 경로
+    transcript_cursor: Optional[int] = None  # 지금까지 공개된 청크 텍스트 수 (부분 텍스트 조회용)
+    warnings: Optional[List[str]] = None  # 처리는 끝났지만 결과에 일부 내용이 빠졌을 수 있는 경우의 안내
+
+
+class TranscriptSegment(BaseModel):
+    index: int  # 원래 청크 순서
+    text: str
+    start: Optional[float] = None  # 원본 오디오 기준 시작 시간 (초, 무음 제거 시에도 원본 기준)
+    end: Optional[float] = None  # 원본 오디오 기준 끝 시간 (초, 알 수 없으면 None)
+
+
+class PartialTranscript(BaseModel):
+    task_id: str
+    segments: List[TranscriptSegment]  # 요청한 cursor 이후에 완료된 청크 텍스트 (완료 순서)
+    cursor: int  # 다음 요청에 보낼 cursor
+    chunks_total: Optional[int] = None
+    complete: bool  # 텍스트 변환이 끝나 더 추가될 청크 텍스트가 없는지 여부 (실패한 경우 포함)
 
 
 class VideoSummaryResult(BaseModel):
@@ -31,6 +61,7 @@ class VideoSummaryResult(BaseModel):
     file_name: str
     transcript: str
     outline: str
+    detailed_explanation: Optional[str] = None
     processing_time: float
     metadata: Optional[Dict] = None
     downloaded_file_path: Optional[str] = None
@@ -0,0 +1,74 @@
+import os
+import asyncio
+import importlib.util
+import weakref
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+# 이벤트 루프별 공용 클라이언트 (httpx 비동기 연결은 만들어진 루프에서만 쓸 수 있음)
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+_warned_missing_key = False
+
+
+def get_openai_client() -> Optional[AsyncOpenAI]:
+    """
+    공용 비동기 OpenAI 클라이언트 반환 (실행 중인 이벤트 루프 안에서 호출)
+
+    모든 음성 인식/채팅 호출이 연결 풀 하나를 공유하므로, 요청마다 스레드를 점유하지 않고
+    수백 개의 동시 호출을 keep-alive 연결 위에서 처리할 수 있다.
+
+    OPENAI_API_KEY가 없으면 None.
+    OPENAI_MAX_CONNECTIONS: 최대 동시 연결 수 (기본 200)
+    OPENAI_MAX_KEEPALIVE: 유지할 유휴 연결 수 (기본 50)
+    OPENAI_KEEPALIVE_EXPIRY: 유휴 연결 유지 시간 (초, 기본 30)
+    OPENAI_CONNECT_TIMEOUT: 연결 타임아웃 (초, 기본 10)
+    OPENAI_TIMEOUT: 응답 대기 타임아웃 (초, 기본 600 - 긴 음성 인식 기준)
+    OPENAI_MAX_RETRIES: 연결 오류/429/5xx 재시도 횟수 (기본 2)
+    OPENAI_HTTP2: HTTP/2 사용 여부 (기본 true, h2 패키지가 없으면 HTTP/1.1)
+    """
+    global _warned_missing_key
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        if not _warned_missing_key:
+            print("Warning: OPENAI_API_KEY not found in environment variables")
+            _warned_missing_key = True
+        return None
+
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=api_key,
+            max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "2")),
+            http_client=_build_http_client()
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_openai_client():
+    """현재 이벤트 루프의 공용 클라이언트 연결 정리 (프로세스 종료 시)"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    http2 = os.getenv("OPENAI_HTTP2", "true").lower() == "true"
+    if http2 and importlib.util.find_spec("h2") is None:
+        print("Warning: h2 패키지가 없어 OpenAI 연결에 HTTP/1.1을 사용합니다 (pip install 'httpx[http2]')")
+        http2 = False
+
+    timeout = float(os.getenv("OPENAI_TIMEOUT", "600"))
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "200")),
+            max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE", "50")),
+            keepalive_expiry=float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "30"))
+        ),
+        timeout=httpx.Timeout(timeout, connect=float(os.getenv("OPENAI_CONNECT_TIMEOUT", "10")))
+    )
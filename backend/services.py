@@ -1,12 +1,10 @@
 import os
-import asyncio
-from typing import Dict
-from pathlib import Path
+from typing import Dict, Iterable
 
 from langgraph.graph import StateGraph
 from typing_extensions import TypedDict
-import time
-import uuid
+from task_store import TaskMap, get_task_store
+from openai_clients import get_openai_client
 
 
 # 워크플로우 상태 정의
@@ -25,15 +23,17 @@ class VideoProcessingService:
         # OpenAI API 키 설정
         os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY", "")
         
-        self.tasks: Dict[str, VideoProcessState] = {}
-        
-        # OpenAI 클라이언트 초기화
-        from openai import OpenAI
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # 작업 상태 (공용 저장소에 저장되어 재시작/여러 워커 간에도 유지)
+        self.tasks = TaskMap(get_task_store(), "langgraph_video")
         
         # LangGraph 워크플로우 구성
         self.graph = self._build_workflow()
     
+    @property
+    def openai_client(self):
+        """공용 비동기 OpenAI 클라이언트"""
+        return get_openai_client()
+    
     def _build_workflow(self):
         """워크플로우 그래프 구성"""
         graph_builder = StateGraph(VideoProcessState)
@@ -55,14 +55,13 @@ class VideoProcessingService:
             # 진행 상황 업데이트
             state["progress"] = 30
             state["status"] = "extracting_transcript"
-            self.tasks[state["task_id"]] = state
+            await self.tasks.aset(state["task_id"], state)
             
             file_path = state["file_path"]
             
             # OpenAI Whisper API를 직접 사용
             with open(file_path, "rb") as audio_file:
-                transcript_response = await asyncio.to_thread(
-                    self.openai_client.audio.transcriptions.create,
+                transcript_response = await self.openai_client.audio.transcriptions.create(
                     model="whisper-1",
                     file=audio_file,
                     language="ko"  # 한국어 설정
@@ -72,14 +71,14 @@ class VideoProcessingService:
             
             state["transcript"] = transcript
             state["progress"] = 60
-            self.tasks[state["task_id"]] = state
+            await self.tasks.aset(state["task_id"], state)
             
             return state
             
         except Exception as e:
             state["error"] = str(e)
             state["status"] = "failed"
-            self.tasks[state["task_id"]] = state
+            await self.tasks.aset(state["task_id"], state)
             raise
     
     async def _generate_outline(self, state: VideoProcessState) -> VideoProcessState:
@@ -87,13 +86,12 @@ class VideoProcessingService:
         try:
             state["progress"] = 70
             state["status"] = "generating_outline"
-            self.tasks[state["task_id"]] = state
+            await self.tasks.aset(state["task_id"], state)
             
             transcript = state["transcript"]
             
             # OpenAI API를 직접 사용하여 아웃라인 생성
-            response = await asyncio.to_thread(
-                self.openai_client.chat.completions.create,
+            response = await self.openai_client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are a helpful assistant that generates an outline for a transcript. Make sure to use Korean when you generate the outline."},
@@ -107,14 +105,14 @@ class VideoProcessingService:
             state["outline"] = outline
             state["progress"] = 100
             state["status"] = "completed"
-            self.tasks[state["task_id"]] = state
+            await self.tasks.aset(state["task_id"], state)
             
             return state
             
         except Exception as e:
             state["error"] = str(e)
             state["status"] = "failed"
-            self.tasks[state["task_id"]] = state
+            await self.tasks.aset(state["task_id"], state)
             raise
     
     async def process_video(self, file_path: str, task_id: str):
@@ -131,26 +129,21 @@ class VideoProcessingService:
                 error=""
             )
             
-            self.tasks[task_id] = initial_state
+            await self.tasks.aset(task_id, initial_state)
             
-            # 워크플로우 실행
-            result = await asyncio.to_thread(
-                self.graph.invoke,
-                initial_state
-            )
+            # 워크플로우 실행 (노드가 코루틴이므로 이벤트 루프에서 바로 실행)
+            result = await self.graph.ainvoke(initial_state)
             
             return result
             
         except Exception as e:
-            # 에러 처리
-            if task_id in self.tasks:
-                self.tasks[task_id]["status"] = "failed"
-                self.tasks[task_id]["error"] = str(e)
+            # 에러 처리 (작업이 이미 삭제되었으면 무시됨)
+            await self.tasks.handle(task_id).aupdate({"status": "failed", "error": str(e)})
             raise
     
-    def get_task_status(self, task_id: str) -> Dict:
-        """작업 상태 조회"""
-        return self.tasks.get(task_id, {})
+    def get_task_status(self, task_id: str, fields: Iterable[str] = ()) -> Dict:
+        """작업 상태 조회 (텍스트 필드는 fields로 요청한 것만 포함)"""
+        return self.tasks.get(task_id, {}, fields)
     
     def cleanup_task(self, task_id: str):
         """완료된 작업 정리"""
@@ -1,32 +1,73 @@
 import os
 import asyncio
 import io
+import logging
 import subprocess
 import tempfile
 import shutil
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
 from pathlib import Path
 import time
 import uuid
 import math
 
+from audio_normalizer import audio_normalizer
+from audio_probe import audio_probe
+from boundary_planner import chunk_time_range
+from chunk_pipeline import transcribe_chunk_stream
+from llm_stream import TextDeltaCallback, stream_chat_completion
+from openai_clients import get_openai_client
+from silence_stripper import get_silence_stripper, to_original_range
+from stage_limits import stage
+from task_store import SEGMENT_COUNT_FIELD, TEXT_FIELDS, WARNINGS_FIELD, TaskMap, get_task_store
+from text_chunker import text_chunker
+from transcript_cache import get_transcript_cache, hash_file
+
+logger = logging.getLogger(__name__)
+
 
 class VideoProcessingService:
-    def __init__(self):
-        self.tasks: Dict[str, dict] = {}
+    # 청크 길이 (10분, 초 단위)
+    chunk_duration = 600
+    # 음성 인식 모델 (캐시 키에 포함)
+    transcription_model = "whisper-1"
+    # 아웃라인 생성에 그대로 넣을 최대 토큰 수 (넘으면 먼저 요약)
+    outline_input_tokens = 24000
+    # 상세 해설 프롬프트에 포함할 원문 최대 토큰 수
+    explanation_transcript_tokens = 12000
+    # 긴 텍스트 요약 시 조각 하나의 토큰 수
+    summary_chunk_tokens = 4000
+    # 긴 텍스트 요약: 동시에 실행할 조각 요약 수, 조각별 재시도 횟수, 최대 요약 반복 단계
+    summary_map_concurrency = 8
+    summary_piece_retries = 3
+    summary_max_reduce_depth = 3
+    # 분할 ffmpeg에 파이프로 입력을 흘려보낼 수 있는 형식 (정규화된 Opus 등), 한 번에 전달하는 크기 (청크보다 충분히 작게)
+    pipe_input_extensions = (audio_normalizer.extension, ".mp3", ".wav")
+    split_feed_block_size = 256 * 1024
+    
+    def __init__(self, max_concurrent_chunks: Optional[int] = None, chunk_queue_size: int = 2):
+        # 작업 상태 (공용 저장소에 저장되어 재시작/여러 워커 간에도 유지)
+        self.tasks = TaskMap(get_task_store(), "video")
+        # 오디오 내용 해시 기반 음성 인식 캐시
+        self.transcript_cache = get_transcript_cache()
+        # 무음 구간 제거 (VAD_ENABLED=true일 때만)
+        self.silence_stripper = get_silence_stripper()
+        
+        # 동시에 Whisper API로 보낼 수 있는 최대 청크 수 (None이면 MAX_CONCURRENT_CHUNKS, 기본 4)
+        if max_concurrent_chunks is None:
+            max_concurrent_chunks = int(os.getenv("MAX_CONCURRENT_CHUNKS", "4"))
+        self.max_concurrent_chunks = max(1, max_concurrent_chunks)
+        # 분할이 끝나고 음성 인식을 기다리는 청크 수 제한 (디스크 사용량 제한)
+        self.chunk_queue_size = max(1, chunk_queue_size)
         
-        # OpenAI 클라이언트 초기화
-        from openai import OpenAI
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            self.openai_client = OpenAI(api_key=api_key)
-        else:
-            print("Warning: OPENAI_API_KEY not found in environment variables")
-            self.openai_client = None
-            
         # ffmpeg 경로 설정 (Windows의 경우)
         self.ffmpeg_path = self._find_ffmpeg()
     
+    @property
+    def openai_client(self):
+        """공용 비동기 OpenAI 클라이언트 (API 키가 없으면 None)"""
+        return get_openai_client()
+    
     def _find_ffmpeg(self):
         """ffmpeg 실행 파일 찾기"""
         # 일반적인 경로들
@@ -48,12 +89,15 @@ class VideoProcessingService:
         print("Warning: ffmpeg not found. Large file processing may not work.")
         return "ffmpeg"
     
-    async def process_video(self, file_path: str, task_id: str, summary_ratio: float = 0.5):
+    async def process_video(self, file_path: str, task_id: str, summary_ratio: float = 0.5, content_hash: Optional[str] = None):
         """비디오 처리 메인 함수"""
+        # 작업 상태는 여러 필드를 한 번에, 이벤트 루프 밖에서 갱신
+        task = self.tasks.handle(task_id)
         try:
             # 초기 상태 설정
-            self.tasks[task_id] = {
+            await self.tasks.aset(task_id, {
                 "file_path": file_path,
+                "content_hash": content_hash,
                 "transcript": "",
                 "outline": "",
                 "task_id": task_id,
@@ -62,39 +106,56 @@ class VideoProcessingService:
                 "error": "",
                 "message": "처리 시작...",
                 "summary_ratio": summary_ratio
-            }
-            
-            # 파일 크기 확인
-            file_size = os.path.getsize(file_path)
-            max_size = 25 * 1024 * 1024  # 25MB
-            
-            if file_size <= max_size:
-                # 작은 파일은 직접 처리
-                await self._extract_transcript_simple(task_id)
+            })
+            
+            # 같은 오디오를 이미 변환한 적이 있으면 캐시된 텍스트 사용
+            if not content_hash:
+                content_hash = await hash_file(file_path)
+                await task.aupdate({"content_hash": content_hash})
+            
+            # 무음 제거 여부에 따라 결과가 달라지므로 캐시 키에 포함
+            vad = self.silence_stripper.enabled
+            transcript = self.transcript_cache.get(content_hash, self.transcription_model, vad=vad)
+            
+            if transcript is not None:
+                await task.aupdate({
+                    "transcript": transcript,
+                    "progress": 60,
+                    "message": "이전에 변환한 텍스트를 사용합니다."
+                })
             else:
-                # 큰 파일은 분할 처리
-                await self._extract_transcript_chunked(task_id)
+                # 파일 크기 확인
+                file_size = os.path.getsize(file_path)
+                max_size = 25 * 1024 * 1024  # 25MB
+                
+                if file_size <= max_size:
+                    # 작은 파일은 직접 처리
+                    transcript = await self._extract_transcript_simple(task_id, file_path)
+                else:
+                    # 큰 파일은 분할 처리
+                    transcript = await self._extract_transcript_chunked(task_id, file_path)
+                
+                self.transcript_cache.put(content_hash, transcript, self.transcription_model, vad=vad)
             
             # 아웃라인 생성
-            await self._generate_outline(task_id)
+            await self._generate_outline(task_id, transcript, summary_ratio)
             
-            return self.tasks[task_id]
+            return await self.tasks.aget(task_id, fields=TEXT_FIELDS)
             
         except Exception as e:
-            # 에러 처리
-            if task_id in self.tasks:
-                self.tasks[task_id]["status"] = "failed"
-                self.tasks[task_id]["error"] = str(e)
+            # 에러 처리 (작업이 이미 삭제되었으면 무시됨)
+            await task.aupdate({"status": "failed", "error": str(e)})
             raise
     
-    async def _extract_transcript_simple(self, task_id: str):
+    async def _extract_transcript_simple(self, task_id: str, file_path: str) -> str:
         """작은 파일의 음성을 텍스트로 변환"""
+        task = self.tasks.handle(task_id)
         try:
-            self.tasks[task_id]["progress"] = 30
-            self.tasks[task_id]["status"] = "extracting_transcript"
-            self.tasks[task_id]["message"] = "음성을 텍스트로 변환 중..."
-            
-            file_path = self.tasks[task_id]["file_path"]
+            await task.aupdate({
+                "progress": 30,
+                "status": "extracting_transcript",
+                "message": "음성을 텍스트로 변환 중..."
+            })
             
             if not self.openai_client:
                 raise Exception("OpenAI client not initialized")
@@ -108,158 +169,343 @@ class VideoProcessingService:
             file_obj.name = Path(file_path).name
             
             # API 호출
-            transcript_response = await asyncio.to_thread(
-                self.openai_client.audio.transcriptions.create,
-                model="whisper-1",
-                file=file_obj
-            )
+            async with stage("transcribe"):
+                transcript_response = await self.openai_client.audio.transcriptions.create(
+                    model=self.transcription_model,
+                    file=file_obj
+                )
             
             # 응답 처리
             transcript = transcript_response.text if hasattr(transcript_response, 'text') else str(transcript_response)
             
-            self.tasks[task_id]["transcript"] = transcript
-            self.tasks[task_id]["progress"] = 60
+            await task.aupdate({"transcript": transcript, "progress": 60})
+            return transcript
             
         except Exception as e:
-            self.tasks[task_id]["error"] = str(e)
-            self.tasks[task_id]["status"] = "failed"
+            await task.aupdate({"error": str(e), "status": "failed"})
             raise
     
-    async def _extract_transcript_chunked(self, task_id: str):
+    async def _extract_transcript_chunked(self, task_id: str, file_path: str) -> str:
         """큰 파일을 분할하여 처리"""
+        task = self.tasks.handle(task_id)
         try:
-            self.tasks[task_id]["progress"] = 10
-            self.tasks[task_id]["status"] = "splitting_file"
-            self.tasks[task_id]["message"] = "파일 분할 중..."
+            await task.aupdate({
+                "progress": 10,
+                "status": "splitting_file",
+                "message": "파일 분할 중..."
+            })
             
-            file_path = self.tasks[task_id]["file_path"]
             file_size = os.path.getsize(file_path)
             
             # 임시 디렉토리 생성
             temp_dir = tempfile.mkdtemp()
             
             try:
-                # 파일을 청크로 분할
-                chunks = await self._split_audio_file(file_path, temp_dir)
+                # 음성 인식용으로 정규화 (모노/16kHz/저비트레이트)하면서 같은 디코딩으로
+                # 목표 길이 근처의 무음 구간에서 자르도록 경계 계획 (분석할 수 없으면 고정 간격)
+                await task.aupdate({"message": "오디오 정규화 중..."})
+                normalized_path = os.path.join(temp_dir, f"normalized{audio_normalizer.extension}")
+                planned_duration = audio_normalizer.plan_chunk_duration(audio_normalizer.estimated_bytes_per_second)
+                normalized = None
+                timeline = None
+                if self.silence_stripper.enabled:
+                    # 긴 무음 구간은 제거하고, 원본 시간으로 되돌릴 수 있도록 구간 대응표 저장
+                    normalized = await self.silence_stripper.strip(file_path, normalized_path, planned_duration)
+                    if normalized:
+                        timeline = normalized["timeline"]
+                        await task.aupdate({
+                            "timeline_map": normalized["timeline"],
+                            "removed_silence_seconds": round(normalized["removed_seconds"], 1)
+                        })
+                if not normalized:
+                    normalized = await audio_normalizer.normalize(
+                        file_path, normalized_path, chunk_seconds=planned_duration
+                    )
+                if normalized:
+                    source_path = normalized["path"]
+                    duration = normalized["duration"]
+                    chunk_duration = audio_normalizer.plan_chunk_duration(normalized["bytes_per_second"])
+                    cut_points = normalized["cut_points"]
+                else:
+                    source_path = file_path
+                    duration = await self._get_audio_duration(file_path)
+                    chunk_duration = self.chunk_duration
+                    cut_points = None
                 
-                if not chunks:
-                    raise Exception("파일 분할에 실패했습니다.")
+                # 분할과 음성 인식을 동시에 진행 (청크가 만들어지는 즉시 전사 시작)
+                # 길이를 알 수 없으면 청크가 만들어지는 대로 전체 개수를 갱신
+                if cut_points is not None:
+                    estimated_chunks = len(cut_points) + 1
+                else:
+                    estimated_chunks = max(1, math.ceil(duration / chunk_duration)) if duration else 1
+                
+                def chunk_range(index: int):
+                    # 청크 텍스트에 붙일 원본 기준 시간 (무음을 제거했으면 대응표로 변환)
+                    return to_original_range(timeline, *chunk_time_range(index, cut_points, chunk_duration, duration))
                 
-                # 각 청크 처리
-                transcripts = []
-                total_chunks = len(chunks)
+                transcripts = await self._transcribe_chunks_concurrently(
+                    task_id,
+                    file_path,
+                    self._iter_audio_chunks(source_path, temp_dir, chunk_duration, cut_points),
+                    estimated_chunks,
+                    chunk_range
+                )
                 
-                for i, chunk_path in enumerate(chunks):
-                    progress = 20 + (40 * i // total_chunks)
-                    self.tasks[task_id]["progress"] = progress
-                    self.tasks[task_id]["message"] = f"청크 {i+1}/{total_chunks} 처리 중..."
-                    
-                    # 청크 트랜스크립트 추출
-                    chunk_transcript = await self._process_chunk(chunk_path)
-                    transcripts.append(chunk_transcript)
+                if not transcripts:
+                    raise Exception("파일 분할에 실패했습니다.")
                 
                 # 모든 트랜스크립트 합치기
                 full_transcript = " ".join(transcripts)
                 
-                self.tasks[task_id]["transcript"] = full_transcript
-                self.tasks[task_id]["progress"] = 60
-                self.tasks[task_id]["message"] = "텍스트 변환 완료"
+                await task.aupdate({
+                    "transcript": full_transcript,
+                    "progress": 60,
+                    "message": "텍스트 변환 완료"
+                })
+                return full_transcript
                 
             finally:
                 # 임시 디렉토리 정리
                 shutil.rmtree(temp_dir, ignore_errors=True)
                 
         except Exception as e:
-            self.tasks[task_id]["error"] = str(e)
-            self.tasks[task_id]["status"] = "failed"
+            await task.aupdate({"error": str(e), "status": "failed"})
             raise
     
+    async def _transcribe_chunks_concurrently(
+        self,
+        task_id: str,
+        file_path: str,
+        chunk_source: AsyncIterator[str],
+        estimated_chunks: int,
+        chunk_range: Optional[Callable[[int], Tuple[float, Optional[float]]]] = None
+    ) -> List[str]:
+        """
+        만들어지는 청크들을 제한된 동시성으로 음성 인식 (결과는 원래 청크 순서 유지)
+        
+        chunk_range가 있으면 완료된 청크 텍스트에 그 청크의 원본 기준 [시작, 끝] (초)을 함께 저장한다.
+        """
+        task = self.tasks.handle(task_id)
+        
+        # 청크별 진행 상태 (완료된 청크 텍스트는 SEGMENT_COUNT_FIELD 개수만큼 따로 쌓임)
+        await task.aupdate({
+            "chunks_total": estimated_chunks,
+            "chunks_completed": 0,
+            "chunk_status": [],
+            SEGMENT_COUNT_FIELD: 0,
+            "progress": 20,
+            "message": f"청크 0/{estimated_chunks} 처리 중..."
+        })
+        
+        async def on_chunk_event(index: int, status: str, text: Optional[str]):
+            # 다른 워커가 읽는 중에도 일관되도록 한 번의 원자적 갱신으로 반영
+            def apply(state: Dict):
+                if status == "queued":
+                    state["chunk_status"].append(status)
+                    return
+                
+                state["chunk_status"][index] = status
+                if status == "processing" and state["status"] == "splitting_file":
+                    state["status"] = "extracting_transcript"
+                elif status == "completed":
+                    state["chunks_completed"] += 1
+                    completed = state["chunks_completed"]
+                    total = max(state["chunks_total"], len(state["chunk_status"]))
+                    state["progress"] = 20 + (40 * completed // total)
+                    state["message"] = f"청크 {completed}/{total} 처리 완료"
+            
+            if status == "completed":
+                # 전체가 끝나기 전에도 읽을 수 있도록 완료된 청크 텍스트를 같은 쓰기에서 바로 공개
+                start, end = chunk_range(index) if chunk_range else (None, None)
+                await task.aadd_segment(index, text, start, end, fn=apply)
+            else:
+                await task.amutate(apply)
+        
+        def cleanup(chunk_path: str):
+            # 원본 파일이 아닌 청크는 전사가 끝나는 즉시 삭제
+            if chunk_path != file_path and os.path.exists(chunk_path):
+                os.remove(chunk_path)
+        
+        transcripts = await transcribe_chunk_stream(
+            chunk_source,
+            self._process_chunk,
+            max_concurrency=self.max_concurrent_chunks,
+            queue_size=self.chunk_queue_size,
+            on_chunk_event=on_chunk_event,
+            cleanup=cleanup
+        )
+        
+        await task.aupdate({"chunks_total": len(transcripts)})
+        return transcripts
+    
     async def _split_audio_file(self, input_path: str, output_dir: str) -> List[str]:
         """오디오 파일을 청크로 분할"""
+        return [chunk_path async for chunk_path in self._iter_audio_chunks(input_path, output_dir)]
+    
+    async def _iter_audio_chunks(
+        self,
+        input_path: str,
+        output_dir: str,
+        chunk_duration: Optional[int] = None,
+        cut_points: Optional[List[float]] = None
+    ) -> AsyncIterator[str]:
+        """
+        ffmpeg 한 번의 실행으로 오디오를 청크로 분할하며 청크가 완성될 때마다 경로를 반환
+        
+        cut_points(초)가 있으면 그 위치에서 자르고, 없으면 chunk_duration 간격으로 자른다.
+        파이프로 읽을 수 있는 형식이면 입력을 직접 흘려보내며, 완성된 청크를 넘겨주기 전까지는
+        입력을 멈추므로 디스크에는 넘겨주기를 기다리는 청크 1개와 만들어지는 중인 청크 1개만 추가로 남는다.
+        """
+        chunk_duration = chunk_duration or self.chunk_duration
+        if cut_points:
+            segment_args = ["-segment_times", ",".join(f"{t:.3f}" for t in cut_points)]
+        else:
+            segment_args = ["-segment_time", str(chunk_duration)]
+        produced = 0
+        process = None
+        runner = None
+        # 완성된 청크 경로 (ffmpeg 종료 시 None), 입력 전달 재개 신호
+        listed: asyncio.Queue = asyncio.Queue()
+        resume = asyncio.Event()
+        resume.set()
         try:
-            # 파일 정보 가져오기
-            duration = await self._get_audio_duration(input_path)
+            # 이미 정규화된 파일(Opus)이나 mp3이고 청크 크기가 제한 내라면 재인코딩 없이 스트림 복사
+            audio_info = await audio_probe.probe(input_path)
+            if self._can_stream_copy(audio_info, chunk_duration):
+                codec_args = ["-c:a", "copy"]
+                extension = ".mp3" if audio_info["codec_name"] == "mp3" else audio_normalizer.extension
+            else:
+                codec_args = audio_normalizer.codec_args
+                extension = audio_normalizer.extension
             
-            # 청크 크기 계산 (10분 단위로 분할)
-            chunk_duration = 600  # 10분 (초)
-            num_chunks = math.ceil(duration / chunk_duration)
+            # mp4/m4a처럼 끝부분 헤더가 필요한 형식은 파이프로 읽을 수 없으므로 파일을 직접 읽음 (멈추지 않음)
+            throttled = Path(input_path).suffix.lower() in self.pipe_input_extensions
             
-            chunks = []
+            # segment 먹서로 한 번에 분할 (청크가 완성될 때마다 stdout으로 파일명 출력)
+            cmd = [
+                self.ffmpeg_path,
+                "-hide_banner",
+                "-loglevel", "error",
+                "-i", "pipe:0" if throttled else input_path,
+                "-map", "0:a:0",
+                "-vn",
+                *codec_args,
+                "-f", "segment",
+                *segment_args,
+                "-reset_timestamps", "1",
+                "-segment_list", "pipe:1",
+                "-segment_list_type", "flat",
+                "-y",  # 덮어쓰기
+                os.path.join(output_dir, f"chunk_%03d{extension}")
+            ]
             
-            for i in range(num_chunks):
-                start_time = i * chunk_duration
-                output_path = os.path.join(output_dir, f"chunk_{i:03d}.mp3")
-                
-                # ffmpeg 명령어로 청크 추출
-                cmd = [
-                    self.ffmpeg_path,
-                    "-i", input_path,
-                    "-ss", str(start_time),
-                    "-t", str(chunk_duration),
-                    "-acodec", "mp3",
-                    "-ab", "128k",
-                    "-y",  # 덮어쓰기
-                    output_path
-                ]
-                
+            async def run_segmenter() -> bytes:
+                nonlocal process
                 process = await asyncio.create_subprocess_exec(
                     *cmd,
+                    stdin=asyncio.subprocess.PIPE if throttled else asyncio.subprocess.DEVNULL,
                     stdout=asyncio.subprocess.PIPE,
                     stderr=asyncio.subprocess.PIPE
                 )
+                stderr_task = asyncio.create_task(process.stderr.read())
+                feeder = asyncio.create_task(self._feed_segmenter(process.stdin, input_path, resume)) if throttled else None
+                try:
+                    async for line in process.stdout:
+                        chunk_name = line.decode().strip()
+                        if chunk_name:
+                            # 완성된 청크를 넘겨줄 때까지 입력 전달 중지
+                            resume.clear()
+                            await listed.put(os.path.join(output_dir, os.path.basename(chunk_name)))
+                    await process.wait()
+                    return await stderr_task
+                finally:
+                    for task in (feeder, stderr_task):
+                        if task and not task.done():
+                            task.cancel()
+                    listed.put_nowait(None)
+            
+            async def run_unthrottled() -> bytes:
+                # 멈출 수 없으므로 ffmpeg가 실행되는 동안 transcode 슬롯 사용
+                async with stage("transcode"):
+                    return await run_segmenter()
+            
+            # ffmpeg 실행과 슬롯은 별도 태스크에서 관리 (청크를 넘겨주고 기다리는 동안 슬롯을 잡고 있지 않음)
+            runner = asyncio.create_task(run_segmenter() if throttled else run_unthrottled())
+            
+            while True:
+                chunk_path = await listed.get()
+                if chunk_path is None:
+                    break
                 
-                stdout, stderr = await process.communicate()
-                
-                if process.returncode != 0:
-                    print(f"ffmpeg error: {stderr.decode()}")
-                    # ffmpeg가 없는 경우 원본 파일 반환
-                    return [input_path]
-                
-                chunks.append(output_path)
-            
-            return chunks
+                produced += 1
+                yield chunk_path
+                # 넘겨준 청크가 모두 소비되면 다음 청크를 위해 입력 전달 재개
+                if listed.empty():
+                    resume.set()
+            
+            stderr = await runner
+            if process.returncode != 0:
+                print(f"ffmpeg error: {stderr.decode()}")
+                if produced:
+                    raise Exception(f"청크 {produced + 1} 분할 실패")
             
         except Exception as e:
             print(f"Error splitting file: {str(e)}")
-            # 분할 실패 시 원본 파일 반환
-            return [input_path]
+            if produced:
+                raise
+        
+        finally:
+            # 중간에 취소된 경우 ffmpeg 프로세스 정리
+            if runner and not runner.done():
+                runner.cancel()
+            if process and process.returncode is None:
+                process.kill()
+                await process.wait()
+        
+        if produced == 0:
+            # 분할 실패 시 (ffmpeg가 없는 경우 등) 원본 파일 반환
+            yield input_path
     
-    async def _get_audio_duration(self, file_path: str) -> float:
-        """오디오 파일의 길이를 초 단위로 반환"""
+    async def _feed_segmenter(self, stdin: asyncio.StreamWriter, input_path: str, resume: asyncio.Event):
+        """
+        분할 ffmpeg에 입력 파일을 블록 단위로 전달 (끝나면 stdin을 닫음)
+        
+        resume이 꺼져 있는 동안(완성된 청크가 아직 소비되지 않음)은 전달을 멈추고,
+        실제로 전달하는 동안에만 transcode 슬롯을 사용한다.
+        """
         try:
-            cmd = [
-                self.ffmpeg_path,
-                "-i", file_path,
-                "-f", "null",
-                "-"
-            ]
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            stderr_text = stderr.decode()
-            
-            # Duration 정보 추출
-            import re
-            duration_match = re.search(r'Duration: (\d{2}):(\d{2}):(\d{2}\.\d{2})', stderr_text)
-            
-            if duration_match:
-                hours = int(duration_match.group(1))
-                minutes = int(duration_match.group(2))
-                seconds = float(duration_match.group(3))
-                total_seconds = hours * 3600 + minutes * 60 + seconds
-                return total_seconds
-            
-            # 기본값: 10분
-            return 600
-            
+            with open(input_path, "rb") as source:
+                while True:
+                    await resume.wait()
+                    async with stage("transcode"):
+                        while resume.is_set():
+                            block = await asyncio.to_thread(source.read, self.split_feed_block_size)
+                            if not block:
+                                return
+                            stdin.write(block)
+                            await stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # ffmpeg가 먼저 종료된 경우 (오류는 종료 코드로 처리)
+            pass
+        finally:
+            stdin.close()
+    
+    def _can_stream_copy(self, audio_info: Dict, chunk_duration: int) -> bool:
+        """재인코딩 없이 청크를 잘라낼 수 있는지 확인"""
+        if audio_info.get("codec_name") not in ("mp3", "opus") or not audio_info.get("bit_rate"):
+            return False
+        
+        # 비트레이트로 계산한 청크 크기가 Whisper 제한(24MB) 이내인지 확인
+        bytes_per_second = audio_info["bit_rate"] / 8
+        return bytes_per_second * chunk_duration <= audio_normalizer.max_chunk_bytes
+    
+    async def _get_audio_duration(self, file_path: str) -> Optional[float]:
+        """오디오 파일의 길이를 초 단위로 반환 (컨테이너 헤더만 읽음, 알 수 없으면 None)"""
+        try:
+            return await audio_probe.get_duration(file_path)
         except Exception as e:
             print(f"Error getting duration: {str(e)}")
-            return 600
+            return None
     
     async def _process_chunk(self, chunk_path: str) -> str:
         """개별 청크 처리"""
@@ -278,11 +524,11 @@ class VideoProcessingService:
             file_obj = io.BytesIO(file_content)
             file_obj.name = Path(chunk_path).name
             
-            transcript_response = await asyncio.to_thread(
-                self.openai_client.audio.transcriptions.create,
-                model="whisper-1",
-                file=file_obj
-            )
+            async with stage("transcribe"):
+                transcript_response = await self.openai_client.audio.transcriptions.create(
+                    model=self.transcription_model,
+                    file=file_obj
+                )
             
             return transcript_response.text if hasattr(transcript_response, 'text') else str(transcript_response)
             
@@ -290,57 +536,69 @@ class VideoProcessingService:
             print(f"Error processing chunk {chunk_path}: {str(e)}")
             raise
     
-    async def _generate_outline(self, task_id: str):
+    async def _generate_outline(self, task_id: str, transcript: str, summary_ratio: float = 0.5):
         """텍스트를 바탕으로 한국어 아웃라인 생성"""
+        task = self.tasks.handle(task_id)
         try:
-            self.tasks[task_id]["progress"] = 70
-            self.tasks[task_id]["status"] = "generating_outline"
-            self.tasks[task_id]["message"] = "아웃라인 생성 중..."
-            
-            transcript = self.tasks[task_id]["transcript"]
-            summary_ratio = self.tasks[task_id].get("summary_ratio", 0.5)
+            await task.aupdate({
+                "progress": 70,
+                "status": "generating_outline",
+                "message": "아웃라인 생성 중..."
+            })
             
             if not self.openai_client:
                 raise Exception("OpenAI client not initialized")
             
             # 긴 텍스트의 경우 요약 먼저 수행
-            if len(transcript) > 10000:
-                transcript = await self._summarize_long_text(transcript, summary_ratio)
+            if text_chunker.count_tokens(transcript) > self.outline_input_tokens:
+                transcript, dropped = await self._summarize_long_text(transcript, summary_ratio)
+                if dropped:
+                    warning = f"텍스트 일부({dropped}개 구간)를 요약하지 못해 아웃라인과 해설에서 빠졌을 수 있습니다."
+                    await task.amutate(lambda state: state.setdefault(WARNINGS_FIELD, []).append(warning))
             
             # 요약 비율에 따른 프롬프트 조정
             detail_level = self._get_detail_level(summary_ratio)
             
-            # OpenAI API를 직접 사용하여 아웃라인 생성
-            response = await asyncio.to_thread(
-                self.openai_client.chat.completions.create,
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": f"You are a helpful assistant that generates an outline for a transcript. Make sure to use Korean when you generate the outline. Generate a {detail_level} outline."},
-                    {"role": "user", "content": f"Generate a structured outline for the following transcript: {transcript}"}
-                ],
-                temperature=0,
-                max_tokens=int(4000 * summary_ratio)  # 요약 비율에 따라 토큰 수 조정
-            )
+            # 생성되는 대로 작업 상태에 이어 붙여 진행 상황 스트림으로 전달 (기존 텍스트는 읽지 않고 끝에만 추가)
+            def streamer(field: str) -> TextDeltaCallback:
+                return lambda delta: task.aappend_text(field, delta)
             
-            outline = response.choices[0].message.content
+            # OpenAI API를 직접 사용하여 아웃라인 생성
+            await task.aupdate({"outline": ""})
+            async with stage("llm"):
+                outline = await stream_chat_completion(
+                    self.openai_client,
+                    streamer("outline"),
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": f"You are a helpful assistant that generates an outline for a transcript. Make sure to use Korean when you generate the outline. Generate a {detail_level} outline."},
+                        {"role": "user", "content": f"Generate a structured outline for the following transcript: {transcript}"}
+                    ],
+                    temperature=0,
+                    max_tokens=int(4000 * summary_ratio)  # 요약 비율에 따라 토큰 수 조정
+                )
             
-            self.tasks[task_id]["outline"] = outline
-            self.tasks[task_id]["progress"] = 85
-            self.tasks[task_id]["message"] = "상세 해설 생성 중..."
+            await task.aupdate({
+                "outline": outline,
+                "detailed_explanation": "",
+                "progress": 85,
+                "message": "상세 해설 생성 중..."
+            })
             
             # 상세 해설 생성
             detailed_explanation = await self._generate_detailed_explanation(
-                transcript, outline, summary_ratio
+                transcript, outline, summary_ratio, on_delta=streamer("detailed_explanation")
             )
             
-            self.tasks[task_id]["detailed_explanation"] = detailed_explanation
-            self.tasks[task_id]["progress"] = 100
-            self.tasks[task_id]["status"] = "completed"
-            self.tasks[task_id]["message"] = "처리 완료!"
+            await task.aupdate({
+                "detailed_explanation": detailed_explanation,
+                "progress": 100,
+                "status": "completed",
+                "message": "처리 완료!"
+            })
             
         except Exception as e:
-            self.tasks[task_id]["error"] = str(e)
-            self.tasks[task_id]["status"] = "failed"
+            await task.aupdate({"error": str(e), "status": "failed"})
             raise
     
     def _get_detail_level(self, summary_ratio: float) -> str:
@@ -352,14 +610,25 @@ class VideoProcessingService:
         else:
             return "detailed and comprehensive (상세하고 포괄적인)"
     
-    async def _generate_detailed_explanation(self, transcript: str, outline: str, summary_ratio: float) -> str:
-        """아웃라인을 바탕으로 상세한 해설 생성"""
+    async def _generate_detailed_explanation(
+        self,
+        transcript: str,
+        outline: str,
+        summary_ratio: float,
+        on_delta: Optional[TextDeltaCallback] = None
+    ) -> str:
+        """아웃라인을 바탕으로 상세한 해설 생성 (on_delta가 있으면 생성되는 텍스트 조각을 바로 전달)"""
         try:
             if not self.openai_client:
                 raise Exception("OpenAI client not initialized")
             
             detail_level = self._get_detail_level(summary_ratio)
             
+            # 토큰 예산 안에서 문장 단위로 원문 포함
+            transcript_excerpt = text_chunker.truncate_to_tokens(transcript, self.explanation_transcript_tokens)
+            if len(transcript_excerpt) < len(transcript):
+                transcript_excerpt += "..."
+            
             # 프롬프트 구성
             system_prompt = f"""You are an expert content analyzer and educator. 
 Your task is to create a {detail_level} educational document that expands on the given outline.
@@ -376,7 +645,7 @@ Format the output as a well-structured educational document."""
             user_prompt = f"""Based on this transcript and outline, create a detailed educational explanation:
 
 TRANSCRIPT:
-{transcript[:3000]}...  # 토큰 제한을 위해 일부만 사용
+{transcript_excerpt}
 
 OUTLINE:
 {outline}
@@ -384,58 +653,115 @@ OUTLINE:
 Create a comprehensive educational document that helps readers fully understand the content."""
             
             # OpenAI API 호출
-            response = await asyncio.to_thread(
-                self.openai_client.chat.completions.create,
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3,  # 약간의 창의성 허용
-                max_tokens=int(5000 * summary_ratio)  # 요약 비율에 따라 조정
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            print(f"Error generating detailed explanation: {str(e)}")
-            # 오류 발생 시 기본 아웃라인 반환
-            return outline
-    
-    async def _summarize_long_text(self, text: str, summary_ratio: float = 0.5) -> str:
-        """긴 텍스트를 요약"""
-        try:
-            # 텍스트를 청크로 나누기 (각 3000자)
-            chunk_size = 3000
-            chunks = [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
-            
-            summaries = []
-            max_tokens = int(500 * summary_ratio)  # 요약 비율에 따라 토큰 수 조정
-            
-            for chunk in chunks:
-                response = await asyncio.to_thread(
-                    self.openai_client.chat.completions.create,
+            async with stage("llm"):
+                return await stream_chat_completion(
+                    self.openai_client,
+                    on_delta,
                     model="gpt-4o-mini",
                     messages=[
-                        {"role": "system", "content": f"Summarize the following text in Korean. Keep approximately {int(summary_ratio * 100)}% of the content detail."},
-                        {"role": "user", "content": chunk}
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
                     ],
-                    temperature=0,
-                    max_tokens=max_tokens
+                    temperature=0.3,  # 약간의 창의성 허용
+                    max_tokens=int(5000 * summary_ratio)  # 요약 비율에 따라 조정
                 )
-                
-                summaries.append(response.choices[0].message.content)
-            
-            return " ".join(summaries)
             
         except Exception as e:
-            print(f"Error summarizing text: {str(e)}")
-            # 요약 실패 시 원본 텍스트의 일부 반환
-            return text[:int(10000 * summary_ratio)]
+            print(f"Error generating detailed explanation: {str(e)}")
+            # 오류 발생 시 기본 아웃라인 반환
+            return outline
+    
+    async def _summarize_long_text(self, text: str, summary_ratio: float = 0.5) -> Tuple[str, int]:
+        """
+        긴 텍스트를 map-reduce 방식으로 요약
+        
+        조각별 요약(map)은 동시에 최대 summary_map_concurrency개까지 실행하고,
+        합친 요약이 여전히 길면 요약들을 다시 묶어 요약(reduce)하는 과정을 반복한다.
+        재시도 후에도 실패한 조각은 빼고 성공한 조각의 요약만으로 진행하며, 모든 조각이 실패하면 예외를 올린다.
+        
+        Returns:
+            (요약, 요약하지 못해 빠진 조각 수) - 빠진 조각이 있으면 호출한 쪽에서 작업 상태에 경고로 남긴다
+        """
+        dropped = 0
+        for depth in range(self.summary_max_reduce_depth):
+            # 문장 경계를 지키며 토큰 예산만큼 채운 조각으로 나누기
+            chunks = text_chunker.chunk_by_tokens(text, self.summary_chunk_tokens)
+            
+            summaries, failed = await self._map_summaries(chunks, summary_ratio)
+            dropped += failed
+            summary = " ".join(summaries)
+            
+            # 충분히 짧아졌거나 더 줄어들지 않으면 중단
+            text_tokens = text_chunker.count_tokens(text)
+            summary_tokens = text_chunker.count_tokens(summary)
+            if summary_tokens <= self.outline_input_tokens or len(chunks) == 1 or summary_tokens >= text_tokens:
+                return summary, dropped
+            
+            print(f"요약 {depth + 1}단계 완료: {text_tokens} → {summary_tokens} 토큰, 다시 요약합니다.")
+            text = summary
+        
+        return text, dropped
+    
+    async def _map_summaries(self, chunks: List[str], summary_ratio: float) -> Tuple[List[str], int]:
+        """조각별 요약을 제한된 동시성으로 실행 후 (원래 순서의 요약 목록, 실패해서 뺀 조각 수) 반환"""
+        semaphore = asyncio.Semaphore(self.summary_map_concurrency)
+        
+        async def summarize(chunk: str) -> str:
+            async with semaphore:
+                return await self._summarize_piece(chunk, summary_ratio)
+        
+        results = await asyncio.gather(*(summarize(chunk) for chunk in chunks), return_exceptions=True)
+        for result in results:
+            # 취소 등은 실패한 조각으로 넘기지 않고 그대로 전파
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+        errors = [result for result in results if isinstance(result, Exception)]
+        if len(errors) == len(results):
+            raise Exception(f"긴 텍스트 요약 실패: {errors[0]}")
+        if errors:
+            # 원문 앞부분을 잘라 쓰지 않고, 요약에 성공한 조각들로만 계속 진행
+            logger.warning("조각 %d개 중 %d개 요약 실패, 나머지로 진행합니다: %s", len(results), len(errors), errors[0])
+        return [result for result in results if not isinstance(result, Exception)], len(errors)
+    
+    async def _summarize_piece(self, chunk: str, summary_ratio: float) -> str:
+        """조각 하나 요약 (실패하면 이 조각만 지수 백오프로 재시도)"""
+        max_tokens = int(1000 * summary_ratio)  # 요약 비율에 따라 토큰 수 조정 (조각 4000토큰 기준)
+        
+        for attempt in range(self.summary_piece_retries):
+            try:
+                async with stage("llm"):
+                    response = await self.openai_client.chat.completions.create(
+                        model="gpt-4o-mini",
+                        messages=[
+                            {"role": "system", "content": f"Summarize the following text in Korean. Keep approximately {int(summary_ratio * 100)}% of the content detail."},
+                            {"role": "user", "content": chunk}
+                        ],
+                        temperature=0,
+                        max_tokens=max_tokens
+                    )
+                return response.choices[0].message.content
+            
+            except Exception as e:
+                if attempt == self.summary_piece_retries - 1:
+                    raise
+                delay = 2 ** attempt
+                print(f"조각 요약 실패 ({attempt + 1}/{self.summary_piece_retries}), {delay}초 후 재시도: {e}")
+                await asyncio.sleep(delay)
+    
+    def mark_queued(self, task_id: str, **fields):
+        """작업 큐에 등록된 작업의 초기 상태 저장 (워커가 처리를 시작하기 전까지 상태 조회용)"""
+        self.tasks[task_id] = {
+            "task_id": task_id,
+            "progress": 0,
+            "status": "queued",
+            "error": "",
+            "message": "대기 중...",
+            **fields
+        }
     
-    def get_task_status(self, task_id: str) -> Dict:
-        """작업 상태 조회"""
-        return self.tasks.get(task_id, {})
+    def get_task_status(self, task_id: str, fields: Iterable[str] = ()) -> Dict:
+        """작업 상태 조회 (텍스트 필드는 fields로 요청한 것만 포함)"""
+        return self.tasks.get(task_id, {}, fields)
     
     def cleanup_task(self, task_id: str):
         """완료된 작업 정리"""
@@ -0,0 +1,176 @@
+import os
+import bisect
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from audio_normalizer import audio_normalizer
+from boundary_planner import boundary_planner
+
+
+class SilenceStripper:
+    def __init__(
+        self,
+        enabled: bool = False,
+        min_silence_seconds: float = 2.0,
+        padding_seconds: float = 0.3,
+        min_removed_ratio: float = 0.05,
+        max_segments: int = 2000
+    ):
+        """
+        음성 구간 검출(VAD) 기반 무음 제거
+
+        긴 무음 구간을 잘라낸 뒤 음성 인식용 형식으로 변환해 Whisper에 보내는 시간을 줄인다.
+        잘라낸 뒤의 시간을 원본 시간으로 바꿀 수 있도록 구간 대응표(timeline)를 함께 반환한다.
+
+        Args:
+            enabled: 무음 제거 사용 여부
+            min_silence_seconds: 이보다 짧은 무음은 제거하지 않음 (문장 사이의 쉼 유지)
+            padding_seconds: 음성 구간 앞뒤로 남겨 둘 여유 (초)
+            min_removed_ratio: 제거되는 비율이 이보다 작으면 무음 제거를 생략
+            max_segments: ffmpeg 필터 길이 제한을 위한 최대 음성 구간 수 (넘으면 짧은 무음부터 유지)
+        """
+        self.enabled = enabled
+        self.min_silence_seconds = min_silence_seconds
+        self.padding_seconds = padding_seconds
+        self.min_removed_ratio = min_removed_ratio
+        self.max_segments = max_segments
+
+    async def strip(self, input_path: str, output_path: str, chunk_seconds: Optional[float] = None) -> Optional[Dict]:
+        """
+        무음 구간을 제거하며 음성 인식용 형식으로 변환
+
+        Args:
+            input_path: 입력 파일 경로
+            output_path: 출력 파일 경로
+            chunk_seconds: 청크 최대 길이 (초). 주어지면 변환하면서 무음 제거 후 기준 경계도 계산
+
+        Returns:
+            audio_normalizer.normalize 결과에 "timeline", "removed_seconds"를 더한 dict.
+            제거할 무음이 거의 없거나 분석할 수 없으면 None (호출자가 일반 정규화로 처리)
+        """
+        energy = await boundary_planner.scan_energy(input_path)
+        if energy is None or len(energy) == 0:
+            return None
+
+        frame_seconds = boundary_planner.frame_seconds
+        total_seconds = len(energy) * frame_seconds
+        segments = self.detect_speech(energy, frame_seconds)
+        if not segments:
+            return None
+
+        kept_seconds = sum(end - start for start, end in segments)
+        removed_seconds = total_seconds - kept_seconds
+        if removed_seconds < total_seconds * self.min_removed_ratio:
+            return None
+
+        normalized = await audio_normalizer.normalize(
+            input_path, output_path, audio_filter=self._build_filter(segments), chunk_seconds=chunk_seconds
+        )
+        if not normalized:
+            return None
+
+        print(f"무음 제거: {total_seconds:.0f}초 중 {removed_seconds:.0f}초 제거 (음성 구간 {len(segments)}개)")
+        normalized["timeline"] = self.build_timeline(segments)
+        normalized["removed_seconds"] = removed_seconds
+        return normalized
+
+    def detect_speech(self, energy: np.ndarray, frame_seconds: float) -> List[Tuple[float, float]]:
+        """프레임 에너지 배열에서 음성 구간 [(시작, 끝), ...] (초) 검출"""
+        # 300ms 이동 평균 후 dB로 변환
+        smooth_frames = max(1, int(0.3 / frame_seconds))
+        smoothed = np.convolve(energy, np.ones(smooth_frames, dtype=np.float32) / smooth_frames, mode="same")
+        db = 10 * np.log10(smoothed + 1e-10)
+
+        # 잡음 바닥(하위 10%)보다 충분히 크면 음성으로 보되, 중간값보다 10dB 낮은 수준을 넘지 않게 함
+        noise_floor = np.percentile(db, 10)
+        threshold = min(max(noise_floor + 10, -60), np.percentile(db, 50) - 10)
+        speech = db > threshold
+        if not speech.any():
+            return []
+
+        # 음성 구간의 시작/끝 프레임 (앞뒤에 False를 붙여 경계 검출)
+        edges = np.diff(np.concatenate(([False], speech, [False])).astype(np.int8))
+        starts = np.nonzero(edges == 1)[0]
+        ends = np.nonzero(edges == -1)[0]
+
+        # 음성 구간 사이 무음 길이 (프레임)
+        gaps = starts[1:] - ends[:-1]
+        keep_gap = gaps * frame_seconds >= self.min_silence_seconds + 2 * self.padding_seconds
+
+        # 구간 수가 너무 많으면 가장 긴 무음들만 제거
+        if keep_gap.sum() > self.max_segments - 1:
+            longest = np.argsort(gaps)[::-1][:self.max_segments - 1]
+            keep_gap = np.zeros_like(keep_gap)
+            keep_gap[longest] = True
+
+        # 짧은 무음은 음성 구간에 포함시켜 병합
+        merged_starts = np.concatenate(([starts[0]], starts[1:][keep_gap]))
+        merged_ends = np.concatenate((ends[:-1][keep_gap], [ends[-1]]))
+
+        total_seconds = len(energy) * frame_seconds
+        return [
+            (
+                round(max(0.0, float(start) * frame_seconds - self.padding_seconds), 3),
+                round(min(total_seconds, float(end) * frame_seconds + self.padding_seconds), 3)
+            )
+            for start, end in zip(merged_starts, merged_ends)
+        ]
+
+    def build_timeline(self, segments: List[Tuple[float, float]]) -> List[List[float]]:
+        """음성 구간 목록으로 [무음 제거 후 시작, 원본 시작, 길이] 대응표 생성"""
+        timeline = []
+        stripped_start = 0.0
+        for start, end in segments:
+            length = round(end - start, 3)
+            timeline.append([round(stripped_start, 3), start, length])
+            stripped_start += length
+        return timeline
+
+    def _build_filter(self, segments: List[Tuple[float, float]]) -> str:
+        """음성 구간만 남기고 타임스탬프를 이어 붙이는 ffmpeg 필터"""
+        expression = "+".join(f"between(t,{start},{end})" for start, end in segments)
+        return f"aselect='{expression}',asetpts=N/SR/TB"
+
+
+def to_original_time(timeline: List[List[float]], stripped_time: float) -> float:
+    """무음 제거 후의 시간(초)을 원본 시간으로 변환"""
+    if not timeline:
+        return stripped_time
+
+    index = bisect.bisect_right([entry[0] for entry in timeline], stripped_time) - 1
+    stripped_start, original_start, length = timeline[max(index, 0)]
+    return original_start + min(max(stripped_time - stripped_start, 0.0), length)
+
+
+def to_original_range(
+    timeline: Optional[List[List[float]]],
+    start: float,
+    end: Optional[float]
+) -> Tuple[float, Optional[float]]:
+    """무음 제거 후의 구간 [start, end](초)를 원본 시간으로 변환 (대응표가 없으면 그대로)"""
+    if not timeline:
+        return start, end
+    original_start = to_original_time(timeline, start)
+    if end is None:
+        return original_start, None
+
+    # 끝이 음성 구간 경계와 같으면 다음 구간의 시작이 아닌 앞 구간의 끝으로 변환 (제거된 무음을 포함하지 않음)
+    index = bisect.bisect_left([entry[0] for entry in timeline], end) - 1
+    stripped_start, original_segment_start, length = timeline[max(index, 0)]
+    original_end = original_segment_start + min(max(end - stripped_start, 0.0), length)
+    return original_start, max(original_start, original_end)
+
+
+_default_stripper: Optional[SilenceStripper] = None
+
+
+def get_silence_stripper() -> SilenceStripper:
+    """공용 무음 제거기 (VAD_ENABLED=true일 때 사용, VAD_MIN_SILENCE_SECONDS)"""
+    global _default_stripper
+    if _default_stripper is None:
+        _default_stripper = SilenceStripper(
+            enabled=os.getenv("VAD_ENABLED", "false").lower() == "true",
+            min_silence_seconds=float(os.getenv("VAD_MIN_SILENCE_SECONDS", "2.0"))
+        )
+    return _default_stripper
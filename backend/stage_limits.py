@@ -0,0 +1,49 @@
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+
+# 파이프라인 단계 (download: yt-dlp, transcode: ffmpeg, transcribe: Whisper, llm: 요약/해설)
+STAGES = ("download", "transcode", "transcribe", "llm")
+
+_limits: Dict[str, int] = {}
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def configure_stage_limits(limits: Optional[Dict[str, int]] = None):
+    """
+    단계별 동시 실행 수 제한 설정 (프로세스 단위)
+
+    limits를 주지 않으면 STAGE_LIMIT_DOWNLOAD 같은 환경 변수에서 읽는다.
+    0 이하이거나 설정되지 않은 단계는 제한하지 않는다.
+    """
+    if limits is None:
+        limits = {}
+        for name in STAGES:
+            value = os.getenv(f"STAGE_LIMIT_{name.upper()}")
+            if value:
+                limits[name] = int(value)
+
+    _limits.clear()
+    _semaphores.clear()
+    for name, limit in limits.items():
+        if limit > 0:
+            _limits[name] = limit
+            _semaphores[name] = asyncio.Semaphore(limit)
+
+
+def get_stage_limits() -> Dict[str, int]:
+    return dict(_limits)
+
+
+@asynccontextmanager
+async def stage(name: str):
+    """해당 단계의 슬롯을 얻은 동안만 블록을 실행"""
+    semaphore = _semaphores.get(name)
+    if semaphore is None:
+        yield
+        return
+
+    async with semaphore:
+        yield
@@ -0,0 +1,229 @@
+import json
+import asyncio
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from task_store import SEGMENT_COUNT_FIELD, TEXT_FIELDS, TEXT_INFO_FIELD, WARNINGS_FIELD, TaskMap
+from llm_stream import STREAMED_FIELDS
+
+# 더 이상 바뀌지 않는 작업 상태
+TERMINAL_STATUSES = ("completed", "failed")
+
+# 완료 이벤트에 한 번만 실어 보내는 결과 필드
+RESULT_FIELDS = ("transcript", "outline", "detailed_explanation", "downloaded_file_path")
+
+
+class _TaskWatch:
+    def __init__(self):
+        """작업 하나를 지켜보는 공용 폴러의 상태 (같은 작업의 구독자들이 공유)"""
+        self.snapshot: Optional[Dict] = None
+        self.changed = asyncio.Event()
+        self.subscribers = 0
+        self.poller: Optional[asyncio.Task] = None
+
+    def publish(self, snapshot: Optional[Dict]):
+        self.snapshot = snapshot
+        # 기다리던 구독자들을 깨우고 다음 변경을 위한 새 이벤트로 교체
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class TaskEventHub:
+    def __init__(self, poll_interval: float = 0.5, keepalive_interval: float = 15.0):
+        """
+        작업 진행 상황 푸시 (Server-Sent Events)
+
+        작업은 워커 프로세스에서 처리되고 상태는 공용 작업 저장소에 있으므로, API 프로세스에서 작업마다
+        폴러 하나만 저장소를 읽고 그 작업을 구독하는 모든 연결에 변경분만 보낸다.
+        진행/단계 변경 이벤트에는 작은 필드만 담고, 큰 결과 필드는 마지막 완료 이벤트에 한 번만 보낸다.
+        아웃라인/해설처럼 생성되는 동안 이어 붙는 필드는 새로 붙은 부분만 저장소에서 읽어 delta 이벤트로 보낸다.
+        저장소 조회는 스레드에서 실행되므로 SQLite 잠금을 기다리는 동안에도 이벤트 루프가 막히지 않는다.
+
+        Args:
+            poll_interval: 저장소 확인 간격 (초)
+            keepalive_interval: 변경이 없을 때 연결 유지를 위해 주석 줄을 보내는 간격 (초)
+        """
+        self.poll_interval = poll_interval
+        self.keepalive_interval = keepalive_interval
+        self._watches: Dict[Tuple[str, str], _TaskWatch] = {}
+
+    async def stream(
+        self,
+        tasks: TaskMap,
+        task_id: str,
+        status_message: Optional[Callable[[str], str]] = None
+    ) -> AsyncIterator[str]:
+        """SSE 형식 문자열 스트림 (StreamingResponse에 그대로 전달)"""
+        async for event, data in self.subscribe(tasks, task_id, status_message):
+            if event == "keepalive":
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    async def subscribe(
+        self,
+        tasks: TaskMap,
+        task_id: str,
+        status_message: Optional[Callable[[str], str]] = None
+    ) -> AsyncIterator[Tuple[str, Optional[Dict]]]:
+        """
+        (이벤트 이름, 데이터) 스트림. 연결 직후 현재 상태를 먼저 보내고, 완료/실패 이벤트 후 종료
+
+        Args:
+            tasks: 작업 상태 맵 (서비스의 tasks)
+            task_id: 작업 ID
+            status_message: 상태에 message가 없을 때 쓸 기본 메시지 함수
+        """
+        key = (tasks.namespace, task_id)
+        watch = self._watches.get(key)
+        if watch is None:
+            snapshot = await self._load(tasks, task_id, None)
+            # 읽는 동안 다른 구독자가 먼저 폴러를 만들었으면 그것을 공유
+            watch = self._watches.get(key)
+            if watch is None:
+                watch = _TaskWatch()
+                watch.snapshot = snapshot
+                self._watches[key] = watch
+        watch.subscribers += 1
+        if watch.poller is None or watch.poller.done():
+            watch.poller = asyncio.create_task(self._poll(tasks, task_id, watch))
+
+        try:
+            last: Optional[Dict] = None
+            while True:
+                changed = watch.changed
+                current = watch.snapshot
+
+                if not current:
+                    yield "error", {"detail": "Task not found"}
+                    return
+
+                for event in self._diff(task_id, last, current, status_message):
+                    yield event
+                if current.get("status") in TERMINAL_STATUSES:
+                    return
+                last = current
+
+                try:
+                    await asyncio.wait_for(changed.wait(), self.keepalive_interval)
+                except asyncio.TimeoutError:
+                    yield "keepalive", None
+        finally:
+            watch.subscribers -= 1
+            if watch.subscribers == 0:
+                if watch.poller:
+                    watch.poller.cancel()
+                self._watches.pop(key, None)
+
+    async def _poll(self, tasks: TaskMap, task_id: str, watch: _TaskWatch):
+        """구독자가 있는 동안 저장소를 확인해 상태가 바뀌면 알림"""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            snapshot = await self._load(tasks, task_id, watch.snapshot)
+            if snapshot != watch.snapshot:
+                watch.publish(snapshot)
+            if not snapshot or snapshot.get("status") in TERMINAL_STATUSES:
+                return
+
+    async def _load(self, tasks: TaskMap, task_id: str, previous: Optional[Dict]) -> Optional[Dict]:
+        """
+        상태 본문과 생성 중인 텍스트 조회
+
+        완료되면 결과 텍스트 필드를 한 번 읽고, 그 전에는 이전 스냅샷 이후 늘어난 텍스트만 읽는다
+        (통째로 바뀐 필드만 처음부터 다시 읽음).
+        """
+        state = await tasks.aget(task_id)
+        if not state:
+            return None
+        if state.get("status") == "completed":
+            return await tasks.aget(task_id, fields=[field for field in RESULT_FIELDS if field in TEXT_FIELDS])
+
+        previous = previous or {}
+        info = state.get(TEXT_INFO_FIELD) or {}
+        previous_info = previous.get(TEXT_INFO_FIELD) or {}
+        for field in STREAMED_FIELDS:
+            if field not in info:
+                continue
+            text = previous.get(field) or ""
+            if (previous_info.get(field) or {}).get("revision") != info[field]["revision"]:
+                text = ""
+            if info[field]["length"] > len(text):
+                text += await tasks.aread_text(task_id, field, len(text)) or ""
+            state[field] = text
+        return state
+
+    def _diff(
+        self,
+        task_id: str,
+        last: Optional[Dict],
+        current: Dict,
+        status_message: Optional[Callable[[str], str]]
+    ) -> List[Tuple[str, Dict]]:
+        """이전 상태와 비교해 보낼 이벤트 목록 생성"""
+        events = []
+        progress = self._progress_fields(task_id, current, status_message)
+
+        status = current.get("status")
+        if status not in TERMINAL_STATUSES:
+            if last is None or last.get("status") != status:
+                events.append(("stage", progress))
+            elif self._progress_fields(task_id, last, status_message) != progress:
+                events.append(("progress", progress))
+            events.extend(("delta", delta) for delta in self._streamed_deltas(last, current))
+        elif status == "completed":
+            events.append(("completed", {
+                **progress,
+                **{field: current.get(field) for field in RESULT_FIELDS if current.get(field) is not None}
+            }))
+        elif status == "failed":
+            events.append(("failed", {**progress, "error": current.get("error")}))
+
+        return events
+
+    def _streamed_deltas(self, last: Optional[Dict], current: Dict) -> List[Dict]:
+        """
+        생성 중인 필드에 새로 붙은 텍스트 (처음부터 다시 생성되면 reset과 함께 전체 텍스트)
+
+        구독의 첫 delta(last가 None)도 reset으로 보낸다. EventSource가 재연결하면 새 구독이 지금까지의
+        전체 텍스트를 다시 보내므로, 클라이언트가 이미 가진 텍스트에 이어 붙이지 않고 교체해야 한다.
+        """
+        deltas = []
+        for field in STREAMED_FIELDS:
+            previous = (last or {}).get(field) or ""
+            text = current.get(field) or ""
+            if text == previous:
+                continue
+            if last is not None and text.startswith(previous):
+                deltas.append({"field": field, "text": text[len(previous):], "reset": False})
+            else:
+                deltas.append({"field": field, "text": text, "reset": True})
+        return deltas
+
+    def _progress_fields(
+        self,
+        task_id: str,
+        state: Dict,
+        status_message: Optional[Callable[[str], str]]
+    ) -> Dict:
+        status = state.get("status", "unknown")
+        fields = {
+            "task_id": task_id,
+            "status": status,
+            "progress": state.get("progress", 0),
+            "message": state.get("message") or (status_message(status) if status_message else ""),
+        }
+        if "chunks_total" in state:
+            fields["chunks_total"] = state.get("chunks_total")
+            fields["chunks_completed"] = state.get("chunks_completed")
+        if SEGMENT_COUNT_FIELD in state:
+            # 새 청크 텍스트가 공개되면 진행 이벤트로 알리고, 내용은 클라이언트가 cursor로 조회
+            fields["transcript_cursor"] = state[SEGMENT_COUNT_FIELD]
+        if state.get(WARNINGS_FIELD):
+            fields["warnings"] = state[WARNINGS_FIELD]
+        if state.get("metadata"):
+            # YouTube 메타데이터는 작고 처리 중에도 화면에 표시하므로 진행 이벤트에 포함
+            fields["metadata"] = state["metadata"]
+        return fields
+
+
+# 공용 이벤트 허브 (API 프로세스 하나당 하나)
+task_event_hub = TaskEventHub()
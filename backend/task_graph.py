@@ -0,0 +1,60 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+# 노드 이름 → (선행 노드 이름 목록, 선행 노드 결과를 키워드 인자로 받는 코루틴 함수)
+TaskGraph = Dict[str, Tuple[List[str], Callable[..., Awaitable[Any]]]]
+
+
+async def run_task_graph(graph: TaskGraph) -> Dict[str, Any]:
+    """
+    의존 관계가 있는 비동기 작업들을 실행 (LLM 호출 등)
+
+    선행 작업이 없는 노드들은 동시에 시작하고, 선행 작업이 있는 노드는 필요한 결과가 모두 준비되는 즉시 시작한다.
+    하나라도 실패하면 나머지 작업을 취소하고 예외를 그대로 전달한다.
+
+    Returns:
+        노드 이름 → 결과
+    """
+    _check_graph(graph)
+
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run(name: str) -> Any:
+        dependencies, func = graph[name]
+        inputs = {dependency: await tasks[dependency] for dependency in dependencies}
+        return await func(**inputs)
+
+    # 모든 태스크를 먼저 등록한 뒤 실행되므로 run 안에서 tasks를 참조해도 안전
+    for name in graph:
+        tasks[name] = asyncio.create_task(run(name))
+
+    try:
+        results = await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+
+    return dict(zip(tasks.keys(), results))
+
+
+def _check_graph(graph: TaskGraph):
+    """없는 노드를 참조하거나 순환이 있으면 ValueError"""
+    visiting, done = set(), set()
+
+    def visit(name: str):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"작업 그래프에 순환이 있습니다: {name}")
+        if name not in graph:
+            raise ValueError(f"작업 그래프에 없는 노드입니다: {name}")
+        visiting.add(name)
+        for dependency in graph[name][0]:
+            visit(dependency)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in graph:
+        visit(name)
@@ -0,0 +1,592 @@
+import os
+import copy
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional
+
+# 상태가 바뀔 때마다 1씩 증가하는 버전 필드 (조건부 조회의 ETag 등에 사용)
+VERSION_FIELD = "version"
+
+# 상태 본문과 따로 저장하는 큰 텍스트 필드
+# 진행률/단계처럼 자주 바뀌는 작은 필드를 읽고 쓸 때마다 전체 텍스트를 다시 읽고 쓰지 않도록 분리한다.
+TEXT_FIELDS = ("transcript", "outline", "detailed_explanation")
+
+# 텍스트 필드별 {"revision": 통째로 바뀐 횟수, "length": 글자 수} (상태 본문에 저장)
+# 이어 붙이기는 길이만 늘리므로, 구독자는 revision이 같으면 늘어난 부분만 읽으면 된다
+TEXT_INFO_FIELD = "text_info"
+
+# 완료된 청크 텍스트 수 (청크 텍스트 자체는 상태 본문과 따로 추가만 되는 목록으로 저장)
+SEGMENT_COUNT_FIELD = "transcript_cursor"
+
+# 처리는 끝났지만 결과에 빠진 부분이 있을 때 사용자에게 보여줄 경고 목록 (예: 요약하지 못한 구간)
+WARNINGS_FIELD = "warnings"
+
+
+def text_length(state: Dict, field: str) -> int:
+    """상태 본문만으로 텍스트 필드의 길이 확인 (텍스트를 읽지 않음)"""
+    return ((state.get(TEXT_INFO_FIELD) or {}).get(field) or {}).get("length", 0)
+
+
+class TaskStore(ABC):
+    """
+    작업 상태 저장소 인터페이스
+
+    키 하나에 작업 상태(딕셔너리) 하나를 저장하고, 마지막 갱신 후 ttl_seconds가 지나면 만료된다.
+    Redis 같은 외부 저장소도 아래 메서드만 구현하면 교체할 수 있다
+    (set → SET EX, mutate → WATCH/MULTI 재시도, append_text → APPEND, add_segment → RPUSH, delete → DEL).
+    모든 쓰기는 상태의 VERSION_FIELD를 1 증가시킨다 (set으로 덮어써도 이전 버전에 이어서 증가).
+
+    TEXT_FIELDS는 상태 본문과 따로 저장된다. get은 요청한 텍스트 필드만 함께 읽고,
+    mutate의 fn에는 상태 본문만 전달된다 (fn에서 텍스트 필드에 값을 넣으면 통째로 교체).
+    모든 메서드는 블로킹 호출이므로 이벤트 루프에서는 TaskMap/TaskState의 a* 메서드를 사용한다.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    def get(self, key: str, fields: Iterable[str] = ()) -> Optional[Dict]:
+        """상태 본문과 요청한 텍스트 필드 조회 (없거나 만료되었으면 None)"""
+
+    @abstractmethod
+    def set(self, key: str, state: Dict):
+        """상태 전체 저장 (텍스트 필드와 청크 텍스트 목록도 새 상태로 교체)"""
+
+    @abstractmethod
+    def read_text(self, key: str, field: str, offset: int = 0) -> Optional[str]:
+        """텍스트 필드의 offset번째 글자부터 조회 (없으면 None)"""
+
+    @abstractmethod
+    def segments_after(self, key: str, cursor: int) -> List[Dict]:
+        """cursor번째 이후에 추가된 청크 텍스트 목록 ([{"index", "text", "start", "end"}, ...], 추가된 순서)"""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """상태 삭제"""
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """만료된 상태 정리 후 삭제한 개수 반환"""
+
+    @abstractmethod
+    def _write(
+        self,
+        key: str,
+        fn: Optional[Callable[[Dict], None]] = None,
+        appends: Optional[Dict[str, str]] = None,
+        segment: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """상태 본문 수정, 텍스트 이어 붙이기, 청크 텍스트 추가를 한 번의 원자적 쓰기로 처리 (키가 없으면 None)"""
+
+    def mutate(self, key: str, fn: Callable[[Dict], None]) -> Optional[Dict]:
+        """상태 본문을 원자적으로 읽고-수정하고-저장 (키가 없으면 None)"""
+        return self._write(key, fn)
+
+    def update(self, key: str, fields: Dict) -> Optional[Dict]:
+        """여러 필드를 한 번에 원자적으로 갱신"""
+        return self.mutate(key, lambda state: state.update(fields))
+
+    def increment(self, key: str, field: str, amount: int = 1) -> int:
+        """숫자 필드를 원자적으로 증가시키고 결과 값 반환"""
+        def apply(state: Dict):
+            state[field] = state.get(field, 0) + amount
+
+        state = self.mutate(key, apply)
+        return state[field] if state else 0
+
+    def append_text(self, key: str, field: str, text: str) -> Optional[Dict]:
+        """텍스트 필드 끝에 이어 붙이기 (기존 텍스트를 읽지 않음)"""
+        return self._write(key, appends={field: text})
+
+    def add_segment(
+        self,
+        key: str,
+        index: int,
+        text: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        fn: Optional[Callable[[Dict], None]] = None
+    ) -> Optional[Dict]:
+        """완료된 청크 텍스트와 원본 기준 시간 범위(초) 추가 (fn이 있으면 같은 쓰기에서 상태 본문도 수정)"""
+        return self._write(key, fn, segment={"index": index, "text": text, "start": start, "end": end})
+
+    def _next_version(self, previous: Optional[Dict]) -> int:
+        return (previous or {}).get(VERSION_FIELD, 0) + 1
+
+    def _split_texts(self, state: Dict) -> Dict[str, str]:
+        """상태 본문에서 텍스트 필드를 꺼내 따로 반환"""
+        return {field: state.pop(field) or "" for field in TEXT_FIELDS if field in state}
+
+    def _record_texts(self, state: Dict, replaced: Dict[str, str], appends: Dict[str, str]):
+        """텍스트 필드 교체/이어 붙이기를 상태 본문의 TEXT_INFO_FIELD에 반영"""
+        info = state.setdefault(TEXT_INFO_FIELD, {})
+        for field, value in replaced.items():
+            previous = info.get(field) or {}
+            info[field] = {"revision": previous.get("revision", 0) + 1, "length": len(value)}
+        for field, text in appends.items():
+            entry = info.setdefault(field, {"revision": 1, "length": 0})
+            entry["length"] += len(text)
+
+
+class InMemoryTaskStore(TaskStore):
+    """프로세스 내부 딕셔너리 저장소 (단일 워커용)"""
+
+    def __init__(self, ttl_seconds: float = 24 * 3600):
+        super().__init__(ttl_seconds)
+        # 키 → (만료 시각, 상태 본문, 텍스트 필드, 청크 텍스트 목록)
+        self._items: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key: str) -> Optional[tuple]:
+        item = self._items.get(key)
+        if item and item[0] < time.time():
+            del self._items[key]
+            return None
+        return item
+
+    def get(self, key: str, fields: Iterable[str] = ()) -> Optional[Dict]:
+        with self._lock:
+            item = self._live(key)
+            if not item:
+                return None
+            _, state, texts, _ = item
+            state = copy.deepcopy(state)
+            state.update({field: texts[field] for field in fields if field in texts})
+            return state
+
+    def set(self, key: str, state: Dict):
+        with self._lock:
+            item = self._items.get(key)
+            previous = item[1] if item else {}
+            state = copy.deepcopy(state)
+            texts = self._split_texts(state)
+            state[TEXT_INFO_FIELD] = copy.deepcopy(previous.get(TEXT_INFO_FIELD) or {})
+            self._record_texts(state, texts, {})
+            state[VERSION_FIELD] = self._next_version(previous)
+            self._items[key] = (time.time() + self.ttl_seconds, state, texts, [])
+
+    def read_text(self, key: str, field: str, offset: int = 0) -> Optional[str]:
+        with self._lock:
+            item = self._live(key)
+            if not item or field not in item[2]:
+                return None
+            return item[2][field][max(0, offset):]
+
+    def segments_after(self, key: str, cursor: int) -> List[Dict]:
+        with self._lock:
+            item = self._live(key)
+            return copy.deepcopy(item[3][max(0, cursor):]) if item else []
+
+    def _write(self, key, fn=None, appends=None, segment=None) -> Optional[Dict]:
+        with self._lock:
+            item = self._live(key)
+            if not item:
+                return None
+            _, state, texts, segments = item
+            state = copy.deepcopy(state)
+            if fn:
+                fn(state)
+
+            replaced = self._split_texts(state)
+            appends = appends or {}
+            self._record_texts(state, replaced, appends)
+            texts = {**texts, **replaced}
+            for field, text in appends.items():
+                texts[field] = texts.get(field, "") + text
+
+            if segment is not None:
+                segments.append(dict(segment))
+                state[SEGMENT_COUNT_FIELD] = state.get(SEGMENT_COUNT_FIELD, 0) + 1
+
+            state[VERSION_FIELD] = self._next_version(state)
+            self._items[key] = (time.time() + self.ttl_seconds, state, texts, segments)
+            return copy.deepcopy(state)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [key for key, item in self._items.items() if item[0] < now]
+            for key in expired:
+                del self._items[key]
+        return len(expired)
+
+
+class SQLiteTaskStore(TaskStore):
+    """SQLite(WAL) 파일 저장소 - 재시작 후에도 유지되고 여러 uvicorn 워커가 공유 가능"""
+
+    def __init__(self, db_path: str, ttl_seconds: float = 24 * 3600, purge_interval: float = 60.0):
+        super().__init__(ttl_seconds)
+        self.db_path = db_path
+        self.purge_interval = purge_interval
+        self._last_purge = 0.0
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        # 트랜잭션은 직접 관리 (BEGIN IMMEDIATE로 다른 워커와의 쓰기 충돌 방지)
+        # 잠금 대기는 호출한 스레드만 막으므로, 이벤트 루프에서는 a* 메서드로 스레드에서 호출한다
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "key TEXT PRIMARY KEY, "
+            "state TEXT NOT NULL, "
+            "expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_expires_at ON tasks (expires_at)")
+        # 큰 텍스트 필드 (필드 하나당 한 행, 이어 붙이기는 SQL 안에서 처리)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS task_texts ("
+            "key TEXT NOT NULL, "
+            "field TEXT NOT NULL, "
+            "value TEXT NOT NULL, "
+            "PRIMARY KEY (key, field))"
+        )
+        # 완료된 청크 텍스트 (청크 하나당 한 행, seq는 추가된 순서)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS task_segments ("
+            "key TEXT NOT NULL, "
+            "seq INTEGER NOT NULL, "
+            "chunk_index INTEGER NOT NULL, "
+            "text TEXT NOT NULL, "
+            "start_seconds REAL, "
+            "end_seconds REAL, "
+            "PRIMARY KEY (key, seq))"
+        )
+        # 시간 범위가 없던 이전 형식의 테이블이면 열 추가
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(task_segments)")}
+        for column in ("start_seconds", "end_seconds"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE task_segments ADD COLUMN {column} REAL")
+
+    def get(self, key: str, fields: Iterable[str] = ()) -> Optional[Dict]:
+        fields = [field for field in fields if field in TEXT_FIELDS]
+        with self._lock:
+            # 본문과 텍스트를 같은 스냅샷에서 읽기
+            self._conn.execute("BEGIN")
+            try:
+                row = self._conn.execute(
+                    "SELECT state FROM tasks WHERE key = ? AND expires_at >= ?", (key, time.time())
+                ).fetchone()
+                texts = []
+                if row and fields:
+                    texts = self._conn.execute(
+                        f"SELECT field, value FROM task_texts WHERE key = ? AND field IN ({', '.join('?' * len(fields))})",
+                        (key, *fields)
+                    ).fetchall()
+            finally:
+                self._conn.execute("COMMIT")
+
+        if not row:
+            return None
+        state = json.loads(row[0])
+        state.update(texts)
+        return state
+
+    def set(self, key: str, state: Dict):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT json_extract(state, '$.' || ?), json_extract(state, '$.' || ?) FROM tasks WHERE key = ?",
+                    (VERSION_FIELD, TEXT_INFO_FIELD, key)
+                ).fetchone()
+                state = dict(state)
+                texts = self._split_texts(state)
+                state[TEXT_INFO_FIELD] = json.loads(row[1]) if row and row[1] else {}
+                self._record_texts(state, texts, {})
+                state[VERSION_FIELD] = (row[0] or 0) + 1 if row else 1
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO tasks (key, state, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(state, ensure_ascii=False), time.time() + self.ttl_seconds)
+                )
+                self._conn.execute("DELETE FROM task_texts WHERE key = ?", (key,))
+                self._conn.execute("DELETE FROM task_segments WHERE key = ?", (key,))
+                self._conn.executemany(
+                    "INSERT INTO task_texts (key, field, value) VALUES (?, ?, ?)",
+                    [(key, field, value) for field, value in texts.items()]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        self._maybe_purge()
+
+    def read_text(self, key: str, field: str, offset: int = 0) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT substr(value, ?) FROM task_texts WHERE key = ? AND field = ?",
+                (max(0, offset) + 1, key, field)
+            ).fetchone()
+        return row[0] if row else None
+
+    def segments_after(self, key: str, cursor: int) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chunk_index, text, start_seconds, end_seconds FROM task_segments "
+                "WHERE key = ? AND seq >= ? ORDER BY seq",
+                (key, max(0, cursor))
+            ).fetchall()
+        return [{"index": index, "text": text, "start": start, "end": end} for index, text, start, end in rows]
+
+    def _write(self, key, fn=None, appends=None, segment=None) -> Optional[Dict]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT state FROM tasks WHERE key = ? AND expires_at >= ?", (key, time.time())
+                ).fetchone()
+                if not row:
+                    self._conn.execute("ROLLBACK")
+                    return None
+
+                state = json.loads(row[0])
+                if fn:
+                    fn(state)
+
+                replaced = self._split_texts(state)
+                appends = appends or {}
+                self._record_texts(state, replaced, appends)
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO task_texts (key, field, value) VALUES (?, ?, ?)",
+                    [(key, field, value) for field, value in replaced.items()]
+                )
+                self._conn.executemany(
+                    "INSERT INTO task_texts (key, field, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT (key, field) DO UPDATE SET value = value || excluded.value",
+                    [(key, field, text) for field, text in appends.items()]
+                )
+
+                if segment is not None:
+                    seq = state.get(SEGMENT_COUNT_FIELD, 0)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO task_segments "
+                        "(key, seq, chunk_index, text, start_seconds, end_seconds) VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, seq, segment["index"], segment["text"], segment["start"], segment["end"])
+                    )
+                    state[SEGMENT_COUNT_FIELD] = seq + 1
+
+                state[VERSION_FIELD] = self._next_version(state)
+                self._conn.execute(
+                    "UPDATE tasks SET state = ?, expires_at = ? WHERE key = ?",
+                    (json.dumps(state, ensure_ascii=False), time.time() + self.ttl_seconds, key)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        self._maybe_purge()
+        return state
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for table in ("tasks", "task_texts", "task_segments"):
+                    self._conn.execute(f"DELETE FROM {table} WHERE key = ?", (key,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for table in ("task_texts", "task_segments"):
+                    self._conn.execute(
+                        f"DELETE FROM {table} WHERE key IN (SELECT key FROM tasks WHERE expires_at < ?)", (now,)
+                    )
+                cursor = self._conn.execute("DELETE FROM tasks WHERE expires_at < ?", (now,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return cursor.rowcount
+
+    def _maybe_purge(self):
+        # 쓰기 시점에 주기적으로 만료된 작업 정리
+        now = time.time()
+        if now - self._last_purge >= self.purge_interval:
+            self._last_purge = now
+            self.purge_expired()
+
+
+class TaskState:
+    """
+    저장소의 작업 상태 하나를 딕셔너리처럼 다루는 핸들 (필드 쓰기는 즉시 저장소에 반영)
+
+    동기 메서드는 저장소를 직접 호출하고, a*로 시작하는 코루틴은 같은 호출을 스레드에서 실행해
+    SQLite 잠금 대기 등이 이벤트 루프를 막지 않게 한다. 여러 필드는 update/mutate 한 번으로 갱신한다.
+    """
+
+    def __init__(self, store: TaskStore, key: str):
+        self._store = store
+        self._key = key
+
+    def _load(self, fields: Iterable[str] = ()) -> Dict:
+        state = self._store.get(self._key, fields)
+        if state is None:
+            raise KeyError(self._key)
+        return state
+
+    def __getitem__(self, field: str):
+        return self._load((field,))[field]
+
+    def __setitem__(self, field: str, value):
+        self._store.update(self._key, {field: value})
+
+    def __contains__(self, field: str) -> bool:
+        return field in self._load((field,))
+
+    def get(self, field: str, default=None):
+        state = self._store.get(self._key, (field,))
+        return state.get(field, default) if state else default
+
+    def update(self, fields: Dict):
+        self._store.update(self._key, fields)
+
+    def increment(self, field: str, amount: int = 1) -> int:
+        return self._store.increment(self._key, field, amount)
+
+    def mutate(self, fn: Callable[[Dict], None]) -> Optional[Dict]:
+        return self._store.mutate(self._key, fn)
+
+    def append_text(self, field: str, text: str) -> Optional[Dict]:
+        return self._store.append_text(self._key, field, text)
+
+    def add_segment(
+        self,
+        index: int,
+        text: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        fn: Optional[Callable[[Dict], None]] = None
+    ) -> Optional[Dict]:
+        return self._store.add_segment(self._key, index, text, start, end, fn)
+
+    def to_dict(self) -> Dict:
+        return self._load(TEXT_FIELDS)
+
+    async def aupdate(self, fields: Dict):
+        await asyncio.to_thread(self._store.update, self._key, fields)
+
+    async def amutate(self, fn: Callable[[Dict], None]) -> Optional[Dict]:
+        return await asyncio.to_thread(self._store.mutate, self._key, fn)
+
+    async def aappend_text(self, field: str, text: str) -> Optional[Dict]:
+        return await asyncio.to_thread(self._store.append_text, self._key, field, text)
+
+    async def aadd_segment(
+        self,
+        index: int,
+        text: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        fn: Optional[Callable[[Dict], None]] = None
+    ) -> Optional[Dict]:
+        # ChunkSegmentCallback으로 바로 넘길 수 있도록 (인덱스, 텍스트, 시작, 끝) 순서
+        return await asyncio.to_thread(self._store.add_segment, self._key, index, text, start, end, fn)
+
+
+class TaskMap:
+    """
+    서비스의 self.tasks 자리에 쓰는 딕셔너리 형태의 뷰
+
+    self.tasks[task_id]는 TaskState 핸들을, self.tasks.get(task_id)는 상태 스냅샷(dict)을 반환한다.
+    스냅샷에는 상태 본문만 들어 있고 텍스트 필드는 fields로 요청한 것만 포함된다.
+    코루틴 안에서는 aget/aset과 handle(task_id)의 a* 메서드를 사용한다.
+    """
+
+    def __init__(self, store: TaskStore, namespace: str):
+        self._store = store
+        self._namespace = namespace
+
+    @property
+    def namespace(self) -> str:
+        return self._namespace
+
+    def _key(self, task_id: str) -> str:
+        return f"{self._namespace}:{task_id}"
+
+    def __getitem__(self, task_id: str) -> TaskState:
+        if task_id not in self:
+            raise KeyError(task_id)
+        return self.handle(task_id)
+
+    def __setitem__(self, task_id: str, state: Dict):
+        self._store.set(self._key(task_id), dict(state))
+
+    def __delitem__(self, task_id: str):
+        self._store.delete(self._key(task_id))
+
+    def __contains__(self, task_id: str) -> bool:
+        return self._store.get(self._key(task_id)) is not None
+
+    def handle(self, task_id: str) -> TaskState:
+        """존재 여부를 확인하지 않고 작업 핸들 반환 (저장소를 읽지 않음)"""
+        return TaskState(self._store, self._key(task_id))
+
+    def get(self, task_id: str, default=None, fields: Iterable[str] = ()) -> Optional[Dict]:
+        state = self._store.get(self._key(task_id), fields)
+        return state if state is not None else default
+
+    def read_text(self, task_id: str, field: str, offset: int = 0) -> Optional[str]:
+        return self._store.read_text(self._key(task_id), field, offset)
+
+    def segments_after(self, task_id: str, cursor: int) -> List[Dict]:
+        return self._store.segments_after(self._key(task_id), cursor)
+
+    async def aget(self, task_id: str, default=None, fields: Iterable[str] = ()) -> Optional[Dict]:
+        return await asyncio.to_thread(self.get, task_id, default, tuple(fields))
+
+    async def aset(self, task_id: str, state: Dict):
+        await asyncio.to_thread(self.__setitem__, task_id, state)
+
+    async def aread_text(self, task_id: str, field: str, offset: int = 0) -> Optional[str]:
+        return await asyncio.to_thread(self.read_text, task_id, field, offset)
+
+    async def asegments_after(self, task_id: str, cursor: int) -> List[Dict]:
+        return await asyncio.to_thread(self.segments_after, task_id, cursor)
+
+
+_default_store: Optional[TaskStore] = None
+
+
+def get_task_store() -> TaskStore:
+    """환경 변수 설정에 따른 공용 작업 저장소 반환
+
+    TASK_STORE: "sqlite"(기본). API 서버와 worker.py 프로세스가 같은 상태를 봐야 하므로 프로세스 간에
+        공유되는 저장소만 사용할 수 있다. InMemoryTaskStore는 한 프로세스 안에서 직접 만들어 쓰는 용도(테스트 등)
+    TASK_DB_PATH: SQLite 파일 경로 (기본 uploads/tasks.db)
+    TASK_TTL_SECONDS: 마지막 갱신 후 작업이 만료되기까지의 시간 (기본 24시간)
+    """
+    global _default_store
+    if _default_store is None:
+        backend = os.getenv("TASK_STORE", "sqlite").lower()
+        ttl_seconds = float(os.getenv("TASK_TTL_SECONDS", str(24 * 3600)))
+
+        if backend == "memory":
+            # 작업은 워커 프로세스에서 처리되므로 API가 넣은 상태와 워커의 갱신이 서로 다른 딕셔너리에 쌓임
+            raise ValueError(
+                "TASK_STORE=memory cannot be shared between the API server and worker.py processes; use TASK_STORE=sqlite"
+            )
+        if backend != "sqlite":
+            raise ValueError(f"Unknown TASK_STORE: {backend}")
+        _default_store = SQLiteTaskStore(os.getenv("TASK_DB_PATH", "uploads/tasks.db"), ttl_seconds)
+
+    return _default_store
@@ -0,0 +1,49 @@
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+# backend 모듈을 패키지 없이 바로 import (python -m pytest tests, backend 디렉토리 기준)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from task_store import InMemoryTaskStore, TaskMap  # noqa: E402
+
+
+class _StubService:
+    """처리 서비스 대역 (main이 쓰는 상태 조회만 제공, OpenAI/yt-dlp 없이 import 가능)"""
+
+    def __init__(self, namespace: str):
+        self.tasks = TaskMap(InMemoryTaskStore(), namespace)
+
+    def get_task_status(self, task_id, fields=()):
+        return self.tasks.get(task_id, {}, fields)
+
+
+def _stub_module(name: str, class_name: str, namespace: str) -> types.ModuleType:
+    module = types.ModuleType(name)
+    setattr(module, class_name, lambda: _StubService(namespace))
+    return module
+
+
+@pytest.fixture(scope="module")
+def main_module(tmp_path_factory):
+    # main은 모듈을 불러올 때 서비스와 작업 큐를 만들므로 서비스 모듈을 대역으로 바꾸고 큐는 임시 경로에 둠
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("JOB_DB_PATH", str(tmp_path_factory.mktemp("jobs") / "jobs.db"))
+        patch.setitem(sys.modules, "services_chunked", _stub_module("services_chunked", "VideoProcessingService", "video"))
+        patch.setitem(
+            sys.modules,
+            "youtube_processing_service_simple",
+            _stub_module("youtube_processing_service_simple", "YouTubeProcessingService", "youtube")
+        )
+        patch.delitem(sys.modules, "main", raising=False)
+        patch.setattr("job_queue._default_queue", None)
+        yield importlib.import_module("main")
+
+
+@pytest.fixture
+def client(main_module):
+    return TestClient(main_module.app)
@@ -0,0 +1,65 @@
+import asyncio
+import random
+
+import pytest
+
+from chunk_pipeline import transcribe_chunk_stream
+
+
+async def _paths(count: int):
+    for index in range(count):
+        yield f"chunk_{index}"
+
+
+def test_results_keep_chunk_order_when_transcription_finishes_out_of_order():
+    async def transcribe(path: str) -> str:
+        # 뒤 청크가 먼저 끝나도록 무작위로 지연
+        await asyncio.sleep(random.random() / 100)
+        return path.upper()
+
+    results = asyncio.run(transcribe_chunk_stream(_paths(12), transcribe, max_concurrency=4))
+
+    assert results == [f"CHUNK_{index}" for index in range(12)]
+
+
+def test_events_and_cleanup_for_every_chunk():
+    events = []
+    cleaned = []
+
+    async def transcribe(path: str) -> str:
+        return path
+
+    async def on_event(index, status, text):
+        events.append((index, status, text))
+
+    asyncio.run(transcribe_chunk_stream(
+        _paths(3), transcribe, max_concurrency=2, on_chunk_event=on_event, cleanup=cleaned.append
+    ))
+
+    for index in range(3):
+        statuses = [status for event_index, status, _ in events if event_index == index]
+        assert statuses == ["queued", "processing", "completed"]
+    assert (1, "completed", "chunk_1") in events
+    assert sorted(cleaned) == ["chunk_0", "chunk_1", "chunk_2"]
+
+
+def test_failure_cancels_remaining_work_and_closes_source():
+    closed = []
+
+    async def source():
+        try:
+            for index in range(100):
+                yield f"chunk_{index}"
+        finally:
+            closed.append(True)
+
+    async def transcribe(path: str) -> str:
+        if path == "chunk_2":
+            raise RuntimeError("boom")
+        await asyncio.sleep(0.01)
+        return path
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(transcribe_chunk_stream(source(), transcribe, max_concurrency=2, queue_size=1))
+
+    assert closed == [True]
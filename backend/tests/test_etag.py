@@ -0,0 +1,82 @@
+import pytest
+
+from task_store import SEGMENT_COUNT_FIELD, VERSION_FIELD
+
+
+def _completed_task(main_module, task_id: str):
+    main_module.video_service.tasks[task_id] = {
+        "status": "completed",
+        "progress": 100,
+        "file_path": "uploads/lecture.mp4",
+        "transcript": "전체 텍스트",
+        "outline": "아웃라인",
+        "detailed_explanation": "해설",
+    }
+    return main_module.video_service.tasks.get(task_id)
+
+
+def test_etag_follows_state_version(main_module):
+    assert main_module._etag({VERSION_FIELD: 7}) == '"7"'
+    assert main_module._etag({}) == '"0"'
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ("", False),
+    ('"7"', True),
+    ('W/"7"', True),
+    ('"6", "7"', True),
+    ("*", True),
+    ('"6"', False),
+    ("7", False),
+])
+def test_is_not_modified(main_module, header, expected):
+    assert main_module._is_not_modified(header, '"7"') is expected
+
+
+def test_status_omits_large_fields_and_returns_304_for_same_version(main_module, client):
+    main_module.video_service.tasks["status-task"] = {
+        "status": "extracting_transcript",
+        "progress": 40,
+        "transcript": "아주 긴 텍스트" * 100,
+    }
+
+    response = client.get("/api/status/status-task")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "extracting_transcript"
+    assert "transcript" not in body and "outline" not in body
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == main_module.STATUS_CACHE_CONTROL
+
+    not_modified = client.get("/api/status/status-task", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    # 상태가 바뀌면 새 버전으로 다시 응답
+    main_module.video_service.tasks.handle("status-task").update({"progress": 50, SEGMENT_COUNT_FIELD: 1})
+    changed = client.get("/api/status/status-task", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["transcript_cursor"] == 1
+
+
+def test_result_returns_texts_and_304_for_same_version(main_module, client):
+    state = _completed_task(main_module, "result-task")
+
+    response = client.get("/api/result/result-task")
+    assert response.status_code == 200
+    assert response.json()["transcript"] == "전체 텍스트"
+    assert response.headers["ETag"] == f'"{state[VERSION_FIELD]}"'
+    assert response.headers["Cache-Control"] == main_module.RESULT_CACHE_CONTROL
+
+    not_modified = client.get("/api/result/result-task", headers={"If-None-Match": response.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["Cache-Control"] == main_module.RESULT_CACHE_CONTROL
+
+
+def test_status_and_result_for_missing_task(client):
+    assert client.get("/api/status/missing").status_code == 404
+    assert client.get("/api/result/missing", headers={"If-None-Match": "*"}).status_code == 404
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.db"), lease_seconds=0.2, max_attempts=2, priority_aging_seconds=0)
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(queue):
+    job_id = queue.enqueue("video", {"task_id": "t1"})
+    assert queue.claim("worker-a", ["video"])["job_id"] == job_id
+    assert queue.claim("worker-b", ["video"]) is None
+
+    time.sleep(0.3)
+    job = queue.claim("worker-b", ["video"])
+    assert job["job_id"] == job_id
+    assert job["attempts"] == 2
+
+    # 임대를 잃은 워커는 결과를 덮어쓰지 못함
+    assert queue.complete(job_id, "worker-a") is False
+    assert queue.get(job_id)["status"] == "running"
+    assert queue.complete(job_id, "worker-b") is True
+    assert queue.get(job_id)["status"] == "completed"
+
+
+def test_heartbeat_keeps_lease(queue):
+    job_id = queue.enqueue("video", {})
+    queue.claim("worker-a", ["video"])
+    for _ in range(4):
+        time.sleep(0.1)
+        queue.heartbeat([job_id], "worker-a")
+    assert queue.claim("worker-b", ["video"]) is None
+
+
+def test_job_fails_after_max_attempts(queue):
+    job_id = queue.enqueue("video", {})
+    queue.claim("worker-a", ["video"])
+    time.sleep(0.3)
+    queue.claim("worker-b", ["video"])
+    time.sleep(0.3)
+
+    assert queue.claim("worker-c", ["video"]) is None
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["error"] == "worker lost"
+
+
+def test_release_only_by_lease_owner(queue):
+    job_id = queue.enqueue("video", {})
+    queue.claim("worker-a", ["video"])
+    assert queue.release(job_id, "worker-b") is False
+    assert queue.release(job_id, "worker-a") is True
+
+    job = queue.get(job_id)
+    assert job["status"] == "pending"
+    assert job["attempts"] == 0
+
+
+def test_priority_aging_lets_old_jobs_run_first(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"), priority_aging_seconds=0.01)
+    old_job = queue.enqueue("video", {}, priority=0)
+    time.sleep(0.3)
+    queue.enqueue("video", {}, priority=5)
+
+    assert queue.claim("worker-a", ["video"])["job_id"] == old_job
@@ -0,0 +1,30 @@
+def test_empty_transcript_completes_with_task_status(main_module, client):
+    tasks = main_module.video_service.tasks
+    tasks["silent"] = {"status": "extracting_transcript", "progress": 40}
+
+    pending = client.get("/api/transcript/silent").json()
+    assert pending["complete"] is False
+
+    # 무음 파일처럼 텍스트가 비어 있어도 변환 단계가 끝나면 완료
+    tasks.handle("silent").update({"status": "generating_outline", "transcript": ""})
+    finished = client.get("/api/transcript/silent").json()
+    assert finished["segments"] == []
+    assert finished["complete"] is True
+
+
+def test_segments_are_returned_after_cursor(main_module, client):
+    tasks = main_module.video_service.tasks
+    tasks["chunks"] = {"status": "extracting_transcript", "chunks_total": 3}
+    tasks.handle("chunks").add_segment(1, "두 번째", 600.0, 1200.0)
+    tasks.handle("chunks").add_segment(0, "첫 번째", 0.0, 600.0)
+
+    response = client.get("/api/transcript/chunks", params={"cursor": 1}).json()
+    assert response["cursor"] == 2
+    assert response["segments"] == [{"index": 0, "text": "첫 번째", "start": 0.0, "end": 600.0}]
+    assert response["complete"] is False
+
+
+def test_youtube_transcript_completes_after_failure(main_module, client):
+    main_module.youtube_service.tasks["failed"] = {"status": "failed", "error": "boom"}
+
+    assert client.get("/api/youtube/transcript/failed").json()["complete"] is True
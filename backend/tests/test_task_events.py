@@ -0,0 +1,39 @@
+import asyncio
+
+from task_events import TaskEventHub
+from task_store import InMemoryTaskStore, TaskMap
+
+
+def test_subscription_joining_mid_stream_resets_streamed_text():
+    tasks = TaskMap(InMemoryTaskStore(), "video")
+    tasks["t1"] = {"status": "generating_outline", "progress": 70}
+    tasks.handle("t1").append_text("outline", "Hello wor")
+    hub = TaskEventHub(poll_interval=0.01)
+
+    async def run():
+        deltas = []
+        async for event, data in hub.subscribe(tasks, "t1"):
+            if event == "delta":
+                deltas.append(data)
+                if len(deltas) == 1:
+                    await tasks.handle("t1").aappend_text("outline", "ld")
+                else:
+                    await tasks.handle("t1").aupdate({"status": "failed", "error": "stop"})
+        return deltas
+
+    deltas = asyncio.run(asyncio.wait_for(run(), 5))
+
+    # 재연결 등으로 중간에 구독하면 지금까지의 전체 텍스트로 교체
+    assert deltas[0] == {"field": "outline", "text": "Hello wor", "reset": True}
+    # 같은 구독 안에서는 새로 붙은 부분만
+    assert deltas[1] == {"field": "outline", "text": "ld", "reset": False}
+
+
+def test_diff_resets_first_delta_of_each_field():
+    hub = TaskEventHub()
+    current = {"status": "generating_outline", "outline": "Hello wor", "detailed_explanation": "Intro"}
+
+    deltas = [data for event, data in hub._diff("t1", None, current, None) if event == "delta"]
+
+    assert all(delta["reset"] for delta in deltas)
+    assert {delta["field"] for delta in deltas} == {"outline", "detailed_explanation"}
@@ -0,0 +1,78 @@
+import threading
+
+import pytest
+
+import task_store
+from task_store import (
+    SEGMENT_COUNT_FIELD, VERSION_FIELD, InMemoryTaskStore, SQLiteTaskStore, TaskStore, get_task_store, text_length
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryTaskStore()
+    return SQLiteTaskStore(str(tmp_path / "tasks.db"))
+
+
+def _run_threads(count: int, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_mutations_are_not_lost(store):
+    store.set("task", {"count": 0, "items": []})
+
+    def worker():
+        for _ in range(25):
+            def apply(state):
+                state["count"] += 1
+                state["items"] = state["items"] + [state["count"]]
+            store.mutate("task", apply)
+
+    _run_threads(8, worker)
+
+    state = store.get("task")
+    assert state["count"] == 200
+    assert state["items"] == list(range(1, 201))
+    # set 한 번 + mutate 200번
+    assert state[VERSION_FIELD] == 201
+
+
+def test_concurrent_segments_and_appends(store):
+    store.set("task", {"transcript": ""})
+
+    def worker():
+        for index in range(20):
+            store.add_segment("task", index, "x", index * 1.0, index + 1.0)
+            store.append_text("task", "transcript", "ab")
+
+    _run_threads(5, worker)
+
+    state = store.get("task", ("transcript",))
+    assert state[SEGMENT_COUNT_FIELD] == 100
+    assert state["transcript"] == "ab" * 100
+    assert text_length(state, "transcript") == 200
+    assert len(store.segments_after("task", 0)) == 100
+    assert store.segments_after("task", 99)[0]["end"] is not None
+
+
+def test_mutate_missing_key_returns_none(store):
+    assert store.mutate("missing", lambda state: state.update(value=1)) is None
+    assert store.get("missing") is None
+
+
+def test_task_store_interface_is_abstract():
+    with pytest.raises(TypeError):
+        TaskStore(60)
+
+
+def test_memory_store_is_rejected_for_shared_store(monkeypatch):
+    # API 서버와 워커 프로세스가 서로 다른 딕셔너리를 보게 되므로 설정으로는 쓸 수 없음
+    monkeypatch.setattr(task_store, "_default_store", None)
+    monkeypatch.setenv("TASK_STORE", "memory")
+    with pytest.raises(ValueError, match="TASK_STORE=memory"):
+        get_task_store()
@@ -0,0 +1,51 @@
+from text_chunker import TextChunker
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def chunker():
+    return TextChunker()
+
+
+def _sample_text() -> str:
+    sentences = [
+        "오늘은 비동기 프로그래밍의 기본 개념을 살펴봅니다.",
+        "The event loop runs one coroutine at a time.",
+        "작업이 기다리는 동안 다른 작업이 실행됩니다!",
+        "Why does this matter for I/O bound programs?",
+    ]
+    return " ".join(sentences * 30)
+
+
+def test_chunks_stay_within_budget_and_keep_all_text(chunker):
+    text = _sample_text()
+    chunks = chunker.chunk_by_tokens(text, 60)
+
+    assert len(chunks) > 1
+    assert all(chunker.count_tokens(chunk) <= 60 for chunk in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_long_sentence_is_split(chunker):
+    sentence = "a run-on sentence without any punctuation " * 50
+    chunks = chunker.chunk_by_tokens(sentence.strip(), 40)
+
+    assert len(chunks) > 1
+    assert all(chunker.count_tokens(chunk) <= 40 for chunk in chunks)
+
+
+def test_truncate_to_tokens(chunker):
+    text = _sample_text()
+    truncated = chunker.truncate_to_tokens(text, 50)
+
+    assert chunker.count_tokens(truncated) <= 50
+    assert text.startswith(truncated)
+    # 예산 안이면 그대로
+    assert chunker.truncate_to_tokens("짧은 문장입니다.", 50) == "짧은 문장입니다."
+
+
+def test_empty_text(chunker):
+    assert chunker.chunk_by_tokens("", 10) == []
+    assert chunker.truncate_to_tokens("", 10) == ""
+    assert chunker.count_tokens("") == 0
@@ -0,0 +1,162 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+import upload_sessions
+from upload_sessions import UploadSessionError, UploadSessionManager
+
+# 프로세스 간 잠금은 fcntl(flock)이 있는 환경에서만 동작
+requires_flock = pytest.mark.skipif(upload_sessions.fcntl is None, reason="fcntl not available")
+
+
+async def _body(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return UploadSessionManager(tmp_path, max_upload_size=1024)
+
+
+def test_merge_ranges(manager):
+    assert manager._merge_ranges([]) == []
+    assert manager._merge_ranges([[5, 10], [0, 5]]) == [[0, 10]]
+    assert manager._merge_ranges([[0, 4], [2, 6], [8, 9]]) == [[0, 6], [8, 9]]
+    assert manager._merge_ranges([[0, 10], [3, 5]]) == [[0, 10]]
+
+
+def test_committed_offset(manager):
+    assert manager.committed_offset({"received_ranges": []}) == 0
+    assert manager.committed_offset({"received_ranges": [[0, 6], [8, 9]]}) == 6
+    # 앞부분이 비어 있으면 처음부터 다시 보내야 함
+    assert manager.committed_offset({"received_ranges": [[2, 6]]}) == 0
+
+
+def test_out_of_order_ranges_complete_upload(manager, tmp_path):
+    async def run():
+        session = await manager.create_session("audio.mp3", 10)
+        upload_id = session["upload_id"]
+        session = await manager.write_range(upload_id, 5, 9, _body(b"56789"))
+        assert manager.committed_offset(session) == 0
+        session = await manager.write_range(upload_id, 0, 4, _body(b"01", b"234"), total=10)
+        assert manager.committed_offset(session) == 10
+
+        destination = tmp_path / "audio.mp3"
+        await manager.complete_session(upload_id, destination)
+        return destination.read_bytes()
+
+    assert asyncio.run(run()) == b"0123456789"
+
+
+def test_interrupted_range_keeps_written_bytes(manager):
+    async def broken_body():
+        yield b"0123"
+        raise ConnectionError("client disconnected")
+
+    async def run():
+        session = await manager.create_session("audio.mp3", 10)
+        with pytest.raises(ConnectionError):
+            await manager.write_range(session["upload_id"], 0, 9, broken_body())
+        return await manager.get_session(session["upload_id"])
+
+    session = asyncio.run(run())
+    assert manager.committed_offset(session) == 4
+
+
+def test_rejects_mismatched_total_and_incomplete_upload(manager, tmp_path):
+    async def run():
+        session = await manager.create_session("audio.mp3", 10)
+        upload_id = session["upload_id"]
+        with pytest.raises(UploadSessionError) as error:
+            await manager.write_range(upload_id, 0, 4, _body(b"01234"), total=20)
+        assert error.value.status_code == 400
+
+        await manager.write_range(upload_id, 0, 4, _body(b"01234"))
+        with pytest.raises(UploadSessionError) as error:
+            await manager.complete_session(upload_id, tmp_path / "audio.mp3")
+        assert error.value.status_code == 409
+
+    asyncio.run(run())
+
+
+def test_purge_expired_removes_stale_sessions(manager):
+    async def run():
+        stale = await manager.create_session("old.mp3", 10)
+        fresh = await manager.create_session("new.mp3", 10)
+        past = time.time() - manager.ttl_seconds - 60
+        for suffix in (".json", ".part"):
+            os.utime(manager.session_dir / f"{stale['upload_id']}{suffix}", (past, past))
+
+        assert await manager.purge_expired() == 1
+        with pytest.raises(UploadSessionError):
+            await manager.get_session(stale["upload_id"])
+        await manager.get_session(fresh["upload_id"])
+
+    asyncio.run(run())
+
+
+@requires_flock
+def test_two_writers_do_not_lose_ranges(tmp_path):
+    # 워커 프로세스 두 개처럼 관리자를 따로 만들어 각자의 이벤트 루프(스레드)에서 같은 세션에 씀
+    first = UploadSessionManager(tmp_path, max_upload_size=1024)
+    second = UploadSessionManager(tmp_path, max_upload_size=1024)
+    session = asyncio.run(first.create_session("audio.mp3", 400))
+    upload_id = session["upload_id"]
+
+    def write_every_other(manager, parity):
+        async def run():
+            for start in range(parity * 10, 400, 20):
+                await manager.write_range(upload_id, start, start + 9, _body(bytes([start % 256]) * 10))
+        asyncio.run(run())
+
+    threads = [
+        threading.Thread(target=write_every_other, args=(first, 0)),
+        threading.Thread(target=write_every_other, args=(second, 1)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    session = asyncio.run(first.get_session(upload_id))
+    assert session["received_ranges"] == [[0, 400]]
+
+
+@requires_flock
+def test_complete_waits_for_writer_in_other_manager(tmp_path):
+    writer = UploadSessionManager(tmp_path, max_upload_size=1024)
+    completer = UploadSessionManager(tmp_path, max_upload_size=1024)
+    destination = tmp_path / "audio.mp3"
+
+    async def run():
+        session = await writer.create_session("audio.mp3", 10)
+        upload_id = session["upload_id"]
+        await writer.write_range(upload_id, 0, 9, _body(b"0123456789"))
+
+        # 같은 범위를 다시 보내는 요청이 쓰는 도중에 다른 워커가 완료 처리를 시도
+        started = asyncio.Event()
+        resume = asyncio.Event()
+
+        async def slow_body():
+            yield b"01234"
+            started.set()
+            await resume.wait()
+            yield b"56789"
+
+        rewrite = asyncio.create_task(writer.write_range(upload_id, 0, 9, slow_body()))
+        await started.wait()
+        with pytest.raises(UploadSessionError) as error:
+            await completer.complete_session(upload_id, destination)
+        assert error.value.status_code == 409
+        assert not destination.exists()
+
+        resume.set()
+        await rewrite
+        await completer.complete_session(upload_id, destination)
+
+    asyncio.run(run())
+    assert destination.read_bytes() == b"0123456789"
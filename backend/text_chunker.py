@@ -0,0 +1,114 @@
+import re
+import threading
+from functools import lru_cache
+from typing import List, Optional
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+# 문장 끝(마침표/물음표/느낌표 뒤 공백) 또는 줄바꿈에서 분리
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。？！])\s+|\n+")
+
+
+class TextChunker:
+    def __init__(self, encoding_name: str = "o200k_base"):
+        """
+        토큰 수 기준 텍스트 분할기
+
+        문장 단위로 토큰 예산을 채워 청크를 만든다. 한국어는 글자당 토큰 수가 영어와 크게 달라
+        글자 수로 자르면 청크가 너무 작거나 모델 제한에 가까워지므로 실제 토크나이저로 센다.
+        토크나이저를 쓸 수 없으면(패키지 없음, 인코딩 파일 다운로드 실패 등) 글자 종류별 추정값을 사용한다.
+
+        Args:
+            encoding_name: tiktoken 인코딩 이름 (gpt-4o 계열은 o200k_base)
+        """
+        self.encoding_name = encoding_name
+        self._encoding = None
+        self._encoding_loaded = False
+        self._lock = threading.Lock()
+        # 문장별 토큰 수 캐시 (같은 문장을 여러 번 세지 않음)
+        self._count_cached = lru_cache(maxsize=65536)(self._count)
+
+    def count_tokens(self, text: str) -> int:
+        """텍스트의 토큰 수 (문장별로 세어 캐시하므로 같은 텍스트를 다시 세는 비용이 작음)"""
+        sentences = self.split_sentences(text)
+        return sum(self._count_cached(sentence) for sentence in sentences) + max(0, len(sentences) - 1)
+
+    def split_sentences(self, text: str) -> List[str]:
+        return [sentence for sentence in _SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+    def chunk_by_tokens(self, text: str, max_tokens: int) -> List[str]:
+        """문장 경계를 지키며 max_tokens 이하의 청크로 분할 (한 문장이 예산을 넘으면 그 문장만 잘라 나눔)"""
+        chunks: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+
+        for sentence in self.split_sentences(text):
+            tokens = self._count_cached(sentence) + 1  # 문장 사이 공백
+
+            if tokens > max_tokens:
+                if current:
+                    chunks.append(" ".join(current))
+                    current, current_tokens = [], 0
+                chunks.extend(self._split_long_sentence(sentence, max_tokens))
+                continue
+
+            if current_tokens + tokens > max_tokens:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+
+            current.append(sentence)
+            current_tokens += tokens
+
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
+
+    def truncate_to_tokens(self, text: str, max_tokens: int) -> str:
+        """앞에서부터 문장 단위로 max_tokens까지만 남김"""
+        if self.count_tokens(text) <= max_tokens:
+            return text
+        chunks = self.chunk_by_tokens(text, max_tokens)
+        return chunks[0] if chunks else ""
+
+    def _split_long_sentence(self, sentence: str, max_tokens: int) -> List[str]:
+        """예산보다 긴 한 문장을 토큰 위치(토크나이저가 없으면 글자 수 비례)로 나눔"""
+        encoding = self._get_encoding()
+        if encoding is not None:
+            tokens = encoding.encode(sentence)
+            return [encoding.decode(tokens[i:i + max_tokens]) for i in range(0, len(tokens), max_tokens)]
+
+        chars_per_chunk = max(1, int(len(sentence) * max_tokens / self._count_cached(sentence)))
+        return [sentence[i:i + chars_per_chunk] for i in range(0, len(sentence), chars_per_chunk)]
+
+    def _count(self, text: str) -> int:
+        encoding = self._get_encoding()
+        if encoding is not None:
+            return len(encoding.encode(text))
+        return self._estimate(text)
+
+    def _estimate(self, text: str) -> int:
+        """토크나이저 없이 추정 (한글/CJK는 글자당 약 1토큰, 그 외는 4글자당 1토큰)"""
+        wide = sum(1 for char in text if ord(char) >= 0x1100)
+        return wide + (len(text) - wide + 3) // 4
+
+    def _get_encoding(self) -> Optional[object]:
+        if self._encoding_loaded:
+            return self._encoding
+
+        with self._lock:
+            if not self._encoding_loaded:
+                if tiktoken is not None:
+                    try:
+                        self._encoding = tiktoken.get_encoding(self.encoding_name)
+                    except Exception as e:
+                        print(f"Warning: tiktoken 인코딩을 불러오지 못해 토큰 수를 추정합니다: {e}")
+                self._encoding_loaded = True
+        return self._encoding
+
+
+# 공용 분할기 (gpt-4o-mini 기준)
+text_chunker = TextChunker()
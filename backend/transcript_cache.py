@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+def hash_file_sync(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """파일 내용의 SHA-256 해시 (청크 단위로 읽어 메모리 사용 제한)"""
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+async def hash_file(file_path: str) -> str:
+    return await asyncio.to_thread(hash_file_sync, file_path)
+
+
+class TranscriptCache:
+    def __init__(self, cache_dir: str, max_size_bytes: int):
+        """
+        오디오 내용 해시 기반 음성 인식 결과 캐시 (로컬 디스크, 용량 기준 LRU 삭제)
+
+        같은 오디오를 같은 모델/언어로 다시 처리하면 Whisper를 호출하지 않고 저장된 텍스트를 사용한다.
+
+        Args:
+            cache_dir: 캐시 디렉토리
+            max_size_bytes: 캐시 최대 용량 (바이트). 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+
+    def _key(self, content_hash: str, model: str, language: Optional[str], vad: bool) -> str:
+        raw = f"{content_hash}:{model}:{language or 'auto'}"
+        if vad:
+            # 무음 구간을 제거하고 변환한 결과는 따로 저장
+            raw += ":vad"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(
+        self,
+        content_hash: str,
+        model: str = "whisper-1",
+        language: Optional[str] = None,
+        vad: bool = False
+    ) -> Optional[str]:
+        """캐시된 텍스트 반환 (없으면 None, vad는 무음 제거 사용 여부)"""
+        path = self._path(self._key(content_hash, model, language, vad))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # 사용 시각 갱신 (LRU 기준)
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        return entry.get("transcript")
+
+    def put(
+        self,
+        content_hash: str,
+        transcript: str,
+        model: str = "whisper-1",
+        language: Optional[str] = None,
+        vad: bool = False
+    ):
+        """텍스트 저장 후 용량을 넘으면 오래된 항목 삭제"""
+        if not transcript:
+            return
+
+        path = self._path(self._key(content_hash, model, language, vad))
+        entry = {
+            "content_hash": content_hash,
+            "model": model,
+            "language": language,
+            "vad": vad,
+            "transcript": transcript,
+            "created_at": time.time(),
+        }
+
+        # 임시 파일에 쓴 뒤 교체 (다른 워커가 읽는 중에도 깨진 파일이 보이지 않도록)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            total_size = 0
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+            if total_size <= self.max_size_bytes:
+                return
+
+            # 가장 오래 사용하지 않은 항목부터 삭제
+            for _, size, path in sorted(entries):
+                try:
+                    path.unlink()
+                    total_size -= size
+                except OSError:
+                    continue
+                if total_size <= self.max_size_bytes:
+                    break
+
+
+_default_cache: Optional[TranscriptCache] = None
+
+
+def get_transcript_cache() -> TranscriptCache:
+    """공용 음성 인식 캐시 (TRANSCRIPT_CACHE_DIR, TRANSCRIPT_CACHE_MAX_MB)"""
+    global _default_cache
+    if _default_cache is None:
+        cache_dir = os.getenv("TRANSCRIPT_CACHE_DIR", "uploads/transcript_cache")
+        max_size_mb = int(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "512"))
+        _default_cache = TranscriptCache(cache_dir, max_size_mb * 1024 * 1024)
+    return _default_cache
@@ -0,0 +1,382 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+import aiofiles
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: 프로세스 내 잠금만 사용 (API 워커 1개로 실행해야 함)
+
+
+class UploadSessionError(Exception):
+    """업로드 세션 오류 (status_code는 HTTP 응답 코드로 사용)"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class _SessionGuard:
+    def __init__(self):
+        """세션 하나의 프로세스 내 잠금 상태 (사용 중인 요청이 없으면 관리자에서 제거됨)"""
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class _FileLock:
+    def __init__(self, path: Path):
+        """
+        flock 기반 프로세스 간 잠금 (uvicorn 워커 여러 개가 같은 세션 디렉토리를 공유할 때)
+
+        잠금은 열린 파일 단위이므로 같은 프로세스 안에서도 _FileLock끼리는 서로 막는다.
+        fcntl이 없는 환경에서는 아무것도 잠그지 않는다.
+        """
+        self.path = path
+        self._file = None
+
+    def acquire(self, shared: bool = False, blocking: bool = True) -> bool:
+        """잠금 획득 (blocking=False이면 바로 얻지 못할 때 False)"""
+        if fcntl is None:
+            return True
+        self._file = open(self.path, "a")
+        flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+        if not blocking:
+            flags |= fcntl.LOCK_NB
+        try:
+            fcntl.flock(self._file.fileno(), flags)
+        except BlockingIOError:
+            self.release()
+            return False
+        except BaseException:
+            self.release()
+            raise
+        return True
+
+    def release(self):
+        if self._file is not None:
+            # 파일을 닫으면 잠금도 풀림
+            self._file.close()
+            self._file = None
+
+
+class UploadSessionManager:
+    def __init__(
+        self,
+        upload_dir: Path,
+        max_upload_size: int,
+        chunk_size: int = 1024 * 1024,
+        ttl_seconds: float = 24 * 3600,
+        purge_interval: float = 600.0
+    ):
+        """
+        이어받기 가능한 업로드 세션 관리자
+
+        세션 정보는 upload_dir/sessions/{upload_id}.json 에, 데이터는 {upload_id}.part 에 저장되므로
+        서버가 재시작되어도 이어서 업로드할 수 있다. 마지막으로 데이터를 받은 뒤 ttl_seconds가 지난
+        세션은 새 세션을 만들 때 주기적으로 정리된다.
+
+        여러 API 워커 프로세스가 같은 세션을 받을 수 있으므로 세션 정보 읽기-수정-저장은 {upload_id}.lock의
+        배타 잠금 안에서 하고, 데이터를 쓰는 동안에는 {upload_id}.writers에 공유 잠금을 잡는다.
+        완료 처리는 .writers의 배타 잠금을 바로 얻지 못하면(다른 프로세스가 쓰는 중) 거부한다.
+
+        Args:
+            upload_dir: 업로드 디렉토리
+            max_upload_size: 최대 업로드 크기 (바이트)
+            chunk_size: 디스크에 쓰는 단위 (바이트)
+            ttl_seconds: 사용하지 않는 세션을 유지하는 시간 (초)
+            purge_interval: 만료된 세션을 확인하는 최소 간격 (초)
+        """
+        self.session_dir = Path(upload_dir) / "sessions"
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        self.max_upload_size = max_upload_size
+        self.chunk_size = chunk_size
+        self.ttl_seconds = ttl_seconds
+        self.purge_interval = purge_interval
+        self._last_purge = 0.0
+        self._guards: Dict[str, _SessionGuard] = {}
+
+    def _meta_path(self, upload_id: str) -> Path:
+        return self.session_dir / f"{upload_id}.json"
+
+    def _data_path(self, upload_id: str) -> Path:
+        return self.session_dir / f"{upload_id}.part"
+
+    def _lock_path(self, upload_id: str) -> Path:
+        return self.session_dir / f"{upload_id}.lock"
+
+    def _writers_path(self, upload_id: str) -> Path:
+        return self.session_dir / f"{upload_id}.writers"
+
+    @asynccontextmanager
+    async def _guard(self, upload_id: str):
+        """세션 잠금 상태를 사용하는 동안 유지 (마지막 사용자가 끝나면 제거되어 쌓이지 않음)"""
+        guard = self._guards.setdefault(upload_id, _SessionGuard())
+        guard.users += 1
+        try:
+            yield guard
+        finally:
+            guard.users -= 1
+            if guard.users == 0 and self._guards.get(upload_id) is guard:
+                del self._guards[upload_id]
+
+    @asynccontextmanager
+    async def _session_lock(self, guard: _SessionGuard, upload_id: str):
+        """세션 정보 잠금 (프로세스 안에서는 asyncio 잠금으로 줄 세운 뒤 한 요청만 파일 잠금을 기다림)"""
+        async with guard.lock:
+            # 없는 세션 ID로 잠금 파일이 생기지 않도록 먼저 확인
+            if not self._meta_path(upload_id).exists():
+                raise UploadSessionError("Upload session not found", status_code=404)
+            file_lock = _FileLock(self._lock_path(upload_id))
+            await asyncio.to_thread(file_lock.acquire)
+            try:
+                yield
+            finally:
+                file_lock.release()
+
+    async def create_session(self, filename: str, total_size: int, summary_ratio: float = 0.5) -> Dict:
+        """새 업로드 세션 생성"""
+        await self._maybe_purge()
+
+        if total_size <= 0:
+            raise UploadSessionError("total_size must be positive")
+        if total_size > self.max_upload_size:
+            raise UploadSessionError(
+                f"File too large. Maximum size is {self.max_upload_size // (1024 * 1024)}MB",
+                status_code=413
+            )
+
+        upload_id = str(uuid.uuid4())
+        session = {
+            "upload_id": upload_id,
+            "filename": filename,
+            "extension": Path(filename).suffix.lower(),
+            "total_size": total_size,
+            "summary_ratio": summary_ratio,
+            "received_ranges": [],
+            "completed": False,
+        }
+
+        # 전체 크기만큼 미리 할당 (범위를 어떤 순서로 받아도 해당 위치에 기록 가능)
+        async with aiofiles.open(self._data_path(upload_id), "wb") as f:
+            await f.truncate(total_size)
+
+        await self._save_session(session)
+        return session
+
+    async def get_session(self, upload_id: str) -> Dict:
+        """세션 정보 조회"""
+        meta_path = self._meta_path(upload_id)
+        if not meta_path.exists():
+            raise UploadSessionError("Upload session not found", status_code=404)
+
+        async with aiofiles.open(meta_path, "r") as f:
+            return json.loads(await f.read())
+
+    async def write_range(
+        self,
+        upload_id: str,
+        start: int,
+        end: int,
+        body: AsyncIterator[bytes],
+        total: Optional[int] = None
+    ) -> Dict:
+        """
+        바이트 범위 [start, end] (end 포함) 기록
+
+        중간에 연결이 끊기거나 실패해도 실제로 기록한 부분까지는 받은 범위로 저장하므로,
+        클라이언트는 세션 상태의 offset부터 이어서 보내면 된다.
+
+        Args:
+            upload_id: 세션 ID
+            start: 시작 오프셋
+            end: 끝 오프셋 (포함)
+            body: 요청 본문 스트림
+            total: Content-Range의 전체 크기 (알 수 없으면 None)
+        """
+        async with self._guard(upload_id) as guard:
+            # 완료 처리가 쓰는 중인 요청을 알 수 있도록 쓰기 시작을 세션 잠금 안에서 등록 (.writers 공유 잠금)
+            writer_lock = _FileLock(self._writers_path(upload_id))
+            async with self._session_lock(guard, upload_id):
+                session = await self.get_session(upload_id)
+                if session["completed"]:
+                    raise UploadSessionError("Upload session already completed", status_code=409)
+                if total is not None and total != session["total_size"]:
+                    raise UploadSessionError("Content-Range total does not match the upload size")
+                if start < 0 or end < start or end >= session["total_size"]:
+                    raise UploadSessionError("Invalid byte range", status_code=416)
+                # 완료 처리는 세션 잠금을 잡은 채로만 배타 잠금을 시도하므로 여기서는 바로 얻을 수 있음
+                if not writer_lock.acquire(shared=True, blocking=False):
+                    raise UploadSessionError("Upload is being completed", status_code=409)
+
+            try:
+                expected = end - start + 1
+                written = 0
+                try:
+                    async with aiofiles.open(self._data_path(upload_id), "r+b") as f:
+                        await f.seek(start)
+                        async for chunk in body:
+                            if not chunk:
+                                continue
+                            if written + len(chunk) > expected:
+                                raise UploadSessionError("Request body is larger than Content-Range")
+                            await f.write(chunk)
+                            written += len(chunk)
+                finally:
+                    if written:
+                        session = await self._record_range(guard, upload_id, start, start + written)
+            finally:
+                writer_lock.release()
+
+        if written != expected:
+            raise UploadSessionError("Request body does not match Content-Range")
+
+        return session
+
+    async def _record_range(self, guard: _SessionGuard, upload_id: str, start: int, end: int) -> Dict:
+        """받은 범위 [start, end) 기록 (다른 프로세스의 요청과도 덮어쓰지 않도록 세션 잠금)"""
+        async with self._session_lock(guard, upload_id):
+            session = await self.get_session(upload_id)
+            session["received_ranges"] = self._merge_ranges(session["received_ranges"] + [[start, end]])
+            await self._save_session(session)
+        return session
+
+    async def complete_session(self, upload_id: str, destination: Path) -> str:
+        """
+        업로드 완료 처리: 모든 바이트가 도착했는지 확인하고 destination으로 이동
+
+        Returns:
+            파일의 SHA-256 해시
+        """
+        async with self._guard(upload_id) as guard, self._session_lock(guard, upload_id):
+            session = await self.get_session(upload_id)
+            if session["completed"]:
+                raise UploadSessionError("Upload session already completed", status_code=409)
+
+            writer_lock = _FileLock(self._writers_path(upload_id))
+            if not writer_lock.acquire(blocking=False):
+                # 같은 범위를 다시 보내는 요청이 (다른 워커 프로세스에서라도) 아직 파일에 쓰는 중
+                raise UploadSessionError("Upload still in progress", status_code=409)
+            try:
+                if self.committed_offset(session) < session["total_size"]:
+                    raise UploadSessionError(
+                        f"Upload incomplete: {self.committed_offset(session)}/{session['total_size']} bytes received",
+                        status_code=409
+                    )
+
+                # 해시 계산과 이동이 끝날 때까지 두 잠금을 유지하므로 어느 프로세스에서도 새 범위 쓰기가 시작되지 않음
+                content_hash = await asyncio.to_thread(self._hash_file, self._data_path(upload_id))
+                os.replace(self._data_path(upload_id), destination)
+
+                session["completed"] = True
+                await self._save_session(session)
+            finally:
+                writer_lock.release()
+
+        return content_hash
+
+    async def delete_session(self, upload_id: str):
+        """세션과 임시 데이터 삭제"""
+        meta_path = self._meta_path(upload_id)
+        paths = (
+            self._data_path(upload_id),
+            meta_path,
+            meta_path.with_suffix(".json.tmp"),
+            self._writers_path(upload_id),
+            self._lock_path(upload_id),
+        )
+        for path in paths:
+            try:
+                if path.exists():
+                    path.unlink()
+            except Exception as e:
+                print(f"업로드 세션 파일 삭제 실패 {path}: {e}")
+
+    async def purge_expired(self) -> int:
+        """마지막으로 갱신된 뒤 ttl_seconds가 지난 세션의 정보/데이터 파일 삭제 후 삭제한 세션 수 반환"""
+        purged = 0
+        for upload_id in await asyncio.to_thread(self._find_expired):
+            # 다른 프로세스가 세션 잠금을 잡고 있거나 데이터를 쓰는 중이면 건너뜀
+            session_lock = _FileLock(self._lock_path(upload_id))
+            writer_lock = _FileLock(self._writers_path(upload_id))
+            if not session_lock.acquire(blocking=False):
+                continue
+            try:
+                if not writer_lock.acquire(blocking=False):
+                    continue
+                try:
+                    await self.delete_session(upload_id)
+                    purged += 1
+                finally:
+                    writer_lock.release()
+            finally:
+                session_lock.release()
+        if purged:
+            print(f"만료된 업로드 세션 {purged}개 정리")
+        return purged
+
+    def _find_expired(self) -> List[str]:
+        deadline = time.time() - self.ttl_seconds
+        last_modified: Dict[str, float] = {}
+        for path in self.session_dir.iterdir():
+            # {id}.json, {id}.part, {id}.lock, {id}.writers, 저장 중 끊긴 {id}.json.tmp (정보 파일 없이 남은 데이터도 포함)
+            upload_id = path.name.split(".", 1)[0]
+            try:
+                modified = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            last_modified[upload_id] = max(last_modified.get(upload_id, 0.0), modified)
+
+        # 이 프로세스에서 지금 요청을 처리 중인 세션은 제외 (다른 프로세스는 purge_expired에서 파일 잠금으로 확인)
+        return [
+            upload_id for upload_id, modified in last_modified.items()
+            if modified < deadline and upload_id not in self._guards
+        ]
+
+    async def _maybe_purge(self):
+        now = time.time()
+        if now - self._last_purge >= self.purge_interval:
+            self._last_purge = now
+            try:
+                await self.purge_expired()
+            except Exception as e:
+                print(f"업로드 세션 정리 실패: {e}")
+
+    def committed_offset(self, session: Dict) -> int:
+        """처음부터 끊김 없이 받은 마지막 위치 (이어서 보낼 오프셋)"""
+        ranges = session["received_ranges"]
+        if ranges and ranges[0][0] == 0:
+            return ranges[0][1]
+        return 0
+
+    def _merge_ranges(self, ranges: List[List[int]]) -> List[List[int]]:
+        """[start, end) 범위 목록 병합"""
+        merged: List[List[int]] = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return merged
+
+    def _hash_file(self, path: Path) -> str:
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    async def _save_session(self, session: Dict):
+        # 임시 파일에 쓴 뒤 교체하여 중간에 끊겨도 세션 정보가 깨지지 않도록 함
+        meta_path = self._meta_path(session["upload_id"])
+        tmp_path = meta_path.with_suffix(".json.tmp")
+        async with aiofiles.open(tmp_path, "w") as f:
+            await f.write(json.dumps(session))
+        os.replace(tmp_path, meta_path)
@@ -0,0 +1,178 @@
+import os
+import signal
+import socket
+import asyncio
+import threading
+import multiprocessing
+from typing import Dict
+
+from dotenv import load_dotenv
+
+from job_queue import get_job_queue
+from openai_clients import close_openai_client
+from stage_limits import configure_stage_limits, get_stage_limits
+
+
+class Worker:
+    def __init__(self, worker_id: str, max_jobs: int = 8, poll_interval: float = 1.0, drain_timeout: float = 300.0):
+        """
+        작업 큐에서 작업을 꺼내 처리하는 워커 (프로세스 하나당 하나)
+
+        Args:
+            worker_id: 워커 식별자
+            max_jobs: 이 프로세스에서 동시에 처리할 최대 작업 수
+            poll_interval: 큐가 비어 있을 때 다시 확인하기까지의 대기 시간 (초)
+            drain_timeout: 종료 신호를 받은 뒤 진행 중인 작업을 기다리는 최대 시간 (초)
+        """
+        self.worker_id = worker_id
+        self.max_jobs = max_jobs
+        self.poll_interval = poll_interval
+        self.drain_timeout = drain_timeout
+        self.queue = get_job_queue()
+        self.running: Dict[str, asyncio.Task] = {}
+        # 하트비트 스레드가 읽는 처리 중인 작업 ID (이벤트 루프가 막혀 있어도 임대가 연장되도록 별도 스레드에서 갱신)
+        self._leased = set()
+        self._leased_lock = threading.Lock()
+        self._heartbeat_stop = threading.Event()
+        self.stopping = asyncio.Event()
+        self.handlers = self._build_handlers()
+
+    def _build_handlers(self) -> Dict:
+        """작업 종류별 처리 함수 (서비스는 워커 프로세스 안에서 생성)"""
+        from services_chunked import VideoProcessingService
+        from youtube_processing_service_simple import YouTubeProcessingService
+
+        video_service = VideoProcessingService()
+        youtube_service = YouTubeProcessingService()
+
+        return {
+            "process_video": video_service.process_video,
+            "process_youtube_url": youtube_service.process_youtube_url,
+        }
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.stopping.set)
+            except NotImplementedError:
+                # Windows에서는 KeyboardInterrupt로 종료
+                pass
+
+        heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name=f"{self.worker_id}-heartbeat", daemon=True)
+        heartbeat_thread.start()
+        print(f"[{self.worker_id}] 워커 시작 (최대 동시 작업 {self.max_jobs}개, 단계 제한 {get_stage_limits()})")
+
+        try:
+            while not self.stopping.is_set():
+                if len(self.running) >= self.max_jobs:
+                    await self._wait(self.poll_interval)
+                    continue
+
+                job = await asyncio.to_thread(self.queue.claim, self.worker_id, list(self.handlers))
+                if not job:
+                    await self._wait(self.poll_interval)
+                    continue
+
+                with self._leased_lock:
+                    self._leased.add(job["job_id"])
+                self.running[job["job_id"]] = asyncio.create_task(self._run_job(job))
+        finally:
+            await self._drain()
+            self._heartbeat_stop.set()
+            await asyncio.to_thread(heartbeat_thread.join)
+            await close_openai_client()
+
+    async def _wait(self, timeout: float):
+        try:
+            await asyncio.wait_for(self.stopping.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run_job(self, job: Dict):
+        job_id = job["job_id"]
+        print(f"[{self.worker_id}] 작업 시작: {job['job_type']} {job_id} (시도 {job['attempts']})")
+        try:
+            await self.handlers[job["job_type"]](**job["payload"])
+            if await asyncio.to_thread(self.queue.complete, job_id, self.worker_id):
+                print(f"[{self.worker_id}] 작업 완료: {job_id}")
+            else:
+                print(f"[{self.worker_id}] 임대가 만료되어 다른 워커가 가져간 작업의 완료는 기록하지 않음: {job_id}")
+        except asyncio.CancelledError:
+            # 드레인 시간 초과로 취소된 작업은 다른 워커가 다시 처리하도록 반환
+            await asyncio.to_thread(self.queue.release, job_id, self.worker_id)
+            print(f"[{self.worker_id}] 작업 반환: {job_id}")
+            raise
+        except Exception as e:
+            # 작업 상태(실패 사유)는 서비스가 작업 저장소에 기록함
+            if await asyncio.to_thread(self.queue.fail, job_id, self.worker_id, str(e)):
+                print(f"[{self.worker_id}] 작업 실패: {job_id} - {e}")
+            else:
+                print(f"[{self.worker_id}] 임대가 만료되어 다른 워커가 가져간 작업의 실패는 기록하지 않음: {job_id} - {e}")
+        finally:
+            self.running.pop(job_id, None)
+            with self._leased_lock:
+                self._leased.discard(job_id)
+
+    def _heartbeat_loop(self):
+        """처리 중인 작업들의 임대를 주기적으로 연장 (별도 스레드, 이벤트 루프와 무관하게 실행)"""
+        interval = max(1.0, self.queue.lease_seconds / 3)
+        while not self._heartbeat_stop.wait(interval):
+            with self._leased_lock:
+                job_ids = list(self._leased)
+            try:
+                self.queue.heartbeat(job_ids, self.worker_id)
+            except Exception as e:
+                print(f"[{self.worker_id}] 하트비트 실패: {e}")
+
+    async def _drain(self):
+        """새 작업은 받지 않고 진행 중인 작업이 끝나기를 기다림"""
+        if not self.running:
+            return
+
+        print(f"[{self.worker_id}] 종료 중: 진행 중인 작업 {len(self.running)}개 대기 (최대 {self.drain_timeout:.0f}초)")
+        tasks = list(self.running.values())
+        done, pending = await asyncio.wait(tasks, timeout=self.drain_timeout)
+
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def run_worker(index: int):
+    """워커 프로세스 진입점"""
+    load_dotenv()
+    configure_stage_limits()
+
+    worker = Worker(
+        worker_id=f"{socket.gethostname()}-{os.getpid()}-{index}",
+        max_jobs=int(os.getenv("WORKER_MAX_JOBS", "8")),
+        drain_timeout=float(os.getenv("WORKER_DRAIN_TIMEOUT", "300"))
+    )
+    asyncio.run(worker.run())
+
+
+def main():
+    """WORKER_PROCESSES개의 워커 프로세스를 띄우고, 종료 신호를 받으면 모두 드레인 후 종료"""
+    load_dotenv()
+    num_processes = max(1, int(os.getenv("WORKER_PROCESSES", "2")))
+
+    processes = [multiprocessing.Process(target=run_worker, args=(i,)) for i in range(num_processes)]
+    for process in processes:
+        process.start()
+
+    def forward(signum, frame):
+        for process in processes:
+            if process.is_alive() and process.pid:
+                os.kill(process.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
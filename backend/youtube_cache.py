@@ -0,0 +1,64 @@
+import os
+from typing import Dict, Optional, Tuple
+
+from task_store import TaskStore, SQLiteTaskStore
+
+
+class YouTubeResultCache:
+    def __init__(self, store: TaskStore):
+        """
+        YouTube 비디오 ID별 처리 결과 캐시
+
+        메타데이터, 자막/음성 인식 텍스트, 생성 결과(요약/해설)를 따로 저장한다.
+        생성 결과는 (video_id, summary_ratio, 프롬프트 버전)으로 구분하므로
+        다른 요약 비율로 다시 요청하면 텍스트는 재사용하고 요약 단계만 다시 실행한다.
+        """
+        self.store = store
+
+    def get_metadata(self, video_id: str) -> Optional[Dict]:
+        return self._get(f"metadata:{video_id}")
+
+    def set_metadata(self, video_id: str, metadata: Dict):
+        self.store.set(f"ytcache:metadata:{video_id}", {"value": metadata})
+
+    def get_transcript(self, video_id: str) -> Optional[Dict]:
+        """{"transcript": ..., "source": "subtitles" | "audio"} 반환"""
+        return self._get(f"transcript:{video_id}")
+
+    def set_transcript(self, video_id: str, transcript: str, source: str):
+        if transcript:
+            self.store.set(f"ytcache:transcript:{video_id}", {"value": {"transcript": transcript, "source": source}})
+
+    def get_outputs(self, video_id: str, summary_ratio: float, prompt_version: str) -> Optional[Tuple[str, str]]:
+        """(outline, detailed_explanation) 반환"""
+        outputs = self._get(self._outputs_key(video_id, summary_ratio, prompt_version))
+        if not outputs:
+            return None
+        return outputs["outline"], outputs["detailed_explanation"]
+
+    def set_outputs(self, video_id: str, summary_ratio: float, prompt_version: str, outline: str, detailed_explanation: str):
+        self.store.set(
+            f"ytcache:{self._outputs_key(video_id, summary_ratio, prompt_version)}",
+            {"value": {"outline": outline, "detailed_explanation": detailed_explanation}}
+        )
+
+    def _outputs_key(self, video_id: str, summary_ratio: float, prompt_version: str) -> str:
+        return f"outputs:{video_id}:{summary_ratio}:{prompt_version}"
+
+    def _get(self, key: str):
+        entry = self.store.get(f"ytcache:{key}")
+        return entry["value"] if entry else None
+
+
+_default_cache: Optional[YouTubeResultCache] = None
+
+
+def get_youtube_cache() -> YouTubeResultCache:
+    """공용 YouTube 결과 캐시 (작업 저장소와 같은 백엔드, YOUTUBE_CACHE_TTL_SECONDS 동안 유지)"""
+    global _default_cache
+    if _default_cache is None:
+        ttl_seconds = float(os.getenv("YOUTUBE_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+        store = SQLiteTaskStore(os.getenv("TASK_DB_PATH", "uploads/tasks.db"), ttl_seconds)
+        _default_cache = YouTubeResultCache(store)
+    return _default_cache
@@ -1,12 +1,11 @@
 import os
-import asyncio
-from typing import Dict
-from pathlib import Path
-import uuid
+from typing import Dict, Iterable
 
 from youtube_service import YouTubeService
 from services import VideoProcessingService
 from audio_splitter import AudioSplitter
+from task_store import SEGMENT_COUNT_FIELD, TEXT_FIELDS, TaskMap, get_task_store
+from youtube_cache import get_youtube_cache
 
 
 class YouTubeProcessingService:
@@ -14,16 +13,21 @@ class YouTubeProcessingService:
         # OpenAI API 키 설정
         os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY", "")
         
-        self.tasks: Dict[str, Dict] = {}
+        # 작업 상태 (공용 저장소에 저장되어 재시작/여러 워커 간에도 유지)
+        self.tasks = TaskMap(get_task_store(), "youtube")
         self.youtube_service = YouTubeService()
         self.video_service = VideoProcessingService()
         self.audio_splitter = AudioSplitter()
+        # 비디오 ID별 메타데이터/텍스트/생성 결과 캐시
+        self.cache = get_youtube_cache()
     
     async def process_youtube_url(self, youtube_url: str, task_id: str, summary_ratio: float = 0.5, download_video: bool = False):
         """YouTube URL 처리 메인 함수"""
+        # 작업 상태는 여러 필드를 한 번에, 이벤트 루프 밖에서 갱신
+        task = self.tasks.handle(task_id)
         try:
             # 초기 상태 설정
-            self.tasks[task_id] = {
+            await self.tasks.aset(task_id, {
                 "youtube_url": youtube_url,
                 "video_id": "",
                 "file_path": "",
@@ -38,87 +42,102 @@ class YouTubeProcessingService:
                 "summary_ratio": summary_ratio,
                 "download_video": download_video,
                 "has_subtitles": False
-            }
+            })
             
             # 1단계: 메타데이터 추출
-            await self._extract_metadata(task_id, youtube_url)
+            video_id, metadata = await self._extract_metadata(task_id, youtube_url)
             
             # 2단계: 자막 추출 시도
-            await self._try_extract_subtitles(task_id)
+            transcript = await self._try_extract_subtitles(task_id, video_id)
             
             # 3단계: 자막이 없으면 오디오/비디오 다운로드
-            if not self.tasks[task_id]["has_subtitles"]:
-                await self._download_media(task_id, youtube_url, download_video)
-                await self._extract_transcript_from_audio(task_id)
+            if not transcript:
+                file_path = await self._download_media(task_id, youtube_url, download_video)
+                transcript = await self._extract_transcript_from_audio(task_id, video_id, file_path)
             
             # 4단계: 요약 및 해설 생성
-            await self._generate_summary(task_id)
+            await self._generate_summary(task_id, video_id, transcript, metadata, summary_ratio)
             
-            return self.tasks[task_id]
+            return await self.tasks.aget(task_id, fields=TEXT_FIELDS)
             
         except Exception as e:
-            # 에러 처리
-            if task_id in self.tasks:
-                self.tasks[task_id]["status"] = "failed"
-                self.tasks[task_id]["error"] = str(e)
+            # 에러 처리 (작업이 이미 삭제되었으면 무시됨)
+            await task.aupdate({"status": "failed", "error": str(e)})
             raise
     
     async def _extract_metadata(self, task_id: str, youtube_url: str):
-        """YouTube 메타데이터 추출"""
+        """YouTube 메타데이터 추출 후 (비디오 ID, 메타데이터) 반환"""
+        task = self.tasks.handle(task_id)
         try:
-            self.tasks[task_id]["progress"] = 10
-            self.tasks[task_id]["status"] = "extracting_metadata"
+            await task.aupdate({"progress": 10, "status": "extracting_metadata"})
             
             # 비디오 ID 추출
             video_id = self.youtube_service.extract_video_id(youtube_url)
             if not video_id:
                 raise ValueError("유효하지 않은 YouTube URL입니다.")
             
-            self.tasks[task_id]["video_id"] = video_id
+            # 메타데이터 추출 (캐시 우선)
+            metadata = self.cache.get_metadata(video_id)
+            if metadata is None:
+                metadata = await self.youtube_service.get_youtube_metadata(youtube_url)
+                if metadata.get("title") != "메타데이터 추출 실패":
+                    self.cache.set_metadata(video_id, metadata)
             
-            # 메타데이터 추출
-            metadata = await self.youtube_service.get_youtube_metadata(youtube_url)
-            self.tasks[task_id]["metadata"] = metadata
-            self.tasks[task_id]["progress"] = 20
+            await task.aupdate({"video_id": video_id, "metadata": metadata, "progress": 20})
+            return video_id, metadata
             
         except Exception as e:
-            self.tasks[task_id]["error"] = str(e)
-            self.tasks[task_id]["status"] = "failed"
+            await task.aupdate({"error": str(e), "status": "failed"})
             raise
     
-    async def _try_extract_subtitles(self, task_id: str):
-        """자막 추출 시도"""
+    async def _try_extract_subtitles(self, task_id: str, video_id: str) -> str:
+        """자막 추출 시도 (없으면 빈 문자열)"""
+        task = self.tasks.handle(task_id)
         try:
-            self.tasks[task_id]["progress"] = 30
-            self.tasks[task_id]["status"] = "extracting_subtitles"
+            await task.aupdate({"progress": 30, "status": "extracting_subtitles"})
+            
+            # 이전에 자막 또는 음성 인식으로 얻은 텍스트가 있으면 재사용
+            cached = self.cache.get_transcript(video_id)
+            if cached:
+                await task.aupdate({
+                    "transcript": cached["transcript"],
+                    # 음성 인식으로 얻은 텍스트가 캐시된 경우에는 자막이 없는 영상
+                    "has_subtitles": cached["source"] == "subtitles",
+                    "progress": 60
+                })
+                print(f"캐시된 텍스트 사용 ({cached['source']}): {len(cached['transcript'])} 글자")
+                return cached["transcript"]
             
-            video_id = self.tasks[task_id]["video_id"]
             transcript = await self.youtube_service.get_youtube_transcript(video_id)
             
             if transcript and transcript.strip():
-                self.tasks[task_id]["transcript"] = transcript
-                self.tasks[task_id]["has_subtitles"] = True
-                self.tasks[task_id]["progress"] = 60
+                self.cache.set_transcript(video_id, transcript, "subtitles")
+                await task.aupdate({
+                    "transcript": transcript,
+                    "has_subtitles": True,
+                    "progress": 60
+                })
                 print(f"자막 추출 성공: {len(transcript)} 글자")
-            else:
-                self.tasks[task_id]["has_subtitles"] = False
-                self.tasks[task_id]["progress"] = 40
-                print("자막을 찾을 수 없어 다운로드로 진행합니다.")
+                return transcript
+            
+            await task.aupdate({"has_subtitles": False, "progress": 40})
+            print("자막을 찾을 수 없어 다운로드로 진행합니다.")
+            return ""
                 
         except Exception as e:
             print(f"자막 추출 중 오류 발생: {e}")
             # 자막 추출 실패는 치명적이지 않음 - 다운로드로 계속 진행
-            self.tasks[task_id]["has_subtitles"] = False
-            self.tasks[task_id]["progress"] = 40
+            await task.aupdate({"has_subtitles": False, "progress": 40})
+            return ""
     
-    async def _download_media(self, task_id: str, youtube_url: str, download_video: bool = False):
-        """미디어 다운로드 (오디오 또는 비디오)"""
+    async def _download_media(self, task_id: str, youtube_url: str, download_video: bool = False) -> str:
+        """미디어 다운로드 (오디오 또는 비디오) 후 파일 경로 반환"""
+        task = self.tasks.handle(task_id)
         try:
-            self.tasks[task_id]["progress"] = 50
-            if download_video:
-                self.tasks[task_id]["status"] = "downloading_video"
-            else:
-                self.tasks[task_id]["status"] = "downloading_audio"
+            await task.aupdate({
+                "progress": 50,
+                "status": "downloading_video" if download_video else "downloading_audio"
+            })
             
             file_path = await self.youtube_service.download_youtube_audio(youtube_url, task_id, download_video)
             
@@ -128,87 +147,98 @@ class YouTubeProcessingService:
                 print(error_msg)
                 raise Exception(error_msg)
             
-            self.tasks[task_id]["file_path"] = file_path
-            self.tasks[task_id]["progress"] = 60
+            await task.aupdate({"file_path": file_path, "progress": 60})
             media_type = "비디오" if download_video else "오디오"
             print(f"{media_type} 다운로드 성공: {file_path}")
+            return file_path
             
         except Exception as e:
             media_type = "비디오" if download_video else "오디오"
             error_msg = f"{media_type} 다운로드 실패: {str(e)}"
             print(error_msg)
-            self.tasks[task_id]["error"] = error_msg
-            self.tasks[task_id]["status"] = "failed"
+            await task.aupdate({"error": error_msg, "status": "failed"})
             raise
     
-    async def _extract_transcript_from_audio(self, task_id: str):
+    async def _extract_transcript_from_audio(self, task_id: str, video_id: str, file_path: str) -> str:
         """오디오에서 텍스트 추출 (큰 파일은 자동 분할)"""
+        task = self.tasks.handle(task_id)
         try:
-            self.tasks[task_id]["progress"] = 70
-            self.tasks[task_id]["status"] = "extracting_transcript"
-            
-            file_path = self.tasks[task_id]["file_path"]
+            # 청크 변환이 끝나는 대로 작업 상태에 공개 (전체 완료 전에도 읽을 수 있음)
+            await task.aupdate({
+                "progress": 70,
+                "status": "extracting_transcript",
+                SEGMENT_COUNT_FIELD: 0
+            })
             
             # 파일 크기 확인 및 분할 처리
             file_size_mb = os.path.getsize(file_path) / 1024 / 1024
             print(f"오디오 파일 크기: {file_size_mb:.2f}MB")
             
-            if self.audio_splitter.needs_splitting(file_path):
-                print("파일이 커서 분할 처리를 시작합니다.")
-                transcript = await self.audio_splitter.process_large_audio_file(
-                    file_path, 
-                    self.video_service.openai_client,
-                    language="ko"
-                )
-            else:
-                print("파일 크기가 적당하여 바로 처리합니다.")
-                with open(file_path, "rb") as audio_file:
-                    transcript_response = await asyncio.to_thread(
-                        self.video_service.openai_client.audio.transcriptions.create,
-                        model="whisper-1",
-                        file=audio_file,
-                        language="ko"
-                    )
-                transcript = transcript_response.text
-            
-            self.tasks[task_id]["transcript"] = transcript
-            self.tasks[task_id]["progress"] = 80
+            # 작은 파일은 바로, 큰 파일은 분할 처리 (같은 오디오는 캐시된 텍스트 사용)
+            transcript = await self.audio_splitter.process_large_audio_file(
+                file_path,
+                self.video_service.openai_client,
+                language="ko",
+                on_segment=task.aadd_segment
+            )
+            
+            await task.aupdate({"transcript": transcript, "progress": 80})
+            self.cache.set_transcript(video_id, transcript, "audio")
             print(f"음성 인식 완료: {len(transcript)} 글자")
+            return transcript
             
         except Exception as e:
             error_msg = f"음성 인식 실패: {str(e)}"
             print(error_msg)
-            self.tasks[task_id]["error"] = error_msg
-            self.tasks[task_id]["status"] = "failed"
+            await task.aupdate({"error": error_msg, "status": "failed"})
             raise
     
-    async def _generate_summary(self, task_id: str):
+    async def _generate_summary(self, task_id: str, video_id: str, transcript: str, metadata: Dict, summary_ratio: float):
         """요약 및 상세 해설 생성"""
+        task = self.tasks.handle(task_id)
         try:
-            self.tasks[task_id]["progress"] = 90
-            self.tasks[task_id]["status"] = "generating_summary"
+            await task.aupdate({"progress": 90, "status": "generating_summary"})
             
-            transcript = self.tasks[task_id]["transcript"]
-            metadata = self.tasks[task_id]["metadata"]
-            summary_ratio = self.tasks[task_id]["summary_ratio"]
+            prompt_version = self.youtube_service.PROMPT_VERSION
             
-            outline, detailed_explanation = await self.youtube_service.generate_summary_and_explanation(
-                transcript, metadata, summary_ratio
-            )
+            # 같은 비디오/요약 비율/프롬프트 버전의 결과가 있으면 재사용
+            cached_outputs = self.cache.get_outputs(video_id, summary_ratio, prompt_version)
+            if cached_outputs:
+                outline, detailed_explanation = cached_outputs
+            else:
+                # 생성되는 대로 작업 상태에 이어 붙여 진행 상황 스트림으로 전달 (기존 텍스트는 읽지 않고 끝에만 추가)
+                await task.aupdate({"outline": "", "detailed_explanation": ""})
+                
+                outline, detailed_explanation = await self.youtube_service.generate_summary_and_explanation(
+                    transcript, metadata, summary_ratio, on_delta=task.aappend_text
+                )
+                self.cache.set_outputs(video_id, summary_ratio, prompt_version, outline, detailed_explanation)
             
-            self.tasks[task_id]["outline"] = outline
-            self.tasks[task_id]["detailed_explanation"] = detailed_explanation
-            self.tasks[task_id]["progress"] = 100
-            self.tasks[task_id]["status"] = "completed"
+            await task.aupdate({
+                "outline": outline,
+                "detailed_explanation": detailed_explanation,
+                "progress": 100,
+                "status": "completed"
+            })
             
         except Exception as e:
-            self.tasks[task_id]["error"] = str(e)
-            self.tasks[task_id]["status"] = "failed"
+            await task.aupdate({"error": str(e), "status": "failed"})
             raise
     
-    def get_task_status(self, task_id: str) -> Dict:
-        """작업 상태 조회"""
-        return self.tasks.get(task_id, {})
+    def mark_queued(self, task_id: str, **fields):
+        """작업 큐에 등록된 작업의 초기 상태 저장 (워커가 처리를 시작하기 전까지 상태 조회용)"""
+        self.tasks[task_id] = {
+            "task_id": task_id,
+            "progress": 0,
+            "status": "queued",
+            "error": "",
+            "message": "대기 중...",
+            **fields
+        }
+    
+    def get_task_status(self, task_id: str, fields: Iterable[str] = ()) -> Dict:
+        """작업 상태 조회 (텍스트 필드는 fields로 요청한 것만 포함)"""
+        return self.tasks.get(task_id, {}, fields)
     
     def cleanup_task(self, task_id: str):
         """완료된 작업 정리"""
@@ -2,21 +2,44 @@ import os
 import asyncio
 import uuid
 import re
-from typing import Dict, Optional, Tuple
+import copy
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Union
 from pathlib import Path
 import yt_dlp
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api.formatters import TextFormatter
-from openai import OpenAI
 from urllib.parse import urlparse, parse_qs
 
+from stage_limits import stage
+from task_graph import run_task_graph
+from llm_stream import stream_chat_completion
+from openai_clients import get_openai_client
+from audio_normalizer import audio_normalizer
+
 
 class YouTubeService:
+    # 요약/해설 프롬프트 버전 (프롬프트를 바꾸면 올려서 이전 캐시 결과를 사용하지 않도록 함)
+    PROMPT_VERSION = "1"
+    # yt-dlp info dict 캐시 (스트림 URL 만료 전까지만 보관)
+    INFO_CACHE_TTL = 30 * 60
+    INFO_CACHE_SIZE = 32
+    # 다운로드 결과로 인정하는 확장자 / Whisper API가 그대로 받는 확장자
+    DOWNLOAD_EXTENSIONS = ('.m4a', '.webm', '.opus', '.ogg', '.mp3', '.mp4', '.wav')
+    WHISPER_EXTENSIONS = ('.flac', '.m4a', '.mp3', '.mp4', '.mpeg', '.mpga', '.oga', '.ogg', '.wav', '.webm')
+    WHISPER_MAX_FILE_SIZE = 25 * 1024 * 1024
+    
     def __init__(self):
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self._info_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
         self.upload_dir = Path("uploads")
         self.upload_dir.mkdir(exist_ok=True)
         
+    @property
+    def openai_client(self):
+        """공용 비동기 OpenAI 클라이언트"""
+        return get_openai_client()
+    
     def extract_video_id(self, youtube_url: str) -> Optional[str]:
         """YouTube URL에서 비디오 ID 추출"""
         # 다양한 YouTube URL 형식 지원
@@ -105,110 +128,150 @@ class YouTubeService:
             print(f"자막 추출 실패: {e}")
             return None
     
+    def _base_ydl_opts(self) -> Dict:
+        """yt-dlp 공통 옵션"""
+        return {
+            'noplaylist': True,
+            'quiet': True,
+            'no_warnings': True,
+            'extract_flat': False,
+            'writethumbnail': False,
+            'writeinfojson': False,
+            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'referer': 'https://www.youtube.com/',
+            'http_headers': {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            },
+            'extractor_retries': 3,
+            'fragment_retries': 3,
+            'retry_sleep': 1,
+        }
+    
+    async def get_video_info(self, youtube_url: str) -> Dict:
+        """
+        yt-dlp info dict 조회 (비디오 ID별 캐시)
+        
+        메타데이터 추출과 다운로드가 같은 info dict를 사용하므로 URL 해석은 비디오당 한 번만 수행된다.
+        스트림 URL은 시간이 지나면 만료되므로 INFO_CACHE_TTL 동안만 보관한다.
+        """
+        cache_key = self.extract_video_id(youtube_url) or youtube_url
+        
+        cached = self._info_cache.get(cache_key)
+        if cached and time.time() - cached[0] < self.INFO_CACHE_TTL:
+            self._info_cache.move_to_end(cache_key)
+            return cached[1]
+        
+        with yt_dlp.YoutubeDL(self._base_ydl_opts()) as ydl:
+            async with stage("download"):
+                info = await asyncio.to_thread(ydl.extract_info, youtube_url, download=False)
+        
+        self._info_cache[cache_key] = (time.time(), info)
+        if len(self._info_cache) > self.INFO_CACHE_SIZE:
+            self._info_cache.popitem(last=False)
+        
+        return info
+    
+    def _select_audio_format(self, info: Dict) -> Optional[Dict]:
+        """info dict의 포맷 목록에서 음성 인식에 쓸 포맷 선택 (오디오 전용 우선, m4a 우선, 높은 비트레이트 우선)"""
+        formats = [f for f in info.get('formats') or [] if f.get('acodec') not in (None, 'none') and f.get('url')]
+        if not formats:
+            return None
+        
+        audio_only = [f for f in formats if f.get('vcodec') == 'none']
+        if audio_only:
+            return max(audio_only, key=lambda f: (f.get('ext') == 'm4a', f.get('abr') or f.get('tbr') or 0))
+        
+        # 오디오 전용 포맷이 없으면 480p 이하 중 가장 좋은 포맷, 그것도 없으면 가장 작은 포맷
+        small = [f for f in formats if (f.get('height') or 0) <= 480]
+        if small:
+            return max(small, key=lambda f: f.get('tbr') or 0)
+        return min(formats, key=lambda f: f.get('tbr') or float('inf'))
+    
     async def download_youtube_audio(self, youtube_url: str, task_id: str, download_video: bool = False) -> Optional[str]:
         """YouTube 동영상에서 오디오만 다운로드"""
         try:
             output_path = self.upload_dir / f"{task_id}.%(ext)s"
             
-            # 여러 형식과 설정을 시도
+            # 메타데이터 추출 때 받은 info dict 재사용 (URL 재해석 없음)
+            info = await self.get_video_info(youtube_url)
+            
+            ydl_opts = self._base_ydl_opts()
+            ydl_opts['outtmpl'] = str(output_path)
+            
             if download_video:
                 # 비디오+오디오 병합을 우선 시도 → 안 되면 mp4 → 그 외 best
-                format_options = [
-                    'bestvideo[ext=mp4]+bestaudio[ext=m4a]/bestvideo+bestaudio/best[ext=mp4]/best'
-                ]
+                ydl_opts['format'] = 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/bestvideo+bestaudio/best[ext=mp4]/best'
+                # 비디오 모드인 경우 ffmpeg 병합 결과를 mp4로 강제
+                ydl_opts['merge_output_format'] = 'mp4'
                 print('Video download mode: video+audio')
             else:
-                format_options = [
-                    'bestaudio[ext=m4a]',
-                    'bestaudio[ext=mp3]', 
-                    'bestaudio/best',
-                    'best[height<=480]/best',
-                    'worst'
-                ]
-                print('Audio download mode: audio only')
+                # 캐시된 포맷 목록에서 직접 선택 (형식별로 시행착오하며 재시도하지 않음)
+                selected = self._select_audio_format(info)
+                if not selected:
+                    print("다운로드 가능한 오디오 포맷이 없습니다.")
+                    return None
+                
+                # mp3로 재인코딩하지 않고 원본 컨테이너(m4a/webm 등) 그대로 저장
+                ydl_opts['format'] = selected['format_id']
+                print(f"Audio download mode: audio only (format {selected['format_id']}, {selected.get('ext')})")
             
-            for format_opt in format_options:
-                try:
-                    ydl_opts = {
-                        'format': format_opt,
-                        'outtmpl': str(output_path),
-                        'noplaylist': True,
-                        'quiet': True,
-                        'no_warnings': True,
-                        'extract_flat': False,
-                        'writethumbnail': False,
-                        'writeinfojson': False,
-                        'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                        'referer': 'https://www.youtube.com/',
-                        'http_headers': {
-                            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                        },
-                        'extractor_retries': 3,
-                        'fragment_retries': 3,
-                        'retry_sleep': 1,
-                    }
-                    # 비디오 모드인 경우 ffmpeg 병합 결과를 mp4로 강제
-                    if download_video:
-                        ydl_opts['merge_output_format'] = 'mp4'
-                    
-                    # 오디오 전용 다운로드를 위한 후처리 (비디오 모드에서는 적용하지 않음)
-                    if (not download_video) and ('audio' in format_opt):
-                        ydl_opts.update({
-                            'postprocessors': [{
-                                'key': 'FFmpegExtractAudio',
-                                'preferredcodec': 'mp3',
-                                'preferredquality': '192',
-                            }],
-                        })
-                    
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        # 다운로드
-                        await asyncio.to_thread(ydl.download, [youtube_url])
-                        
-                        # 다운로드된 파일 찾기
-                        for file in self.upload_dir.glob(f"{task_id}.*"):
-                            if file.suffix.lower() in ['.mp3', '.m4a', '.webm', '.mp4', '.wav']:
-                                print(f"다운로드 성공: {file}")
-                                return str(file)
-                    
-                    # 이 형식으로 성공했으면 반복문 종료
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                # 다운로드 (yt-dlp가 info dict를 수정하므로 복사본 전달)
+                async with stage("download"):
+                    await asyncio.to_thread(ydl.process_ie_result, copy.deepcopy(info), True)
+            
+            # 다운로드된 파일 찾기
+            downloaded = None
+            for file in self.upload_dir.glob(f"{task_id}.*"):
+                if file.suffix.lower() in self.DOWNLOAD_EXTENSIONS:
+                    downloaded = str(file)
                     break
-                    
-                except Exception as format_error:
-                    print(f"형식 {format_opt} 다운로드 실패: {format_error}")
-                    continue
             
-            # 모든 형식 실패
-            print("모든 다운로드 형식이 실패했습니다.")
-            return None
+            if not downloaded:
+                print("다운로드된 파일을 찾을 수 없습니다.")
+                return None
+            
+            print(f"다운로드 성공: {downloaded}")
+            
+            # Whisper가 받지 않는 형식이거나 25MB를 넘는 경우에만 음성용 저비트레이트 모노로 변환
+            if not download_video and self._needs_speech_transcode(downloaded):
+                downloaded = await self._transcode_for_speech(downloaded, task_id)
+            
+            return downloaded
                 
         except Exception as e:
             print(f"YouTube 다운로드 실패: {e}")
             return None
     
+    def _needs_speech_transcode(self, file_path: str) -> bool:
+        """원본 그대로 Whisper에 보낼 수 없는 경우 True"""
+        if Path(file_path).suffix.lower() not in self.WHISPER_EXTENSIONS:
+            return True
+        return os.path.getsize(file_path) > self.WHISPER_MAX_FILE_SIZE
+    
+    async def _transcode_for_speech(self, file_path: str, task_id: str) -> str:
+        """음성 인식용 정규화 (모노, 16kHz, 저비트레이트 Opus). 실패하면 원본 경로 반환"""
+        output_path = str(self.upload_dir / f"{task_id}_speech{audio_normalizer.extension}")
+        normalized = await audio_normalizer.normalize(file_path, output_path)
+        if not normalized:
+            print("음성용 변환에 실패하여 원본 오디오를 그대로 사용합니다.")
+            return file_path
+        
+        os.remove(file_path)
+        return normalized["path"]
+    
     async def get_youtube_metadata(self, youtube_url: str) -> Dict:
         """YouTube 비디오 메타데이터 추출"""
         try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': False,
-                'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'http_headers': {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                },
-            }
+            info = await self.get_video_info(youtube_url)
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = await asyncio.to_thread(ydl.extract_info, youtube_url, download=False)
-                
-                return {
-                    'title': info.get('title', '제목 없음'),
-                    'description': info.get('description', ''),
-                    'duration': info.get('duration', 0),
-                    'uploader': info.get('uploader', '업로더 정보 없음'),
-                    'view_count': info.get('view_count', 0),
-                }
+            return {
+                'title': info.get('title', '제목 없음'),
+                'description': info.get('description', ''),
+                'duration': info.get('duration', 0),
+                'uploader': info.get('uploader', '업로더 정보 없음'),
+                'view_count': info.get('view_count', 0),
+            }
                 
         except Exception as e:
             print(f"메타데이터 추출 실패: {e}")
@@ -247,8 +310,22 @@ class YouTubeService:
             
             return None, file_path, metadata
     
-    async def generate_summary_and_explanation(self, transcript: str, metadata: Dict, summary_ratio: float = 0.5) -> Tuple[str, str]:
-        """자막을 바탕으로 요약 및 상세 해설 생성"""
+    async def generate_summary_and_explanation(
+        self,
+        transcript: str,
+        metadata: Dict,
+        summary_ratio: float = 0.5,
+        on_delta: Optional[Callable[[str, str], Union[None, Awaitable[None]]]] = None
+    ) -> Tuple[str, str]:
+        """
+        자막을 바탕으로 요약 및 상세 해설 생성
+
+        on_delta가 있으면 생성되는 텍스트 조각을 (필드 이름, 조각)으로 바로 전달한다
+        ("outline" / "detailed_explanation", 두 필드가 동시에 생성됨, 코루틴 함수면 끝날 때까지 기다림).
+        """
+        def forward(field: str):
+            return (lambda delta: on_delta(field, delta)) if on_delta else None
+
         try:
             # 요약 길이 결정
             ratio_descriptions = {
@@ -276,17 +353,18 @@ class YouTubeService:
 4. 한국어로 작성
 """
 
-            summary_response = await asyncio.to_thread(
-                self.openai_client.chat.completions.create,
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "당신은 YouTube 동영상 내용을 분석하고 요약하는 전문가입니다. 구조화되고 이해하기 쉬운 요약을 제공하세요."},
-                    {"role": "user", "content": summary_prompt}
-                ],
-                temperature=0.3
-            )
-            
-            outline = summary_response.choices[0].message.content
+            async def generate_outline() -> str:
+                async with stage("llm"):
+                    return await stream_chat_completion(
+                        self.openai_client,
+                        forward("outline"),
+                        model="gpt-4o-mini",
+                        messages=[
+                            {"role": "system", "content": "당신은 YouTube 동영상 내용을 분석하고 요약하는 전문가입니다. 구조화되고 이해하기 쉬운 요약을 제공하세요."},
+                            {"role": "user", "content": summary_prompt}
+                        ],
+                        temperature=0.3
+                    )
             
             # 상세 해설 생성
             explanation_prompt = f"""
@@ -306,19 +384,26 @@ class YouTubeService:
 5. 한국어로 자연스럽게 작성
 """
 
-            explanation_response = await asyncio.to_thread(
-                self.openai_client.chat.completions.create,
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "당신은 교육 콘텐츠 전문가입니다. 복잡한 내용을 이해하기 쉽게 설명하고, 실용적인 인사이트를 제공하세요."},
-                    {"role": "user", "content": explanation_prompt}
-                ],
-                temperature=0.3
-            )
+            async def generate_explanation() -> str:
+                async with stage("llm"):
+                    return await stream_chat_completion(
+                        self.openai_client,
+                        forward("detailed_explanation"),
+                        model="gpt-4o-mini",
+                        messages=[
+                            {"role": "system", "content": "당신은 교육 콘텐츠 전문가입니다. 복잡한 내용을 이해하기 쉽게 설명하고, 실용적인 인사이트를 제공하세요."},
+                            {"role": "user", "content": explanation_prompt}
+                        ],
+                        temperature=0.3
+                    )
             
-            detailed_explanation = explanation_response.choices[0].message.content
+            # 요약과 해설은 둘 다 자막과 메타데이터만 필요하므로 동시에 생성
+            results = await run_task_graph({
+                "outline": ([], generate_outline),
+                "detailed_explanation": ([], generate_explanation),
+            })
             
-            return outline, detailed_explanation
+            return results["outline"], results["detailed_explanation"]
             
         except Exception as e:
             raise Exception(f"요약 생성 실패: {str(e)}")
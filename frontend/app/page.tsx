@@ -11,11 +11,11 @@ import UserProfile from '@/components/UserProfile';
 import AuthModal from '@/components/Auth/AuthModal';
 import TaskHistory from '@/components/TaskHistory';
 import UsageIndicator from '@/components/UsageIndicator';
-import { videoApi, youtubeApi } from '@/lib/api';
+import { videoApi, youtubeApi, subscribeToTask, getTranscriptSegments } from '@/lib/api';
 import { useAuth } from '@/contexts/AuthContext';
 import { useUsageTracking } from '@/hooks/useUsageTracking';
 import { supabase } from '@/lib/supabase';
-import { ProcessingStatus as ProcessingStatusType } from '@/types';
+import { ProcessingStatus as ProcessingStatusType, TranscriptSegment } from '@/types';
 import { FileVideo, Github, Upload, Youtube, History } from 'lucide-react';
 
 export default function Home() {
@@ -24,6 +24,8 @@ export default function Home() {
   const [selectedFile, setSelectedFile] = useState<File | null>(null);
   const [taskId, setTaskId] = useState<string | null>(null);
   const [processingStatus, setProcessingStatus] = useState<ProcessingStatusType | null>(null);
+  const [transcriptSegments, setTranscriptSegments] = useState<TranscriptSegment[]>([]);
+  const [transcriptCursor, setTranscriptCursor] = useState(0);
   const [isUploading, setIsUploading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [summaryRatio, setSummaryRatio] = useState(0.5);
@@ -33,39 +35,72 @@ export default function Home() {
   const [authModalOpen, setAuthModalOpen] = useState(false);
   const [authModalMode, setAuthModalMode] = useState<'login' | 'register'>('login');
 
-  // 상태 폴링
+  // 진행 상황 구독 (서버가 단계 전환/진행률 변경과 최종 결과를 푸시)
   useEffect(() => {
-    if (!taskId || processingStatus?.status === 'completed' || processingStatus?.status === 'failed') {
+    setTranscriptSegments([]);
+    setTranscriptCursor(0);
+
+    if (!taskId) {
       return;
     }
 
-    const interval = setInterval(async () => {
-      try {
-        const status = isYouTubeTask 
-          ? await youtubeApi.getYouTubeStatus(taskId)
-          : await videoApi.getStatus(taskId);
-        setProcessingStatus(status);
+    const unsubscribe = subscribeToTask(taskId, isYouTubeTask, {
+      onProgress: (update, isStageChange) => {
+        setProcessingStatus((prev) => ({ ...prev, ...update } as ProcessingStatusType));
+
+        // 데이터베이스는 단계가 바뀔 때만 업데이트
+        if (isStageChange) {
+          updateTaskInDatabase(taskId, {
+            status: update.status,
+            progress: update.progress,
+            metadata: update.metadata,
+          });
+        }
+      },
+      onDelta: ({ field, text, reset }) => {
+        setProcessingStatus((prev) => ({
+          ...prev,
+          [field]: reset ? text : (prev?.[field] ?? '') + text,
+        } as ProcessingStatusType));
+      },
+      onDone: (update) => {
+        setProcessingStatus((prev) => ({ ...prev, ...update } as ProcessingStatusType));
 
         // 데이터베이스 업데이트
-        await updateTaskInDatabase(taskId, {
-          status: status.status,
-          progress: status.progress,
-          transcript: status.transcript,
-          outline: status.outline,
-          detailed_explanation: status.detailed_explanation,
-          metadata: status.metadata,
+        updateTaskInDatabase(taskId, {
+          status: update.status,
+          progress: update.progress,
+          transcript: update.transcript,
+          outline: update.outline,
+          detailed_explanation: update.detailed_explanation,
+          metadata: update.metadata,
         });
+      },
+    });
 
-        if (status.status === 'completed' || status.status === 'failed') {
-          clearInterval(interval);
-        }
-      } catch (err) {
-        console.error('Failed to fetch status:', err);
-      }
-    }, 1000); // 1초마다 상태 확인
+    return unsubscribe;
+  }, [taskId, isYouTubeTask]);
 
-    return () => clearInterval(interval);
-  }, [taskId, processingStatus?.status, isYouTubeTask]);
+  // 새로 변환된 청크 텍스트만 가져오기 (전체 완료 전에도 읽을 수 있도록)
+  useEffect(() => {
+    const availableCursor = processingStatus?.transcript_cursor ?? 0;
+    if (!taskId || availableCursor <= transcriptCursor) {
+      return;
+    }
+
+    let cancelled = false;
+    getTranscriptSegments(taskId, isYouTubeTask, transcriptCursor)
+      .then((partial) => {
+        if (cancelled) return;
+        setTranscriptSegments((prev) => [...prev, ...partial.segments]);
+        setTranscriptCursor(partial.cursor);
+      })
+      .catch((err) => console.error('Failed to fetch transcript segments:', err));
+
+    return () => {
+      cancelled = true;
+    };
+  }, [taskId, isYouTubeTask, processingStatus?.transcript_cursor, transcriptCursor]);
 
   const handleFileSelect = useCallback((file: File) => {
     setSelectedFile(file);
@@ -440,7 +475,13 @@ export default function Home() {
             </>
           ) : (
             <>
-              <ProcessingStatus status={processingStatus} />
+              <ProcessingStatus
+                status={processingStatus}
+                partialTranscript={[...transcriptSegments]
+                  .sort((a, b) => a.index - b.index)
+                  .map((segment) => segment.text)
+                  .join(' ')}
+              />
               
               {processingStatus.status === 'completed' && (
                 <>
@@ -6,9 +6,10 @@ import { ProcessingStatus as ProcessingStatusType } from '@/types';
 
 interface ProcessingStatusProps {
   status: ProcessingStatusType;
+  partialTranscript?: string;  // 처리 중 변환이 끝난 청크들의 텍스트
 }
 
-export default function ProcessingStatus({ status }: ProcessingStatusProps) {
+export default function ProcessingStatus({ status, partialTranscript }: ProcessingStatusProps) {
   const getStatusIcon = () => {
     switch (status.status) {
       case 'processing':
@@ -68,9 +69,56 @@ export default function ProcessingStatus({ status }: ProcessingStatusProps) {
           {status.status === 'failed' && status.error && (
             <p className="mt-2 text-sm text-red-600">{status.error}</p>
           )}
+
+          {/* Warnings (결과 일부가 빠졌을 수 있음) */}
+          {status.warnings?.map((warning, index) => (
+            <p key={index} className="mt-2 text-sm text-yellow-700">{warning}</p>
+          ))}
         </div>
       </div>
 
+      {/* Partial Transcript */}
+      {status.status !== 'completed' && status.status !== 'failed' && partialTranscript && (
+        <div className="mt-6 bg-white rounded-lg p-4 border border-gray-200">
+          <div className="flex items-center space-x-2 mb-3">
+            <FileText className="w-5 h-5 text-gray-600" />
+            <h4 className="font-semibold text-gray-900">트랜스크립트 (변환 중)</h4>
+          </div>
+          <div className="max-h-60 overflow-y-auto">
+            <p className="text-sm text-gray-700 whitespace-pre-wrap">{partialTranscript}</p>
+          </div>
+        </div>
+      )}
+
+      {/* Streaming Outline / Explanation */}
+      {status.status !== 'completed' && status.status !== 'failed' && (status.outline || status.detailed_explanation) && (
+        <div className="mt-6 space-y-6">
+          {status.outline && (
+            <div className="bg-white rounded-lg p-4 border border-gray-200">
+              <div className="flex items-center space-x-2 mb-3">
+                <ListOrdered className="w-5 h-5 text-gray-600" />
+                <h4 className="font-semibold text-gray-900">아웃라인 (생성 중)</h4>
+              </div>
+              <div className="max-h-60 overflow-y-auto">
+                <div className="text-sm text-gray-700 whitespace-pre-wrap">{status.outline}</div>
+              </div>
+            </div>
+          )}
+
+          {status.detailed_explanation && (
+            <div className="bg-white rounded-lg p-4 border border-gray-200">
+              <div className="flex items-center space-x-2 mb-3">
+                <FileText className="w-5 h-5 text-gray-600" />
+                <h4 className="font-semibold text-gray-900">상세 해설 (생성 중)</h4>
+              </div>
+              <div className="max-h-60 overflow-y-auto">
+                <div className="text-sm text-gray-700 whitespace-pre-wrap">{status.detailed_explanation}</div>
+              </div>
+            </div>
+          )}
+        </div>
+      )}
+
       {/* Results */}
       {status.status === 'completed' && (status.transcript || status.outline) && (
         <div className="mt-6 space-y-6">
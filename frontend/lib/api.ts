@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { VideoUploadResponse, ProcessingStatus, VideoSummaryResult } from '@/types';
+import { VideoUploadResponse, ProcessingStatus, VideoSummaryResult, PartialTranscript, TextDelta } from '@/types';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
@@ -10,6 +10,60 @@ const api = axios.create({
   },
 });
 
+export interface TaskEventHandlers {
+  // 단계 전환/진행률 변경 (큰 결과 필드는 포함하지 않음)
+  onProgress: (status: Partial<ProcessingStatus>, isStageChange: boolean) => void;
+  // 완료 (결과 포함) 또는 실패
+  onDone: (status: Partial<ProcessingStatus>) => void;
+  // 생성 중인 아웃라인/해설에 새로 붙은 텍스트 (reset이면 text가 전체 텍스트)
+  onDelta?: (delta: TextDelta) => void;
+}
+
+// 작업 진행 상황 구독 (Server-Sent Events). 반환값을 호출하면 구독 해제
+export const subscribeToTask = (
+  taskId: string,
+  isYouTube: boolean,
+  handlers: TaskEventHandlers
+): (() => void) => {
+  const path = isYouTube ? `/api/youtube/events/${taskId}` : `/api/events/${taskId}`;
+  const source = new EventSource(`${API_BASE_URL}${path}`);
+  const parse = (event: MessageEvent) => JSON.parse(event.data) as Partial<ProcessingStatus>;
+
+  source.addEventListener('stage', (event) => handlers.onProgress(parse(event as MessageEvent), true));
+  source.addEventListener('progress', (event) => handlers.onProgress(parse(event as MessageEvent), false));
+  source.addEventListener('delta', (event) => {
+    handlers.onDelta?.(JSON.parse((event as MessageEvent).data) as TextDelta);
+  });
+  source.addEventListener('completed', (event) => {
+    source.close();
+    handlers.onDone(parse(event as MessageEvent));
+  });
+  source.addEventListener('failed', (event) => {
+    source.close();
+    handlers.onDone(parse(event as MessageEvent));
+  });
+  // 서버가 작업을 찾지 못한 경우 (연결 오류는 EventSource가 자동으로 재연결)
+  source.addEventListener('error', (event) => {
+    if (event instanceof MessageEvent) {
+      source.close();
+      console.error('Task event stream error:', event.data);
+    }
+  });
+
+  return () => source.close();
+};
+
+// 변환이 끝난 청크 텍스트 조회 (cursor 이후에 추가된 것만)
+export const getTranscriptSegments = async (
+  taskId: string,
+  isYouTube: boolean,
+  cursor: number
+): Promise<PartialTranscript> => {
+  const path = isYouTube ? `/api/youtube/transcript/${taskId}` : `/api/transcript/${taskId}`;
+  const response = await api.get<PartialTranscript>(path, { params: { cursor } });
+  return response.data;
+};
+
 export const videoApi = {
   // 비디오 업로드
   uploadVideo: async (file: File, summaryRatio: number = 0.5): Promise<VideoUploadResponse> => {
@@ -60,6 +114,12 @@ export const youtubeApi = {
     return response.data;
   },
 
+  // YouTube 결과 조회
+  getYouTubeResult: async (taskId: string): Promise<VideoSummaryResult> => {
+    const response = await api.get<VideoSummaryResult>(`/api/youtube/result/${taskId}`);
+    return response.data;
+  },
+
   // YouTube 작업 정리
   cleanupYouTubeTask: async (taskId: string): Promise<void> => {
     await api.delete(`/api/youtube/task/${taskId}`);
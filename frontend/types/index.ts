@@ -10,7 +10,7 @@ export interface VideoUploadParams {
 
 export interface ProcessingStatus {
   task_id: string;
-  status: 'processing' | 'splitting_file' | 'extracting_transcript' | 'generating_outline' | 'extracting_metadata' | 'extracting_subtitles' | 'downloading_audio' | 'generating_summary' | 'completed' | 'failed';
+  status: 'queued' | 'processing' | 'splitting_file' | 'extracting_transcript' | 'generating_outline' | 'extracting_metadata' | 'extracting_subtitles' | 'downloading_audio' | 'generating_summary' | 'completed' | 'failed';
   progress: number;
   message: string;
   transcript?: string;
@@ -18,6 +18,31 @@ export interface ProcessingStatus {
   detailed_explanation?: string;
   error?: string;
   metadata?: YouTubeMetadata;
+  version?: number;
+  result_url?: string;
+  transcript_cursor?: number;
+  chunks_total?: number;
+  chunks_completed?: number;
+  warnings?: string[];
+}
+
+export interface TextDelta {
+  field: 'outline' | 'detailed_explanation';
+  text: string;
+  reset: boolean;
+}
+
+export interface TranscriptSegment {
+  index: number;
+  text: string;
+}
+
+export interface PartialTranscript {
+  task_id: string;
+  segments: TranscriptSegment[];
+  cursor: number;
+  chunks_total?: number;
+  complete: boolean;
 }
 
 export interface VideoSummaryResult {
@@ -25,6 +50,7 @@ export interface VideoSummaryResult {
   file_name: string;
   transcript: string;
   outline: string;
+  detailed_explanation?: string;
   processing_time: number;
   metadata?: YouTubeMetadata;
 }